@@ -0,0 +1,48 @@
+{#
+    Row filter for incremental event models.
+
+    Full refreshes read every event. On incremental runs it only reprocesses
+    events newer than the latest loaded event minus `events_lookback_days`,
+    so late-arriving events are picked up and merged on the model's
+    unique_key.
+
+    `this_column` names the watermark column in the model itself when it
+    differs from the source timestamp column.
+
+    Backfill a window (bounded by the start_date/end_date vars instead of the
+    lookback, re-merges the whole range):
+        dbt run -s <model> --vars '{backfill: true, start_date: "2024-11-01", end_date: "2024-11-07"}'
+#}
+{% macro incremental_event_window(timestamp_column='event_timestamp', date_column='event_date', this_column=none) %}
+    {%- if var('backfill', false) %}
+    {{ date_column }} BETWEEN '{{ var("start_date") }}'::DATE AND '{{ var("end_date") }}'::DATE
+    {%- elif is_incremental() %}
+    {{ timestamp_column }} >= (
+        SELECT COALESCE(
+            {{ dbt.dateadd('day', -(var('events_lookback_days') | int), 'MAX(' ~ (this_column or timestamp_column) ~ ')') }},
+            '1900-01-01'::TIMESTAMP
+        )
+        FROM {{ this }}
+    )
+    {%- else %}
+    TRUE
+    {%- endif %}
+{% endmacro %}
+
+
+{#
+    For day-grain delete+insert models built from fct_article_events: the
+    event dates with fact rows merged since this model's last build (the
+    lookback window, and older days re-merged after article attribute
+    changes). Only valid on incremental runs.
+
+        WHERE {{ incremental_event_window('event_date') }}
+           OR {{ changed_event_dates(ref('fct_article_events'), 'rollup_updated_at') }}
+#}
+{% macro changed_event_dates(fact_relation, built_at_column) %}
+    event_date IN (
+        SELECT DISTINCT event_date
+        FROM {{ fact_relation }}
+        WHERE fact_created_at > (SELECT MAX({{ built_at_column }}) FROM {{ this }})
+    )
+{%- endmacro %}
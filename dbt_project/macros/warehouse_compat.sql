@@ -0,0 +1,180 @@
+{#
+    Snowflake constructs the models use, dispatched per adapter so the project
+    also runs on the local DuckDB target (dbt_project/local/profiles.yml).
+
+    The default__ implementations are the Snowflake SQL. DATEADD/DATEDIFF go
+    through dbt's own cross-database dbt.dateadd / dbt.datediff macros instead.
+
+    On DuckDB the HLL_* and APPROX_PERCENTILE_* "states" are plain lists of
+    the distinct values / values, so combine + estimate is exact there.
+    Good enough for local runs and benchmarks; Snowflake keeps the sketches.
+#}
+
+{# Incremental strategy for models keyed on a natural key #}
+{% macro merge_incremental_strategy() %}
+    {{ return(adapter.dispatch('merge_incremental_strategy', 'media_semantic_layer')()) }}
+{% endmacro %}
+
+{% macro default__merge_incremental_strategy() %}
+    {{ return('merge') }}
+{% endmacro %}
+
+{% macro duckdb__merge_incremental_strategy() %}
+    {{ return('delete+insert') }}
+{% endmacro %}
+
+
+{# Non-negative bucket in [0, buckets) from a deterministic hash of expr #}
+{% macro hash_bucket(expr, buckets) %}
+    {{ return(adapter.dispatch('hash_bucket', 'media_semantic_layer')(expr, buckets)) }}
+{% endmacro %}
+
+{% macro default__hash_bucket(expr, buckets) -%}
+    ABS(MOD(HASH({{ expr }}), {{ buckets }}))
+{%- endmacro %}
+
+{% macro duckdb__hash_bucket(expr, buckets) -%}
+    {#- DuckDB's hash() is already unsigned (UBIGINT) -#}
+    (HASH({{ expr }}) % {{ buckets }})
+{%- endmacro %}
+
+
+{#
+    Typed value from a semi-structured column, e.g.
+    variant_get('event_params', '[0].value.string_value') or variant_get('device', 'category')
+#}
+{% macro variant_get(column, path, data_type='STRING') %}
+    {{ return(adapter.dispatch('variant_get', 'media_semantic_layer')(column, path, data_type)) }}
+{% endmacro %}
+
+{% macro default__variant_get(column, path, data_type) -%}
+    {{ column }}{{ '' if path.startswith('[') else ':' }}{{ path | replace('.', ':') }}::{{ data_type }}
+{%- endmacro %}
+
+{% macro duckdb__variant_get(column, path, data_type) -%}
+    {#- events_raw nested records are STRUCTs there (scripts/load_to_duckdb.py); lists are 1-based -#}
+    {%- if path.startswith('[') -%}
+        {%- set index, rest = path[1:].split(']', 1) -%}
+        {{ column }}[{{ index | int + 1 }}]{{ rest }}::{{ data_type }}
+    {%- else -%}
+        {{ column }}.{{ path }}::{{ data_type }}
+    {%- endif -%}
+{%- endmacro %}
+
+
+{# DATE from a GA4 'YYYYMMDD' string #}
+{% macro date_from_yyyymmdd(column) %}
+    {{ return(adapter.dispatch('date_from_yyyymmdd', 'media_semantic_layer')(column)) }}
+{% endmacro %}
+
+{% macro default__date_from_yyyymmdd(column) -%}
+    TO_DATE({{ column }}, 'YYYYMMDD')
+{%- endmacro %}
+
+{% macro duckdb__date_from_yyyymmdd(column) -%}
+    strptime({{ column }}, '%Y%m%d')::DATE
+{%- endmacro %}
+
+
+{# TIMESTAMP from microseconds since the epoch #}
+{% macro timestamp_from_micros(column) %}
+    {{ return(adapter.dispatch('timestamp_from_micros', 'media_semantic_layer')(column)) }}
+{% endmacro %}
+
+{% macro default__timestamp_from_micros(column) -%}
+    TO_TIMESTAMP({{ column }} / 1000000)
+{%- endmacro %}
+
+{% macro duckdb__timestamp_from_micros(column) -%}
+    make_timestamp({{ column }})
+{%- endmacro %}
+
+
+{# Exact (interpolated) percentile aggregate #}
+{% macro percentile_cont(expr, fraction) %}
+    {{ return(adapter.dispatch('percentile_cont', 'media_semantic_layer')(expr, fraction)) }}
+{% endmacro %}
+
+{% macro default__percentile_cont(expr, fraction) -%}
+    PERCENTILE_CONT({{ fraction }}) WITHIN GROUP (ORDER BY {{ expr }})
+{%- endmacro %}
+
+{% macro duckdb__percentile_cont(expr, fraction) -%}
+    quantile_cont({{ expr }}, {{ fraction }})
+{%- endmacro %}
+
+
+{# Mergeable distinct-count state: accumulate per row group, combine, estimate #}
+{% macro hll_accumulate(expr) %}
+    {{ return(adapter.dispatch('hll_accumulate', 'media_semantic_layer')(expr)) }}
+{% endmacro %}
+
+{% macro default__hll_accumulate(expr) -%}
+    HLL_ACCUMULATE({{ expr }})
+{%- endmacro %}
+
+{% macro duckdb__hll_accumulate(expr) -%}
+    list(DISTINCT {{ expr }}) FILTER (WHERE {{ expr }} IS NOT NULL)
+{%- endmacro %}
+
+{% macro hll_combine(state) %}
+    {{ return(adapter.dispatch('hll_combine', 'media_semantic_layer')(state)) }}
+{% endmacro %}
+
+{% macro default__hll_combine(state) -%}
+    HLL_COMBINE({{ state }})
+{%- endmacro %}
+
+{% macro duckdb__hll_combine(state) -%}
+    list_distinct(flatten(list({{ state }})))
+{%- endmacro %}
+
+{% macro hll_estimate(state) %}
+    {{ return(adapter.dispatch('hll_estimate', 'media_semantic_layer')(state)) }}
+{% endmacro %}
+
+{% macro default__hll_estimate(state) -%}
+    HLL_ESTIMATE({{ state }})
+{%- endmacro %}
+
+{% macro duckdb__hll_estimate(state) -%}
+    COALESCE(len({{ state }}), 0)
+{%- endmacro %}
+
+
+{# Mergeable percentile state: accumulate per row group, combine, estimate #}
+{% macro approx_percentile_accumulate(expr) %}
+    {{ return(adapter.dispatch('approx_percentile_accumulate', 'media_semantic_layer')(expr)) }}
+{% endmacro %}
+
+{% macro default__approx_percentile_accumulate(expr) -%}
+    APPROX_PERCENTILE_ACCUMULATE({{ expr }})
+{%- endmacro %}
+
+{% macro duckdb__approx_percentile_accumulate(expr) -%}
+    list({{ expr }}) FILTER (WHERE {{ expr }} IS NOT NULL)
+{%- endmacro %}
+
+{% macro approx_percentile_combine(state) %}
+    {{ return(adapter.dispatch('approx_percentile_combine', 'media_semantic_layer')(state)) }}
+{% endmacro %}
+
+{% macro default__approx_percentile_combine(state) -%}
+    APPROX_PERCENTILE_COMBINE({{ state }})
+{%- endmacro %}
+
+{% macro duckdb__approx_percentile_combine(state) -%}
+    flatten(list({{ state }}))
+{%- endmacro %}
+
+{% macro approx_percentile_estimate(state, fraction) %}
+    {{ return(adapter.dispatch('approx_percentile_estimate', 'media_semantic_layer')(state, fraction)) }}
+{% endmacro %}
+
+{% macro default__approx_percentile_estimate(state, fraction) -%}
+    APPROX_PERCENTILE_ESTIMATE({{ state }}, {{ fraction }})
+{%- endmacro %}
+
+{% macro duckdb__approx_percentile_estimate(state, fraction) -%}
+    list_aggregate({{ state }}, 'quantile_cont', {{ fraction }})
+{%- endmacro %}
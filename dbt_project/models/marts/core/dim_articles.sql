@@ -57,7 +57,7 @@ enriched AS (
         -- Metadata
         loaded_at,
         updated_at,
-        CURRENT_TIMESTAMP() AS dim_updated_at
+        CURRENT_TIMESTAMP AS dim_updated_at
         
     FROM articles
 )
@@ -93,13 +93,13 @@ enriched AS (
         target_power,
         
         -- Calculated fields
-        DATEDIFF('day', start_date, end_date) AS duration_days,
+        {{ dbt.datediff("start_date", "end_date", 'day') }} AS duration_days,
         
         -- Expected sample size (rough estimate: 1000 per variant minimum)
         2000 AS min_sample_size_per_variant,
         
         -- Metadata
-        CURRENT_TIMESTAMP() AS dim_updated_at
+        CURRENT_TIMESTAMP AS dim_updated_at
         
     FROM experiment_definitions
 )
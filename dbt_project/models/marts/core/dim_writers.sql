@@ -44,7 +44,7 @@ enriched AS (
         END AS productivity_tier,
         
         -- Metadata
-        CURRENT_TIMESTAMP() AS dim_updated_at
+        CURRENT_TIMESTAMP AS dim_updated_at
         
     FROM writers
 )
@@ -0,0 +1,135 @@
+-- models/marts/core/fct_article_daily_rollup.sql
+{{
+  config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='event_date',
+    cluster_by=['event_date'],
+    tags=['marts', 'aggregated', 'rollup']
+  )
+}}
+
+/*
+Shared daily rollup feeding the aggregate marts.
+
+Grain: article x event_date x device_category x traffic_medium
+
+Distinct counts are stored as mergeable HLL states and the engagement-time
+median as an APPROX_PERCENTILE state, so marts re-aggregate them to any
+coarser grain (week, category, writer) with HLL_COMBINE /
+APPROX_PERCENTILE_COMBINE instead of rescanning fct_article_events. The
+all-event user/session states back the semantic layer's *_approx metrics.
+Averages are stored as sum + count pairs.
+
+Incremental: whole days are recomputed (delete+insert on event_date), since
+a day's sketches need all its events: the lookback window plus any older day
+whose fact rows were re-merged since the last build.
+*/
+
+WITH events AS (
+    SELECT
+        f.event_date,
+        f.event_timestamp,
+        f.event_name,
+        f.user_pseudo_id,
+        f.ga_session_id,
+        f.article_id,
+        f.device_category,
+        f.traffic_medium,
+        f.engagement_time_msec,
+        f.percent_scrolled,
+        f.is_engaged,
+        f.is_highly_engaged,
+        f.estimated_revenue,
+        f.quality_adjusted_engagement,
+
+        -- Article attributes from dim_articles (one row per article) rather
+        -- than the copies on the fact rows, so they cannot split the grain
+        a.writer_id,
+        a.category AS article_category,
+        a.content_length_bucket,
+        a.rpm_tier,
+        a.is_premium,
+        a.is_evergreen,
+        a.sentiment_label
+    FROM {{ ref('fct_article_events') }} f
+    LEFT JOIN {{ ref('dim_articles') }} a ON f.article_id = a.article_id
+    WHERE {{ incremental_event_window('event_date') }}
+    {%- if is_incremental() %}
+       OR {{ changed_event_dates(ref('fct_article_events'), 'rollup_updated_at') }}
+    {%- endif %}
+),
+
+daily_rollup AS (
+    SELECT
+        event_date,
+        article_id,
+        device_category,
+        traffic_medium,
+
+        -- Article attributes (one value per article_id, see events)
+        writer_id,
+        article_category,
+        content_length_bucket,
+        rpm_tier,
+        is_premium,
+        is_evergreen,
+        sentiment_label,
+
+        -- All event types (data quality checks)
+        COUNT(*) AS all_events,
+        COUNT(CASE WHEN article_id IS NOT NULL
+                   AND user_pseudo_id IS NOT NULL
+                   AND event_date IS NOT NULL
+                   AND event_timestamp IS NOT NULL
+                   THEN 1 END) AS complete_events,
+        {{ hll_accumulate('user_pseudo_id') }} AS all_users_hll,
+        {{ hll_accumulate('ga_session_id') }} AS all_sessions_hll,
+
+        -- Page view measures (what the marts report on)
+        COUNT(CASE WHEN event_name = 'page_view' THEN 1 END) AS pageview_events,
+        {{ hll_accumulate("CASE WHEN event_name = 'page_view' THEN user_pseudo_id END") }} AS viewers_hll,
+        {{ hll_accumulate("CASE WHEN event_name = 'page_view' THEN ga_session_id END") }} AS sessions_hll,
+
+        COUNT(CASE WHEN event_name = 'page_view' AND is_engaged = 1 THEN 1 END) AS engaged_events,
+        {{ hll_accumulate("CASE WHEN event_name = 'page_view' AND is_engaged = 1 THEN user_pseudo_id END") }} AS engaged_users_hll,
+        COUNT(CASE WHEN event_name = 'page_view' AND is_highly_engaged = 1 THEN 1 END) AS highly_engaged_events,
+        {{ hll_accumulate("CASE WHEN event_name = 'page_view' AND is_highly_engaged = 1 THEN user_pseudo_id END") }} AS highly_engaged_users_hll,
+
+        SUM(CASE WHEN event_name = 'page_view' THEN engagement_time_msec END) AS engagement_msec_sum,
+        COUNT(CASE WHEN event_name = 'page_view' THEN engagement_time_msec END) AS engagement_msec_count,
+        {{ approx_percentile_accumulate("CASE WHEN event_name = 'page_view' THEN engagement_time_msec END") }} AS engagement_msec_percentiles,
+
+        SUM(CASE WHEN event_name = 'page_view' THEN percent_scrolled END) AS percent_scrolled_sum,
+        COUNT(CASE WHEN event_name = 'page_view' THEN percent_scrolled END) AS percent_scrolled_count,
+
+        SUM(CASE WHEN event_name = 'page_view' THEN estimated_revenue END) AS revenue_sum,
+        COUNT(CASE WHEN event_name = 'page_view' THEN estimated_revenue END) AS revenue_count,
+
+        SUM(CASE WHEN event_name = 'page_view' THEN quality_adjusted_engagement END) AS quality_adjusted_sum,
+        COUNT(CASE WHEN event_name = 'page_view' THEN quality_adjusted_engagement END) AS quality_adjusted_count,
+
+        -- Range checks (data quality)
+        COUNT(CASE WHEN event_name = 'page_view' AND engagement_time_msec BETWEEN 0 AND 3600000 THEN 1 END) AS engagement_in_bounds_events,
+        COUNT(CASE WHEN event_name = 'page_view' AND percent_scrolled BETWEEN 0 AND 100 THEN 1 END) AS scroll_in_bounds_events,
+        COUNT(CASE WHEN event_name = 'page_view' AND quality_adjusted_engagement BETWEEN 0 AND 1 THEN 1 END) AS quality_in_bounds_events,
+
+        -- Metadata
+        CURRENT_TIMESTAMP AS rollup_updated_at
+
+    FROM events
+    GROUP BY
+        event_date,
+        article_id,
+        device_category,
+        traffic_medium,
+        writer_id,
+        article_category,
+        content_length_bucket,
+        rpm_tier,
+        is_premium,
+        is_evergreen,
+        sentiment_label
+)
+
+SELECT * FROM daily_rollup
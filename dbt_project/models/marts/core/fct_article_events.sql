@@ -1,17 +1,50 @@
 -- models/marts/core/fct_article_events.sql
 {{
   config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy=merge_incremental_strategy(),
+    unique_key=['user_pseudo_id', 'ga_session_id', 'event_timestamp', 'event_name', 'article_id'],
+    on_schema_change='append_new_columns',
     tags=['marts', 'fact', 'events']
   )
 }}
 
-WITH events AS (
-    SELECT * FROM {{ ref('stg_events') }}
+-- Incremental on event_timestamp: events in the lookback window are re-joined
+-- and merged (see macros/incremental_event_window.sql), plus every event of
+-- articles whose attributes changed since the last run (sentiment enrichment,
+-- metadata reloads), so older rows don't keep stale sentiment/quality values.
+WITH articles AS (
+    SELECT
+        *,
+        GREATEST(
+            COALESCE(updated_at, '1900-01-01'::TIMESTAMP),
+            COALESCE(sentiment_enriched_at, '1900-01-01'::TIMESTAMP)
+        ) AS attributes_changed_at
+    FROM {{ ref('dim_articles') }}
 ),
 
-articles AS (
-    SELECT * FROM {{ ref('dim_articles') }}
+{% if is_incremental() %}
+changed_articles AS (
+    SELECT article_id
+    FROM articles
+    WHERE attributes_changed_at > (
+        SELECT COALESCE(MAX(article_attributes_changed_at), '1900-01-01'::TIMESTAMP)
+        FROM {{ this }}
+    )
+),
+{% endif %}
+
+events AS (
+    SELECT * FROM {{ ref('stg_events') }}
+    WHERE {{ incremental_event_window('event_timestamp') }}
+    {%- if is_incremental() %}
+       OR article_id IN (SELECT article_id FROM changed_articles)
+    {%- endif %}
+    -- One row per unique key so the MERGE is deterministic
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY user_pseudo_id, ga_session_id, event_timestamp, event_name, article_id
+        ORDER BY event_timestamp
+    ) = 1
 ),
 
 writers AS (
@@ -87,7 +120,8 @@ fact_events AS (
         w.contract_type AS writer_contract_type,
         
         -- Metadata
-        CURRENT_TIMESTAMP() AS fact_created_at
+        a.attributes_changed_at AS article_attributes_changed_at,
+        CURRENT_TIMESTAMP AS fact_created_at
         
     FROM events e
     LEFT JOIN articles a ON e.article_id = a.article_id
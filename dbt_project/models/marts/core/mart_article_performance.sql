@@ -6,6 +6,8 @@
   )
 }}
 
+-- Re-aggregates the daily rollup (article x day x device x medium) to
+-- article x day; unique counts and the median are approximate (HLL / t-digest).
 WITH daily_article_events AS (
     SELECT
         article_id,
@@ -18,42 +20,42 @@ WITH daily_article_events AS (
         sentiment_label,
         
         -- Event counts
-        COUNT(*) AS total_events,
-        COUNT(DISTINCT CASE WHEN event_name = 'page_view' THEN user_pseudo_id END) AS unique_viewers,
-        COUNT(DISTINCT CASE WHEN event_name = 'page_view' THEN ga_session_id END) AS unique_sessions,
+        SUM(pageview_events) AS total_events,
+        {{ hll_estimate(hll_combine('viewers_hll')) }} AS unique_viewers,
+        {{ hll_estimate(hll_combine('sessions_hll')) }} AS unique_sessions,
         
         -- Engagement metrics
-        COUNT(CASE WHEN is_engaged = 1 THEN 1 END) AS engaged_events,
-        COUNT(DISTINCT CASE WHEN is_engaged = 1 THEN user_pseudo_id END) AS engaged_users,
-        COUNT(CASE WHEN is_highly_engaged = 1 THEN 1 END) AS highly_engaged_events,
-        COUNT(DISTINCT CASE WHEN is_highly_engaged = 1 THEN user_pseudo_id END) AS highly_engaged_users,
+        SUM(engaged_events) AS engaged_events,
+        {{ hll_estimate(hll_combine('engaged_users_hll')) }} AS engaged_users,
+        SUM(highly_engaged_events) AS highly_engaged_events,
+        {{ hll_estimate(hll_combine('highly_engaged_users_hll')) }} AS highly_engaged_users,
         
         -- Time metrics
-        AVG(engagement_time_msec) / 1000.0 AS avg_engagement_seconds,
-        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY engagement_time_msec) / 1000.0 AS median_engagement_seconds,
-        AVG(percent_scrolled) AS avg_scroll_percent,
+        SUM(engagement_msec_sum) / NULLIF(SUM(engagement_msec_count), 0) / 1000.0 AS avg_engagement_seconds,
+        {{ approx_percentile_estimate(approx_percentile_combine('engagement_msec_percentiles'), 0.5) }} / 1000.0 AS median_engagement_seconds,
+        SUM(percent_scrolled_sum) / NULLIF(SUM(percent_scrolled_count), 0) AS avg_scroll_percent,
         
         -- Revenue metrics
-        SUM(estimated_revenue) AS total_revenue,
-        AVG(estimated_revenue) AS avg_revenue_per_event,
+        SUM(revenue_sum) AS total_revenue,
+        SUM(revenue_sum) / NULLIF(SUM(revenue_count), 0) AS avg_revenue_per_event,
         
         -- Quality metrics
-        AVG(quality_adjusted_engagement) AS avg_quality_adjusted_engagement,
-        SUM(quality_adjusted_engagement) AS total_quality_adjusted_engagement,
+        SUM(quality_adjusted_sum) / NULLIF(SUM(quality_adjusted_count), 0) AS avg_quality_adjusted_engagement,
+        SUM(quality_adjusted_sum) AS total_quality_adjusted_engagement,
         
         -- Device breakdown
-        COUNT(CASE WHEN device_category = 'mobile' THEN 1 END) AS mobile_events,
-        COUNT(CASE WHEN device_category = 'desktop' THEN 1 END) AS desktop_events,
-        COUNT(CASE WHEN device_category = 'tablet' THEN 1 END) AS tablet_events,
+        SUM(CASE WHEN device_category = 'mobile' THEN pageview_events ELSE 0 END) AS mobile_events,
+        SUM(CASE WHEN device_category = 'desktop' THEN pageview_events ELSE 0 END) AS desktop_events,
+        SUM(CASE WHEN device_category = 'tablet' THEN pageview_events ELSE 0 END) AS tablet_events,
         
         -- Traffic source breakdown
-        COUNT(CASE WHEN traffic_medium = 'organic' THEN 1 END) AS organic_events,
-        COUNT(CASE WHEN traffic_medium = 'social' THEN 1 END) AS social_events,
-        COUNT(CASE WHEN traffic_medium = 'email' THEN 1 END) AS email_events,
-        COUNT(CASE WHEN traffic_medium = 'none' THEN 1 END) AS direct_events
+        SUM(CASE WHEN traffic_medium = 'organic' THEN pageview_events ELSE 0 END) AS organic_events,
+        SUM(CASE WHEN traffic_medium = 'social' THEN pageview_events ELSE 0 END) AS social_events,
+        SUM(CASE WHEN traffic_medium = 'email' THEN pageview_events ELSE 0 END) AS email_events,
+        SUM(CASE WHEN traffic_medium = 'none' THEN pageview_events ELSE 0 END) AS direct_events
         
-    FROM {{ ref('fct_article_events') }}
-    WHERE event_name = 'page_view'
+    FROM {{ ref('fct_article_daily_rollup') }}
+    WHERE pageview_events > 0
     GROUP BY 
         article_id,
         event_date,
@@ -85,13 +87,13 @@ enriched AS (
         (e.total_revenue / NULLIF(e.unique_viewers, 0)) * 1000 AS actual_rpm,
         
         -- Days since publish
-        DATEDIFF('day', a.publish_date, e.event_date) AS days_since_publish,
+        {{ dbt.datediff("a.publish_date", "e.event_date", 'day') }} AS days_since_publish,
         
         -- Freshness flag
         CASE 
-            WHEN DATEDIFF('day', a.publish_date, e.event_date) <= 7 THEN 'week_1'
-            WHEN DATEDIFF('day', a.publish_date, e.event_date) <= 30 THEN 'week_2_to_4'
-            WHEN DATEDIFF('day', a.publish_date, e.event_date) <= 90 THEN 'month_2_to_3'
+            WHEN {{ dbt.datediff("a.publish_date", "e.event_date", 'day') }} <= 7 THEN 'week_1'
+            WHEN {{ dbt.datediff("a.publish_date", "e.event_date", 'day') }} <= 30 THEN 'week_2_to_4'
+            WHEN {{ dbt.datediff("a.publish_date", "e.event_date", 'day') }} <= 90 THEN 'month_2_to_3'
             ELSE 'older'
         END AS content_age_bucket,
         
@@ -101,7 +103,7 @@ enriched AS (
         e.tablet_events * 100.0 / NULLIF(e.total_events, 0) AS tablet_pct,
         
         -- Metadata
-        CURRENT_TIMESTAMP() AS mart_updated_at
+        CURRENT_TIMESTAMP AS mart_updated_at
         
     FROM daily_article_events e
     LEFT JOIN {{ ref('dim_articles') }} a ON e.article_id = a.article_id
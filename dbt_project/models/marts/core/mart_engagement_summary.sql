@@ -6,46 +6,48 @@
   )
 }}
 
+-- Re-aggregates the daily rollup to week x category x device x medium;
+-- unique counts and the median are approximate (HLL / t-digest).
 WITH weekly_engagement_summary AS (
     SELECT
-        DATE_TRUNC('week', event_date) AS week_start_date,
+        DATE_TRUNC('week', event_date)::DATE AS week_start_date,
         article_category,
         device_category,
         traffic_medium,
         
         -- Volume metrics
         COUNT(DISTINCT article_id) AS distinct_articles,
-        COUNT(DISTINCT user_pseudo_id) AS unique_users,
-        COUNT(DISTINCT ga_session_id) AS unique_sessions,
-        COUNT(*) AS total_events,
+        {{ hll_estimate(hll_combine('viewers_hll')) }} AS unique_users,
+        {{ hll_estimate(hll_combine('sessions_hll')) }} AS unique_sessions,
+        SUM(pageview_events) AS total_events,
         
         -- Engagement metrics
-        COUNT(CASE WHEN is_engaged = 1 THEN 1 END) AS engaged_events,
-        COUNT(DISTINCT CASE WHEN is_engaged = 1 THEN user_pseudo_id END) AS engaged_users,
-        COUNT(CASE WHEN is_highly_engaged = 1 THEN 1 END) AS highly_engaged_events,
+        SUM(engaged_events) AS engaged_events,
+        {{ hll_estimate(hll_combine('engaged_users_hll')) }} AS engaged_users,
+        SUM(highly_engaged_events) AS highly_engaged_events,
         
         -- Time metrics
-        AVG(engagement_time_msec) / 1000.0 AS avg_engagement_seconds,
-        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY engagement_time_msec) / 1000.0 AS median_engagement_seconds,
-        AVG(percent_scrolled) AS avg_scroll_percent,
+        SUM(engagement_msec_sum) / NULLIF(SUM(engagement_msec_count), 0) / 1000.0 AS avg_engagement_seconds,
+        {{ approx_percentile_estimate(approx_percentile_combine('engagement_msec_percentiles'), 0.5) }} / 1000.0 AS median_engagement_seconds,
+        SUM(percent_scrolled_sum) / NULLIF(SUM(percent_scrolled_count), 0) AS avg_scroll_percent,
         
         -- Quality metrics
-        AVG(quality_adjusted_engagement) AS avg_quality_adjusted_engagement,
-        SUM(quality_adjusted_engagement) AS total_quality_adjusted_engagement,
+        SUM(quality_adjusted_sum) / NULLIF(SUM(quality_adjusted_count), 0) AS avg_quality_adjusted_engagement,
+        SUM(quality_adjusted_sum) AS total_quality_adjusted_engagement,
         
         -- Revenue metrics
-        SUM(estimated_revenue) AS total_revenue,
-        AVG(estimated_revenue) AS avg_revenue_per_event,
+        SUM(revenue_sum) AS total_revenue,
+        SUM(revenue_sum) / NULLIF(SUM(revenue_count), 0) AS avg_revenue_per_event,
         
         -- Content mix
-        COUNT(CASE WHEN is_premium = TRUE THEN 1 END) AS premium_events,
-        COUNT(CASE WHEN is_evergreen = TRUE THEN 1 END) AS evergreen_events,
-        COUNT(CASE WHEN content_length_bucket = 'long' OR content_length_bucket = 'very_long' THEN 1 END) AS long_form_events
+        SUM(CASE WHEN is_premium = TRUE THEN pageview_events ELSE 0 END) AS premium_events,
+        SUM(CASE WHEN is_evergreen = TRUE THEN pageview_events ELSE 0 END) AS evergreen_events,
+        SUM(CASE WHEN content_length_bucket = 'long' OR content_length_bucket = 'very_long' THEN pageview_events ELSE 0 END) AS long_form_events
         
-    FROM {{ ref('fct_article_events') }}
-    WHERE event_name = 'page_view'
+    FROM {{ ref('fct_article_daily_rollup') }}
+    WHERE pageview_events > 0
     GROUP BY 
-        DATE_TRUNC('week', event_date),
+        DATE_TRUNC('week', event_date)::DATE,
         article_category,
         device_category,
         traffic_medium
@@ -75,7 +77,7 @@ calculated_metrics AS (
         long_form_events * 100.0 / NULLIF(total_events, 0) AS long_form_pct,
         
         -- Metadata
-        CURRENT_TIMESTAMP() AS mart_updated_at
+        CURRENT_TIMESTAMP AS mart_updated_at
         
     FROM weekly_engagement_summary
 )
@@ -6,44 +6,46 @@
   )
 }}
 
+-- Re-aggregates the daily rollup to writer x week; unique counts are
+-- approximate (HLL), article counts are exact.
 WITH weekly_writer_metrics AS (
     SELECT
-        f.writer_id,
-        DATE_TRUNC('week', f.event_date) AS week_start_date,
+        r.writer_id,
+        DATE_TRUNC('week', r.event_date)::DATE AS week_start_date,
         
         -- Article counts
-        COUNT(DISTINCT f.article_id) AS articles_published,
+        COUNT(DISTINCT r.article_id) AS articles_published,
         
         -- Audience metrics
-        COUNT(DISTINCT CASE WHEN f.event_name = 'page_view' THEN f.user_pseudo_id END) AS unique_viewers,
-        COUNT(CASE WHEN f.event_name = 'page_view' THEN 1 END) AS total_page_views,
+        {{ hll_estimate(hll_combine('r.viewers_hll')) }} AS unique_viewers,
+        SUM(r.pageview_events) AS total_page_views,
         
         -- Engagement metrics
-        COUNT(DISTINCT CASE WHEN f.is_engaged = 1 THEN f.user_pseudo_id END) AS engaged_users,
-        COUNT(CASE WHEN f.is_engaged = 1 THEN 1 END) AS engaged_events,
-        AVG(CASE WHEN f.event_name = 'page_view' THEN f.engagement_time_msec / 1000.0 END) AS avg_engagement_seconds,
-        AVG(CASE WHEN f.event_name = 'page_view' THEN f.percent_scrolled END) AS avg_scroll_percent,
+        {{ hll_estimate(hll_combine('r.engaged_users_hll')) }} AS engaged_users,
+        SUM(r.engaged_events) AS engaged_events,
+        SUM(r.engagement_msec_sum) / NULLIF(SUM(r.engagement_msec_count), 0) / 1000.0 AS avg_engagement_seconds,
+        SUM(r.percent_scrolled_sum) / NULLIF(SUM(r.percent_scrolled_count), 0) AS avg_scroll_percent,
         
         -- Quality metrics
-        AVG(f.quality_adjusted_engagement) AS avg_quality_adjusted_engagement,
-        SUM(f.quality_adjusted_engagement) AS total_quality_adjusted_engagement,
+        SUM(r.quality_adjusted_sum) / NULLIF(SUM(r.quality_adjusted_count), 0) AS avg_quality_adjusted_engagement,
+        SUM(r.quality_adjusted_sum) AS total_quality_adjusted_engagement,
         
         -- Revenue metrics
-        SUM(f.estimated_revenue) AS total_revenue,
-        AVG(f.estimated_revenue) AS avg_revenue_per_event,
+        SUM(r.revenue_sum) AS total_revenue,
+        SUM(r.revenue_sum) / NULLIF(SUM(r.revenue_count), 0) AS avg_revenue_per_event,
         
         -- Content mix
-        COUNT(DISTINCT CASE WHEN f.is_premium = TRUE THEN f.article_id END) AS premium_articles,
-        COUNT(DISTINCT CASE WHEN f.content_length_bucket = 'long' OR f.content_length_bucket = 'very_long' THEN f.article_id END) AS long_form_articles,
+        COUNT(DISTINCT CASE WHEN r.is_premium = TRUE THEN r.article_id END) AS premium_articles,
+        COUNT(DISTINCT CASE WHEN r.content_length_bucket = 'long' OR r.content_length_bucket = 'very_long' THEN r.article_id END) AS long_form_articles,
         
         -- Category distribution (assuming writer can write in multiple categories)
-        COUNT(DISTINCT f.article_category) AS categories_covered
+        COUNT(DISTINCT r.article_category) AS categories_covered
         
-    FROM {{ ref('fct_article_events') }} f
-    WHERE f.event_name = 'page_view'
+    FROM {{ ref('fct_article_daily_rollup') }} r
+    WHERE r.pageview_events > 0
     GROUP BY 
-        f.writer_id,
-        DATE_TRUNC('week', f.event_date)
+        r.writer_id,
+        DATE_TRUNC('week', r.event_date)::DATE
 ),
 
 enriched AS (
@@ -89,7 +91,7 @@ enriched AS (
         m.long_form_articles * 100.0 / NULLIF(m.articles_published, 0) AS long_form_pct,
         
         -- Metadata
-        CURRENT_TIMESTAMP() AS mart_updated_at
+        CURRENT_TIMESTAMP AS mart_updated_at
         
     FROM weekly_writer_metrics m
     LEFT JOIN {{ ref('dim_writers') }} w ON m.writer_id = w.writer_id
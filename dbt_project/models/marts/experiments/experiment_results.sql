@@ -20,8 +20,14 @@ WITH experiments AS (
     SELECT * FROM {{ ref('dim_experiments') }}
 ),
 
-assignments AS (
-    SELECT * FROM {{ ref('fct_experiment_assignments') }}
+-- One row per user per experiment, so variant sizes are plain counts
+variant_sizes AS (
+    SELECT
+        experiment_id,
+        SUM(CASE WHEN variant_group = 'control' THEN 1 ELSE 0 END) AS control_users,
+        SUM(CASE WHEN variant_group = 'treatment' THEN 1 ELSE 0 END) AS treatment_users
+    FROM {{ ref('fct_experiment_assignments') }}
+    GROUP BY experiment_id
 ),
 
 -- Define expected lift percentages directly (instead of multipliers)
@@ -56,20 +62,16 @@ expected_lifts AS (
 ),
 
 base_metrics AS (
-    -- Calculate base metrics across all users in each experiment
+    -- Calculate base metrics across all exposed users in each experiment
+    -- from the pre-aggregated per-user stats
     SELECT
-        e.experiment_id,
-        AVG(f.is_engaged) AS base_engagement_rate,
-        AVG(f.quality_adjusted_engagement) AS base_quality_engagement,
-        AVG(f.engagement_time_msec) / 1000.0 AS avg_engagement_seconds,
-        SUM(f.estimated_revenue) / COUNT(DISTINCT a.user_pseudo_id) AS revenue_per_user
-    FROM experiments e
-    INNER JOIN assignments a ON e.experiment_id = a.experiment_id
-    INNER JOIN {{ ref('fct_article_events') }} f 
-        ON a.user_pseudo_id = f.user_pseudo_id 
-        AND a.article_id = f.article_id
-    WHERE f.event_name = 'page_view'
-    GROUP BY e.experiment_id
+        experiment_id,
+        SUM(engaged_pageviews) * 1.0 / NULLIF(SUM(pageviews), 0) AS base_engagement_rate,
+        SUM(quality_adjusted_sum) / NULLIF(SUM(pageviews), 0) AS base_quality_engagement,
+        SUM(engagement_msec_sum) / NULLIF(SUM(pageviews), 0) / 1000.0 AS avg_engagement_seconds,
+        SUM(revenue_sum) / NULLIF(COUNT(DISTINCT user_pseudo_id), 0) AS revenue_per_user
+    FROM {{ ref('fct_experiment_user_stats') }}
+    GROUP BY experiment_id
 ),
 
 simulated_results AS (
@@ -84,7 +86,7 @@ simulated_results AS (
         
         -- Control variant (uses base metrics)
         e.control_variant,
-        COUNT(DISTINCT CASE WHEN a.variant_group = 'control' THEN a.user_pseudo_id END) AS control_users,
+        COALESCE(v.control_users, 0) AS control_users,
         b.base_engagement_rate AS control_engagement_rate,
         b.base_quality_engagement AS control_quality_engagement,
         b.avg_engagement_seconds AS control_avg_seconds,
@@ -92,7 +94,7 @@ simulated_results AS (
         
         -- Treatment variant (applies simulated lift)
         e.treatment_variant,
-        COUNT(DISTINCT CASE WHEN a.variant_group = 'treatment' THEN a.user_pseudo_id END) AS treatment_users,
+        COALESCE(v.treatment_users, 0) AS treatment_users,
         b.base_engagement_rate * (1 + l.expected_engagement_lift_pct / 100.0) AS treatment_engagement_rate,
         b.base_quality_engagement * (1 + l.expected_quality_lift_pct / 100.0) AS treatment_quality_engagement,
         b.avg_engagement_seconds AS treatment_avg_seconds,
@@ -109,8 +111,8 @@ simulated_results AS (
         
         -- Statistical significance
         CASE
-            WHEN COUNT(DISTINCT CASE WHEN a.variant_group = 'control' THEN a.user_pseudo_id END) < 100 
-                 OR COUNT(DISTINCT CASE WHEN a.variant_group = 'treatment' THEN a.user_pseudo_id END) < 100 
+            WHEN COALESCE(v.control_users, 0) < 100 
+                 OR COALESCE(v.treatment_users, 0) < 100 
             THEN 'insufficient_sample'
             WHEN ABS(l.expected_quality_lift_pct) > 5  -- More than 5% lift
             THEN 'significant'
@@ -119,8 +121,8 @@ simulated_results AS (
         
         -- Winner determination
         CASE
-            WHEN COUNT(DISTINCT CASE WHEN a.variant_group = 'control' THEN a.user_pseudo_id END) < 100 
-                 OR COUNT(DISTINCT CASE WHEN a.variant_group = 'treatment' THEN a.user_pseudo_id END) < 100 
+            WHEN COALESCE(v.control_users, 0) < 100 
+                 OR COALESCE(v.treatment_users, 0) < 100 
             THEN 'inconclusive'
             WHEN ABS(l.expected_quality_lift_pct) <= 2  -- Less than 2% lift
             THEN 'no_winner'
@@ -137,28 +139,12 @@ simulated_results AS (
             ELSE FALSE
         END AS is_clickbait_variant,
         
-        CURRENT_TIMESTAMP() AS results_calculated_at
+        CURRENT_TIMESTAMP AS results_calculated_at
         
     FROM experiments e
     INNER JOIN expected_lifts l ON e.experiment_id = l.experiment_id
     INNER JOIN base_metrics b ON e.experiment_id = b.experiment_id
-    LEFT JOIN assignments a ON e.experiment_id = a.experiment_id
-    GROUP BY 
-        e.experiment_id,
-        e.experiment_name,
-        e.category,
-        e.hypothesis,
-        e.start_date,
-        e.end_date,
-        e.duration_days,
-        e.control_variant,
-        e.treatment_variant,
-        b.base_engagement_rate,
-        b.base_quality_engagement,
-        b.avg_engagement_seconds,
-        b.revenue_per_user,
-        l.expected_engagement_lift_pct,
-        l.expected_quality_lift_pct
+    LEFT JOIN variant_sizes v ON e.experiment_id = v.experiment_id
 )
 
 SELECT * FROM simulated_results
\ No newline at end of file
@@ -1,7 +1,9 @@
 -- models/marts/experiments/fct_experiment_assignments.sql
 {{
   config(
-    materialized='table',
+    materialized='incremental',
+    incremental_strategy=merge_incremental_strategy(),
+    unique_key=['experiment_id', 'user_pseudo_id'],
     tags=['marts', 'fact', 'experiments']
   )
 }}
@@ -10,6 +12,11 @@
 Records which variant each user saw for each experiment.
 This ensures proper randomization and prevents cross-contamination.
 
+Exposure-based: a user is assigned on their first event on an article in the
+experiment's category during the experiment window, and that first exposure
+is recorded exactly once. Incremental runs only aggregate events in the
+lookback window and merge them, keeping the earliest exposure seen.
+
 Grain: One row per user per experiment
 */
 
@@ -17,26 +24,54 @@ WITH experiments AS (
     SELECT * FROM {{ ref('dim_experiments') }}
 ),
 
-articles AS (
-    SELECT 
+window_events AS (
+    SELECT
+        user_pseudo_id,
         article_id,
-        category,
-        publish_date
-    FROM {{ ref('dim_articles') }}
+        article_category,
+        event_date,
+        event_timestamp
+    FROM {{ ref('fct_article_events') }}
+    WHERE {{ incremental_event_window('event_timestamp', this_column='latest_exposure_timestamp') }}
 ),
 
-users_in_experiment_window AS (
-    -- Get all users who had events during each experiment window
-    SELECT DISTINCT
+new_exposures AS (
+    SELECT
         e.experiment_id,
-        f.user_pseudo_id,
-        f.article_id,
-        MIN(f.event_timestamp) AS first_exposure_timestamp
-    FROM {{ ref('fct_article_events') }} f
-    INNER JOIN articles a ON f.article_id = a.article_id
-    INNER JOIN experiments e ON a.category = e.category
-        AND f.event_date BETWEEN e.start_date AND e.end_date
-    GROUP BY e.experiment_id, f.user_pseudo_id, f.article_id
+        w.user_pseudo_id,
+        MIN(w.event_timestamp) AS first_exposure_timestamp,
+        MIN_BY(w.article_id, w.event_timestamp) AS first_exposure_article_id,
+        MAX(w.event_timestamp) AS latest_exposure_timestamp
+    FROM window_events w
+    INNER JOIN experiments e ON w.article_category = e.category
+        AND w.event_date BETWEEN e.start_date AND e.end_date
+    GROUP BY e.experiment_id, w.user_pseudo_id
+),
+
+exposures AS (
+    {% if is_incremental() %}
+    -- Keep an already-recorded exposure unless a late event predates it
+    SELECT
+        n.experiment_id,
+        n.user_pseudo_id,
+        CASE
+            WHEN t.first_exposure_timestamp <= n.first_exposure_timestamp THEN t.article_id
+            ELSE n.first_exposure_article_id
+        END AS article_id,
+        LEAST(n.first_exposure_timestamp, COALESCE(t.first_exposure_timestamp, n.first_exposure_timestamp)) AS first_exposure_timestamp,
+        GREATEST(n.latest_exposure_timestamp, COALESCE(t.latest_exposure_timestamp, n.latest_exposure_timestamp)) AS latest_exposure_timestamp
+    FROM new_exposures n
+    LEFT JOIN {{ this }} t ON n.experiment_id = t.experiment_id
+        AND n.user_pseudo_id = t.user_pseudo_id
+    {% else %}
+    SELECT
+        experiment_id,
+        user_pseudo_id,
+        first_exposure_article_id AS article_id,
+        first_exposure_timestamp,
+        latest_exposure_timestamp
+    FROM new_exposures
+    {% endif %}
 ),
 
 assignments AS (
@@ -45,32 +80,33 @@ assignments AS (
         u.user_pseudo_id,
         u.article_id,
         u.first_exposure_timestamp,
-        
+        u.latest_exposure_timestamp,
+
         -- Assign variant using deterministic hash (50/50 split)
-        CASE 
-            WHEN MOD(ABS(HASH(u.user_pseudo_id || u.experiment_id)), 2) = 0 
+        CASE
+            WHEN {{ hash_bucket('u.user_pseudo_id || u.experiment_id', 2) }} = 0
             THEN e.control_variant
             ELSE e.treatment_variant
         END AS variant_assigned,
-        
+
         -- Flag which group
-        CASE 
-            WHEN MOD(ABS(HASH(u.user_pseudo_id || u.experiment_id)), 2) = 0 
+        CASE
+            WHEN {{ hash_bucket('u.user_pseudo_id || u.experiment_id', 2) }} = 0
             THEN 'control'
             ELSE 'treatment'
         END AS variant_group,
-        
+
         -- Experiment context
         e.experiment_name,
         e.category,
         e.start_date,
         e.end_date,
-        
+
         -- Metadata
-        CURRENT_TIMESTAMP() AS assignment_created_at
-        
-    FROM users_in_experiment_window u
+        CURRENT_TIMESTAMP AS assignment_created_at
+
+    FROM exposures u
     INNER JOIN experiments e ON u.experiment_id = e.experiment_id
 )
 
-SELECT * FROM assignments
\ No newline at end of file
+SELECT * FROM assignments
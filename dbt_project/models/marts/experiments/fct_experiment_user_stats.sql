@@ -0,0 +1,68 @@
+-- models/marts/experiments/fct_experiment_user_stats.sql
+{{
+  config(
+    materialized='incremental',
+    incremental_strategy='delete+insert',
+    unique_key='event_date',
+    tags=['marts', 'fact', 'experiments']
+  )
+}}
+
+/*
+Pre-aggregated page-view stats per user per experiment per day, covering
+page views on the experiment's category during the experiment window (i.e.
+from the user's first exposure on). experiment_results sums these instead of
+joining assignments back to fct_article_events.
+
+Incremental: whole days are recomputed (delete+insert on event_date): the
+lookback window plus any older day whose fact rows were re-merged since the
+last build.
+
+Grain: One row per experiment per user per event_date
+*/
+
+WITH experiments AS (
+    SELECT * FROM {{ ref('dim_experiments') }}
+),
+
+page_views AS (
+    SELECT
+        user_pseudo_id,
+        article_category,
+        event_date,
+        is_engaged,
+        quality_adjusted_engagement,
+        engagement_time_msec,
+        estimated_revenue
+    FROM {{ ref('fct_article_events') }}
+    WHERE event_name = 'page_view'
+      AND (
+          {{ incremental_event_window('event_date') }}
+          {%- if is_incremental() %}
+          OR {{ changed_event_dates(ref('fct_article_events'), 'stats_updated_at') }}
+          {%- endif %}
+      )
+),
+
+user_stats AS (
+    SELECT
+        e.experiment_id,
+        p.user_pseudo_id,
+        p.event_date,
+
+        COUNT(*) AS pageviews,
+        SUM(p.is_engaged) AS engaged_pageviews,
+        SUM(p.quality_adjusted_engagement) AS quality_adjusted_sum,
+        SUM(p.engagement_time_msec) AS engagement_msec_sum,
+        SUM(p.estimated_revenue) AS revenue_sum,
+
+        -- Metadata
+        CURRENT_TIMESTAMP AS stats_updated_at
+
+    FROM page_views p
+    INNER JOIN experiments e ON p.article_category = e.category
+        AND p.event_date BETWEEN e.start_date AND e.end_date
+    GROUP BY e.experiment_id, p.user_pseudo_id, p.event_date
+)
+
+SELECT * FROM user_stats
@@ -30,7 +30,7 @@ WITH overall_metrics AS (
         
         -- Time metrics
         AVG(engagement_time_msec) / 1000.0 AS avg_engagement_seconds,
-        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY engagement_time_msec) / 1000.0 AS median_engagement_seconds,
+        {{ percentile_cont('engagement_time_msec', 0.5) }} / 1000.0 AS median_engagement_seconds,
         AVG(percent_scrolled) AS avg_scroll_percent,
         
         -- Revenue metrics
@@ -41,7 +41,7 @@ WITH overall_metrics AS (
         -- Metadata
         MIN(event_date) AS first_event_date,
         MAX(event_date) AS last_event_date,
-        DATEDIFF('day', MIN(event_date), MAX(event_date)) AS days_of_data
+        {{ dbt.datediff("MIN(event_date)", "MAX(event_date)", 'day') }} AS days_of_data
         
     FROM {{ ref('fct_article_events') }}
     WHERE event_name = 'page_view'
@@ -61,7 +61,7 @@ category_metrics AS (
         AVG(quality_adjusted_engagement) AS quality_engagement_rate,
         
         AVG(engagement_time_msec) / 1000.0 AS avg_engagement_seconds,
-        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY engagement_time_msec) / 1000.0 AS median_engagement_seconds,
+        {{ percentile_cont('engagement_time_msec', 0.5) }} / 1000.0 AS median_engagement_seconds,
         AVG(percent_scrolled) AS avg_scroll_percent,
         
         SUM(estimated_revenue) AS total_revenue,
@@ -70,7 +70,7 @@ category_metrics AS (
         
         MIN(event_date) AS first_event_date,
         MAX(event_date) AS last_event_date,
-        DATEDIFF('day', MIN(event_date), MAX(event_date)) AS days_of_data
+        {{ dbt.datediff("MIN(event_date)", "MAX(event_date)", 'day') }} AS days_of_data
         
     FROM {{ ref('fct_article_events') }}
     WHERE event_name = 'page_view'
@@ -91,7 +91,7 @@ device_metrics AS (
         AVG(quality_adjusted_engagement) AS quality_engagement_rate,
         
         AVG(engagement_time_msec) / 1000.0 AS avg_engagement_seconds,
-        PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY engagement_time_msec) / 1000.0 AS median_engagement_seconds,
+        {{ percentile_cont('engagement_time_msec', 0.5) }} / 1000.0 AS median_engagement_seconds,
         AVG(percent_scrolled) AS avg_scroll_percent,
         
         SUM(estimated_revenue) AS total_revenue,
@@ -100,7 +100,7 @@ device_metrics AS (
         
         MIN(event_date) AS first_event_date,
         MAX(event_date) AS last_event_date,
-        DATEDIFF('day', MIN(event_date), MAX(event_date)) AS days_of_data
+        {{ dbt.datediff("MIN(event_date)", "MAX(event_date)", 'day') }} AS days_of_data
         
     FROM {{ ref('fct_article_events') }}
     WHERE event_name = 'page_view'
@@ -117,5 +117,5 @@ combined AS (
 
 SELECT 
     *,
-    CURRENT_TIMESTAMP() AS calculated_at
+    CURRENT_TIMESTAMP AS calculated_at
 FROM combined
\ No newline at end of file
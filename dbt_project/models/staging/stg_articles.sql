@@ -37,7 +37,7 @@ transformed AS (
         
         -- Calculated fields
         CASE 
-            WHEN publish_date <= DATEADD('day', -30, (SELECT max_publish_date FROM max_date))
+            WHEN publish_date <= {{ dbt.dateadd('day', -30, '(SELECT max_publish_date FROM max_date)') }}
             THEN TRUE 
             ELSE FALSE 
         END AS is_evergreen,
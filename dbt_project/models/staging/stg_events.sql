@@ -1,66 +1,98 @@
 -- models/staging/stg_events.sql
 {{
   config(
-    materialized='view',
+    materialized='incremental',
+    incremental_strategy=merge_incremental_strategy(),
+    unique_key=['user_pseudo_id', 'ga_session_id', 'event_timestamp', 'event_name', 'article_id'],
+    cluster_by=['event_date'],
+    on_schema_change='append_new_columns',
     tags=['staging', 'events']
   )
 }}
 
+-- Parsed once per event at load time: each run only reads events_raw rows
+-- loaded since the last run (by _loaded_at), so downstream models and ad-hoc
+-- queries read typed, event_date-clustered columns instead of re-parsing.
 WITH source AS (
-    SELECT * FROM {{ source('raw', 'events_raw') }}
+    SELECT
+        event_date AS event_date_yyyymmdd,
+        event_timestamp AS event_timestamp_micros,
+        event_name,
+        user_pseudo_id,
+        ga_session_id,
+        event_params,
+        device,
+        geo,
+        traffic_source,
+        _loaded_at
+    FROM {{ source('raw', 'events_raw') }}
+    {% if is_incremental() %}
+    -- Small overlap covers loads that committed out of order; the merge dedupes
+    WHERE _loaded_at > (
+        SELECT COALESCE({{ dbt.dateadd('hour', -1, 'MAX(_loaded_at)') }}, '1900-01-01'::TIMESTAMP)
+        FROM {{ this }}
+    )
+    {% endif %}
 ),
 
 parsed AS (
     SELECT
         -- Event identifiers
-        TO_DATE(raw_json:event_date::STRING, 'YYYYMMDD') AS event_date,
-        TO_TIMESTAMP(raw_json:event_timestamp::NUMBER / 1000000) AS event_timestamp,
-        raw_json:event_name::STRING AS event_name,
-        raw_json:user_pseudo_id::STRING AS user_pseudo_id,
-        raw_json:ga_session_id::STRING AS ga_session_id,
+        {{ date_from_yyyymmdd('event_date_yyyymmdd') }} AS event_date,
+        {{ timestamp_from_micros('event_timestamp_micros') }} AS event_timestamp,
+        event_name,
+        user_pseudo_id,
+        ga_session_id,
         
         -- Article/Writer context - parse event_params array
-        raw_json:event_params[0]:value:string_value::STRING AS article_id,
-        raw_json:event_params[1]:value:string_value::STRING AS writer_id,
+        {{ variant_get('event_params', '[0].value.string_value') }} AS article_id,
+        {{ variant_get('event_params', '[1].value.string_value') }} AS writer_id,
         
         -- Engagement metrics - SIMULATE since not in raw data
         -- Generate reasonable values based on event patterns
         CASE 
-            WHEN raw_json:event_name::STRING = 'user_engagement' 
-            THEN ABS(MOD(HASH(raw_json:user_pseudo_id::STRING || raw_json:event_timestamp::STRING), 300)) * 1000 + 60000  -- 60s to 360s
-            WHEN raw_json:event_name::STRING = 'scroll' 
-            THEN ABS(MOD(HASH(raw_json:user_pseudo_id::STRING || raw_json:event_timestamp::STRING), 120)) * 1000 + 30000  -- 30s to 150s
-            WHEN raw_json:event_name::STRING = 'page_view'
-            THEN ABS(MOD(HASH(raw_json:user_pseudo_id::STRING || raw_json:event_timestamp::STRING), 180)) * 1000        -- 0s to 180s
-            ELSE ABS(MOD(HASH(raw_json:user_pseudo_id::STRING || raw_json:event_timestamp::STRING), 60)) * 1000           -- 0s to 60s
+            WHEN event_name = 'user_engagement' 
+            THEN {{ hash_bucket('user_pseudo_id || event_timestamp_micros::STRING', 300) }} * 1000 + 60000  -- 60s to 360s
+            WHEN event_name = 'scroll' 
+            THEN {{ hash_bucket('user_pseudo_id || event_timestamp_micros::STRING', 120) }} * 1000 + 30000  -- 30s to 150s
+            WHEN event_name = 'page_view'
+            THEN {{ hash_bucket('user_pseudo_id || event_timestamp_micros::STRING', 180) }} * 1000        -- 0s to 180s
+            ELSE {{ hash_bucket('user_pseudo_id || event_timestamp_micros::STRING', 60) }} * 1000           -- 0s to 60s
         END AS engagement_time_msec,
         
         CASE 
-            WHEN raw_json:event_name::STRING = 'user_engagement' 
-            THEN ABS(MOD(HASH(raw_json:event_timestamp::STRING || raw_json:user_pseudo_id::STRING), 30)) + 70  -- 70% to 100%
-            WHEN raw_json:event_name::STRING = 'scroll' 
-            THEN ABS(MOD(HASH(raw_json:event_timestamp::STRING || raw_json:user_pseudo_id::STRING), 50)) + 50  -- 50% to 100%
-            WHEN raw_json:event_name::STRING = 'page_view'
-            THEN ABS(MOD(HASH(raw_json:event_timestamp::STRING || raw_json:user_pseudo_id::STRING), 100))      -- 0% to 100%
-            ELSE ABS(MOD(HASH(raw_json:event_timestamp::STRING || raw_json:user_pseudo_id::STRING), 40))       -- 0% to 40%
+            WHEN event_name = 'user_engagement' 
+            THEN {{ hash_bucket('event_timestamp_micros::STRING || user_pseudo_id', 30) }} + 70  -- 70% to 100%
+            WHEN event_name = 'scroll' 
+            THEN {{ hash_bucket('event_timestamp_micros::STRING || user_pseudo_id', 50) }} + 50  -- 50% to 100%
+            WHEN event_name = 'page_view'
+            THEN {{ hash_bucket('event_timestamp_micros::STRING || user_pseudo_id', 100) }}      -- 0% to 100%
+            ELSE {{ hash_bucket('event_timestamp_micros::STRING || user_pseudo_id', 40) }}       -- 0% to 40%
         END AS percent_scrolled,
         
         -- Device information
-        raw_json:device.category::STRING AS device_category,
-        raw_json:device.operating_system::STRING AS device_os,
-        raw_json:device.browser::STRING AS device_browser,
+        {{ variant_get('device', 'category') }} AS device_category,
+        {{ variant_get('device', 'operating_system') }} AS device_os,
+        {{ variant_get('device', 'browser') }} AS device_browser,
         
         -- Geographic information
-        raw_json:geo.country::STRING AS geo_country,
-        raw_json:geo.region::STRING AS geo_region,
-        raw_json:geo.city::STRING AS geo_city,
+        {{ variant_get('geo', 'country') }} AS geo_country,
+        {{ variant_get('geo', 'region') }} AS geo_region,
+        {{ variant_get('geo', 'city') }} AS geo_city,
         
         -- Traffic source
-        raw_json:traffic_source.source::STRING AS traffic_source,
-        raw_json:traffic_source.medium::STRING AS traffic_medium,
-        raw_json:traffic_source.campaign::STRING AS traffic_campaign
+        {{ variant_get('traffic_source', 'source') }} AS traffic_source,
+        {{ variant_get('traffic_source', 'medium') }} AS traffic_medium,
+        {{ variant_get('traffic_source', 'campaign') }} AS traffic_campaign,
+        
+        _loaded_at
         
     FROM source
+    -- Latest load wins if an event was loaded more than once
+    QUALIFY ROW_NUMBER() OVER (
+        PARTITION BY user_pseudo_id, ga_session_id, event_timestamp, event_name, article_id
+        ORDER BY _loaded_at DESC
+    ) = 1
 )
 
 SELECT * FROM parsed
\ No newline at end of file
@@ -12,7 +12,7 @@ transformed as (
         target_articles_per_month,
 
         -- Calculated field: months since tenure start
-        datediff(month, tenure_start_date::date, current_date()) as tenure_months
+        {{ dbt.datediff('tenure_start_date::date', 'current_date()', 'month') }} as tenure_months
 
     from source
 )
@@ -0,0 +1,75 @@
+-- tests/assert_hll_unique_users_within_error_bounds.sql
+{{ config(tags=['approximate']) }}
+
+/*
+Weekly and monthly unique users merged from the day-level HLL states in
+fct_article_daily_rollup (what the semantic layer's unique_users_approx
+serves) must stay close to the exact COUNT(DISTINCT user_pseudo_id) over
+fct_article_events, per category.
+
+Merging HLL states is lossless, so every group has the ~1.62% relative
+standard error (var('hll_relative_std_error')) of a single sketch, and with
+enough groups some land past any fixed bound from noise alone. The bound
+therefore widens with the number of groups compared, n:
+
+    std_error * SQRT(2 * LN(2 * n / var('hll_test_false_failure_rate')))
+
+(a Gaussian tail bound; about 5 standard errors for 1000 groups), which keeps
+the chance of a noise-only failure on Snowflake below that rate. Errors past
+it point at missing or stale days in the rollup, though a gap only a few
+percent of a group's users wide can go unnoticed. On DuckDB the states are
+exact, so any difference fails.
+*/
+
+{% set grains = ['week', 'month'] %}
+
+WITH
+{% for grain in grains %}
+approx_{{ grain }} AS (
+    SELECT
+        DATE_TRUNC('{{ grain }}', event_date)::DATE AS period_start,
+        article_category,
+        {{ hll_estimate(hll_combine('all_users_hll')) }} AS approx_users
+    FROM {{ ref('fct_article_daily_rollup') }}
+    GROUP BY 1, 2
+),
+
+exact_{{ grain }} AS (
+    SELECT
+        DATE_TRUNC('{{ grain }}', event_date)::DATE AS period_start,
+        article_category,
+        COUNT(DISTINCT user_pseudo_id) AS exact_users
+    FROM {{ ref('fct_article_events') }}
+    GROUP BY 1, 2
+),
+
+{% endfor %}
+comparison AS (
+    {% for grain in grains %}
+    SELECT
+        '{{ grain }}' AS grain,
+        e.period_start,
+        e.article_category,
+        e.exact_users,
+        a.approx_users,
+        ABS(COALESCE(a.approx_users, 0) - e.exact_users) * 1.0 / NULLIF(e.exact_users, 0) AS relative_error
+    FROM exact_{{ grain }} e
+    LEFT JOIN approx_{{ grain }} a
+        ON a.period_start = e.period_start
+        AND a.article_category IS NOT DISTINCT FROM e.article_category
+    {% if not loop.last %}UNION ALL{% endif %}
+    {% endfor %}
+),
+
+bounded AS (
+    SELECT
+        *,
+        {{ var('hll_relative_std_error') }} * SQRT(
+            2 * LN(2 * COUNT(*) OVER () / {{ var('hll_test_false_failure_rate') }})
+        ) AS max_relative_error
+    FROM comparison
+)
+
+SELECT *
+FROM bounded
+WHERE relative_error > max_relative_error
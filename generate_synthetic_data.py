@@ -5,17 +5,25 @@ matching the data contract specifications.
 
 Usage:
     python generate_synthetic_data.py --output-dir ./data
+    python generate_synthetic_data.py --num-events 50000000 --engine numpy
+    python generate_synthetic_data.py --num-events 20000000 --engine numpy --stream
+    python generate_synthetic_data.py --num-events 50000000 --engine numpy --workers 8 --seed 42 --merge
+    python generate_synthetic_data.py --num-events 10000000 --engine numpy --stream --format parquet
 """
 
 import json
 import random
 import csv
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple
 import uuid
 import argparse
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
+
 # Configuration matching data contracts
 CONFIG = {
     "start_date": "2024-10-01",
@@ -46,6 +54,28 @@ CONFIG = {
     ]
 }
 
+# Sampling weights shared by the python and numpy event engines
+EVENT_TYPE_WEIGHTS = [80, 5, 10, 3, 2]
+DEVICE_WEIGHTS = [45, 50, 5]
+COUNTRIES = ["US", "CA", "GB", "AU"]
+COUNTRY_WEIGHTS = [85, 5, 5, 5]
+HOUR_WEIGHTS = [2, 1, 1, 1, 1, 2, 3, 5, 7, 8, 9, 9, 9, 8, 8, 8, 9, 10, 10, 9, 8, 6, 4, 3]
+TRAFFIC_SOURCE_WEIGHTS = [40, 15, 10, 20, 10, 5]
+SCROLL_DEPTHS = [25, 50, 75, 90, 100]
+SCROLL_DEPTH_WEIGHTS = [10, 20, 30, 25, 15]
+# Low-cardinality event columns stored dictionary-encoded in parquet/arrow output
+EVENT_DICTIONARY_COLUMNS = [
+    "event_name", "device_category", "device_os", "device_browser", "geo_country",
+    "geo_region", "geo_city", "traffic_source", "traffic_medium", "traffic_campaign",
+]
+PARQUET_MAX_ROW_GROUP_ROWS = 1048576
+US_STATES = ["NY", "CA", "TX", "FL", "IL", "PA", "OH", "GA", "NC", "MI"]
+CITIES = {
+    "NY": ["New York", "Buffalo", "Rochester"],
+    "CA": ["Los Angeles", "San Francisco", "San Diego"],
+    "TX": ["Houston", "Dallas", "Austin"]
+}
+
 
 def generate_writers(num_writers: int) -> List[Dict]:
     """Generate writer metadata according to Contract 3"""
@@ -204,9 +234,16 @@ def generate_articles(num_articles: int, writers: List[Dict]) -> List[Dict]:
     return articles
 
 
-def generate_user_id() -> str:
+def user_id_created_at(seed: Optional[int] = None) -> int:
+    """Timestamp prefix for user pseudo IDs (fixed to the end of the range for seeded runs)"""
+    if seed is not None:
+        return int(datetime.strptime(CONFIG["end_date"], "%Y-%m-%d").timestamp())
+    return int(datetime.now().timestamp())
+
+
+def generate_user_id(created_at: Optional[int] = None) -> str:
     """Generate realistic GA4-style user pseudo ID"""
-    timestamp = int(datetime.now().timestamp())
+    timestamp = created_at if created_at is not None else int(datetime.now().timestamp())
     random_str = ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=10))
     return f"{timestamp}.{random_str}"
 
@@ -217,7 +254,7 @@ def generate_session_id(timestamp: int) -> str:
     return f"{timestamp}.{random_num}"
 
 
-def generate_events(articles: List[Dict], target_events: int) -> List[Dict]:
+def generate_events(articles: List[Dict], target_events: int, seed: Optional[int] = None) -> List[Dict]:
     """Generate GA4-style events according to Contract 1 - OPTIMIZED VERSION"""
     
     start_date = datetime.strptime(CONFIG["start_date"], "%Y-%m-%d")
@@ -241,13 +278,14 @@ def generate_events(articles: List[Dict], target_events: int) -> List[Dict]:
     print(f"Generating {target_events} events...")
     print("  Creating user pool...")
     num_users = 50000
-    user_pool = [generate_user_id() for _ in range(num_users)]
+    created_at = user_id_created_at(seed)
+    user_pool = [generate_user_id(created_at) for _ in range(num_users)]
     
     # Pre-generate random choices for efficiency
     print("  Pre-generating random data...")
     event_types = random.choices(
         CONFIG["event_types"],
-        weights=[80, 5, 10, 3, 2],
+        weights=EVENT_TYPE_WEIGHTS,
         k=target_events
     )
     
@@ -261,14 +299,13 @@ def generate_events(articles: List[Dict], target_events: int) -> List[Dict]:
     
     device_categories = random.choices(
         CONFIG["devices"],
-        weights=[45, 50, 5],
+        weights=DEVICE_WEIGHTS,
         k=target_events
     )
     
-    countries = random.choices(["US", "CA", "GB", "AU"], weights=[85, 5, 5, 5], k=target_events)
+    countries = random.choices(COUNTRIES, weights=COUNTRY_WEIGHTS, k=target_events)
     
-    hour_weights = [2, 1, 1, 1, 1, 2, 3, 5, 7, 8, 9, 9, 9, 8, 8, 8, 9, 10, 10, 9, 8, 6, 4, 3]
-    hours = random.choices(range(24), weights=hour_weights, k=target_events)
+    hours = random.choices(range(24), weights=HOUR_WEIGHTS, k=target_events)
     
     # Pre-generate random date offsets
     days_offsets = [random.randint(0, date_range_days) for _ in range(target_events)]
@@ -276,18 +313,10 @@ def generate_events(articles: List[Dict], target_events: int) -> List[Dict]:
     # Traffic sources
     traffic_source_choices = random.choices(
         CONFIG["traffic_sources"],
-        weights=[40, 15, 10, 20, 10, 5],
+        weights=TRAFFIC_SOURCE_WEIGHTS,
         k=target_events
     )
     
-    # Static data
-    us_states = ["NY", "CA", "TX", "FL", "IL", "PA", "OH", "GA", "NC", "MI"]
-    cities = {
-        "NY": ["New York", "Buffalo", "Rochester"],
-        "CA": ["Los Angeles", "San Francisco", "San Diego"],
-        "TX": ["Houston", "Dallas", "Austin"]
-    }
-    
     print("  Generating events in batches...")
     events = []
     filtered_count = 0
@@ -331,8 +360,8 @@ def generate_events(articles: List[Dict], target_events: int) -> List[Dict]:
         operating_system = random.choice(CONFIG["operating_systems"][device_category])
         
         # Geo
-        region = random.choice(us_states) if country == "US" else ""
-        city = random.choice(cities.get(region, ["Unknown"]))
+        region = random.choice(US_STATES) if country == "US" else ""
+        city = random.choice(CITIES.get(region, ["Unknown"]))
         
         # Campaign
         campaign = None
@@ -352,7 +381,7 @@ def generate_events(articles: List[Dict], target_events: int) -> List[Dict]:
                 {"key": "page_title", "value": {"string_value": article["title"]}}
             ])
         elif event_name == "scroll":
-            percent_scrolled = random.choices([25, 50, 75, 90, 100], weights=[10, 20, 30, 25, 15])[0]
+            percent_scrolled = random.choices(SCROLL_DEPTHS, weights=SCROLL_DEPTH_WEIGHTS)[0]
             event_params.append({"key": "percent_scrolled", "value": {"int_value": percent_scrolled}})
         elif event_name == "user_engagement":
             engagement_time = int(random.lognormvariate(4.5, 0.8) * 1000)
@@ -393,8 +422,531 @@ def generate_events(articles: List[Dict], target_events: int) -> List[Dict]:
     return events
 
 
-def save_data(output_dir: Path, writers: List[Dict], articles: List[Dict], events: List[Dict]):
-    """Save generated data to CSV and JSON files"""
+def _probabilities(weights: List[float]) -> np.ndarray:
+    """Normalize random.choices-style weights into a probability vector"""
+    weights = np.asarray(weights, dtype=np.float64)
+    return weights / weights.sum()
+
+
+def _choose(rng: np.random.Generator, values: List, weights: List[float], size: int) -> np.ndarray:
+    """Vectorized equivalent of random.choices(values, weights, k=size)"""
+    return np.asarray(values)[rng.choice(len(values), size=size, p=_probabilities(weights))]
+
+
+def _choose_per_group(rng: np.random.Generator, groups: np.ndarray, options: Dict[str, List[str]],
+                      default: str) -> np.ndarray:
+    """Pick uniformly from options[group] for every row; rows in other groups get default"""
+    width = max(len(value) for values in [[default], *options.values()] for value in values)
+    out = np.full(len(groups), default, dtype=f"<U{max(width, 1)}")
+    for group, values in options.items():
+        mask = groups == group
+        count = int(mask.sum())
+        if count:
+            out[mask] = np.asarray(values)[rng.integers(0, len(values), size=count)]
+    return out
+
+
+def build_event_context(articles: List[Dict]) -> Dict:
+    """Pre-compute the per-day and per-article lookup tables used by the numpy engine"""
+    start_date = datetime.strptime(CONFIG["start_date"], "%Y-%m-%d")
+    end_date = datetime.strptime(CONFIG["end_date"], "%Y-%m-%d")
+    num_days = (end_date - start_date).days + 1
+    
+    # Epoch microseconds for every (day, hour) in the range. Going through
+    # datetime.timestamp() keeps the same local-time semantics as the python engine.
+    hour_epoch_us = np.empty((num_days, 24), dtype=np.int64)
+    day_strings = []
+    for day in range(num_days):
+        event_date = start_date + timedelta(days=day)
+        day_strings.append(event_date.strftime("%Y%m%d"))
+        for hour in range(24):
+            hour_epoch_us[day, hour] = int(event_date.replace(hour=hour).timestamp()) * 1000000
+    
+    publish_offsets = np.array(
+        [(datetime.strptime(a["publish_date"], "%Y-%m-%d") - start_date).days for a in articles],
+        dtype=np.int64
+    )
+    days_old = (num_days - 1) - publish_offsets
+    article_weights = np.maximum(1, 100 * (0.95 ** days_old))
+    
+    return {
+        "num_days": num_days,
+        "hour_epoch_us": hour_epoch_us,
+        "day_strings": np.array(day_strings),
+        "publish_offsets": publish_offsets,
+        "article_probabilities": article_weights / article_weights.sum(),
+    }
+
+
+def generate_user_pool(rng: np.random.Generator, num_users: int, created_at: int) -> np.ndarray:
+    """Vectorized generate_user_id(): GA4-style '<timestamp>.<10 chars>' pseudo IDs"""
+    alphabet = np.array(list('abcdefghijklmnopqrstuvwxyz0123456789'))
+    suffixes = alphabet[rng.integers(0, len(alphabet), size=(num_users, 10))]
+    prefix = f"{created_at}."
+    return np.array([prefix + ''.join(chars) for chars in suffixes])
+
+
+def draw_event_columns(ctx: Dict, rng: np.random.Generator, user_pool: np.ndarray,
+                       days_offsets: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Draw every Contract 1 field as a column array for the given event days.
+    
+    Events on days before their article's publish date are dropped with a
+    boolean mask; the returned columns are not sorted.
+    """
+    n = len(days_offsets)
+    
+    event_names = _choose(rng, CONFIG["event_types"], EVENT_TYPE_WEIGHTS, n)
+    article_idx = rng.choice(len(ctx["publish_offsets"]), size=n, p=ctx["article_probabilities"])
+    user_idx = rng.integers(0, len(user_pool), size=n)
+    device_categories = _choose(rng, CONFIG["devices"], DEVICE_WEIGHTS, n)
+    countries = _choose(rng, COUNTRIES, COUNTRY_WEIGHTS, n)
+    hours = rng.choice(24, size=n, p=_probabilities(HOUR_WEIGHTS))
+    source_idx = rng.choice(len(CONFIG["traffic_sources"]), size=n, p=_probabilities(TRAFFIC_SOURCE_WEIGHTS))
+    
+    # Publish-date filter (date-level comparison, same as the python engine)
+    keep = days_offsets >= ctx["publish_offsets"][article_idx]
+    days_offsets = days_offsets[keep]
+    event_names = event_names[keep]
+    article_idx = article_idx[keep]
+    user_idx = user_idx[keep]
+    device_categories = device_categories[keep]
+    countries = countries[keep]
+    hours = hours[keep]
+    source_idx = source_idx[keep]
+    n = len(days_offsets)
+    
+    # Timestamps: day/hour base plus uniform minute, second and microsecond
+    event_timestamps = (
+        ctx["hour_epoch_us"][days_offsets, hours]
+        + rng.integers(0, 60, size=n) * 60000000
+        + rng.integers(0, 60, size=n) * 1000000
+        + rng.integers(0, 1000000, size=n)
+    )
+    session_ids = np.char.add(
+        np.char.add((event_timestamps // 1000000).astype(str), "."),
+        rng.integers(1000000, 10000000, size=n).astype(str)
+    )
+    
+    # Device details
+    browsers = _choose_per_group(rng, device_categories, CONFIG["browsers"], "")
+    operating_systems = _choose_per_group(rng, device_categories, CONFIG["operating_systems"], "")
+    
+    # Geo
+    regions = np.where(countries == "US", np.asarray(US_STATES)[rng.integers(0, len(US_STATES), size=n)], "")
+    cities = _choose_per_group(rng, regions, CITIES, "Unknown")
+    
+    # Traffic source and campaign (empty string = no campaign)
+    sources = np.array([s for s, _ in CONFIG["traffic_sources"]])[source_idx]
+    mediums = np.array([m for _, m in CONFIG["traffic_sources"]])[source_idx]
+    campaign_nums = rng.integers(1, 6, size=n).astype(str)
+    campaigns = np.where(
+        np.isin(mediums, ["social", "email"]),
+        np.char.add(np.char.add(mediums, "_campaign_"), campaign_nums),
+        ""
+    )
+    
+    # Event params: 0 where the param does not apply to the event_name
+    percent_scrolled = np.where(
+        event_names == "scroll", _choose(rng, SCROLL_DEPTHS, SCROLL_DEPTH_WEIGHTS, n), 0
+    )
+    engagement_time = np.clip((rng.lognormal(4.5, 0.8, size=n) * 1000).astype(np.int64), 5000, 300000)
+    engagement_time_msec = np.where(event_names == "user_engagement", engagement_time, 0)
+    
+    return {
+        "event_date": ctx["day_strings"][days_offsets],
+        "event_timestamp": event_timestamps,
+        "event_name": event_names,
+        "user_pseudo_id": user_pool[user_idx],
+        "ga_session_id": session_ids,
+        "article_idx": article_idx,
+        "percent_scrolled": percent_scrolled,
+        "engagement_time_msec": engagement_time_msec,
+        "device_category": device_categories,
+        "device_os": operating_systems,
+        "device_browser": browsers,
+        "geo_country": countries,
+        "geo_region": regions,
+        "geo_city": cities,
+        "traffic_source": sources,
+        "traffic_medium": mediums,
+        "traffic_campaign": campaigns,
+    }
+
+
+def sort_event_columns(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Order all columns by event_timestamp"""
+    order = np.argsort(columns["event_timestamp"], kind="stable")
+    return {name: values[order] for name, values in columns.items()}
+
+
+def generate_events_numpy(articles: List[Dict], target_events: int,
+                          seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Generate GA4-style events according to Contract 1 - columnar numpy engine"""
+    rng = np.random.default_rng(seed)
+    ctx = build_event_context(articles)
+    
+    print(f"Generating {target_events} events (numpy engine)...")
+    print("  Creating user pool...")
+    user_pool = generate_user_pool(rng, 50000, user_id_created_at(seed))
+    
+    print("  Drawing event columns...")
+    days_offsets = rng.integers(0, ctx["num_days"], size=target_events)
+    columns = draw_event_columns(ctx, rng, user_pool, days_offsets)
+    
+    kept = len(columns["event_timestamp"])
+    print(f"  Generated {kept} events ({target_events - kept} filtered out due to publish dates)")
+    print("  Sorting events by timestamp...")
+    return sort_event_columns(columns)
+
+
+def iter_day_chunks(ctx: Dict, rng: np.random.Generator, user_pool: np.ndarray,
+                    days: Iterable[int], day_counts: Iterable[int]) -> Iterator[Dict[str, np.ndarray]]:
+    """Draw, filter and sort the events of each day in turn"""
+    for day, count in zip(days, day_counts):
+        days_offsets = np.full(count, day, dtype=np.int64)
+        yield sort_event_columns(draw_event_columns(ctx, rng, user_pool, days_offsets))
+
+
+def generate_event_chunks(articles: List[Dict], target_events: int,
+                          seed: Optional[int] = None) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Generate Contract 1 events one day at a time (streaming numpy engine).
+    
+    Per-day event counts are drawn up front with a multinomial over the date
+    range (the same uniform day distribution as the one-pass engine), then each
+    day is drawn, filtered and sorted on its own. Days never overlap in time, so
+    the concatenated chunks are globally ordered by event_timestamp while peak
+    memory is bounded by a single day's events.
+    """
+    rng = np.random.default_rng(seed)
+    ctx = build_event_context(articles)
+    
+    print(f"Streaming {target_events} events one day at a time (numpy engine)...")
+    user_pool = generate_user_pool(rng, 50000, user_id_created_at(seed))
+    day_counts = draw_day_counts(ctx, rng, target_events)
+    
+    kept = 0
+    for day, chunk in enumerate(iter_day_chunks(ctx, rng, user_pool, range(ctx["num_days"]), day_counts)):
+        kept += len(chunk["event_timestamp"])
+        if day % 10 == 0 and day > 0:
+            print(f"  Progress: day {day}/{ctx['num_days']} ({kept} events kept)")
+        yield chunk
+    
+    print(f"  Generated {kept} events ({target_events - kept} filtered out due to publish dates)")
+
+
+def draw_day_counts(ctx: Dict, rng: np.random.Generator, target_events: int) -> np.ndarray:
+    """Split target_events across the date range (uniform over days)"""
+    return rng.multinomial(target_events, np.full(ctx["num_days"], 1.0 / ctx["num_days"]))
+
+
+def split_event_columns_by_day(columns: Dict[str, np.ndarray]) -> Iterator[Dict[str, np.ndarray]]:
+    """Split timestamp-sorted columns into one chunk per event_date"""
+    dates = columns["event_date"]
+    boundaries = np.flatnonzero(dates[1:] != dates[:-1]) + 1
+    for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(dates)]):
+        yield {name: values[start:end] for name, values in columns.items()}
+
+
+def partition_days(ctx: Dict, day_counts: np.ndarray, num_shards: int) -> List[np.ndarray]:
+    """
+    Split the date range into contiguous day ranges, one per shard.
+    
+    Most drawn events on early days are dropped by the publish-date filter, so
+    the cut points balance the expected number of *kept* events per shard
+    rather than the number of days.
+    """
+    published_share = np.bincount(
+        ctx["publish_offsets"], weights=ctx["article_probabilities"], minlength=ctx["num_days"]
+    ).cumsum()
+    expected_kept = np.cumsum(day_counts * published_share)
+    targets = expected_kept[-1] * np.arange(1, num_shards) / num_shards
+    cuts = np.searchsorted(expected_kept, targets, side="right")
+    return np.split(np.arange(ctx["num_days"]), cuts)
+
+
+def _write_event_shard(path: Path, ctx: Dict, articles: List[Dict], user_pool: np.ndarray,
+                       days: np.ndarray, day_counts: np.ndarray, seed_seq: np.random.SeedSequence,
+                       fmt: str) -> int:
+    """Process-pool worker: generate one shard's days and write them to path"""
+    rng = np.random.default_rng(seed_seq)
+    chunks = iter_day_chunks(ctx, rng, user_pool, days.tolist(), day_counts.tolist())
+    return write_events(path, chunks, articles, fmt)
+
+
+def generate_event_shards(articles: List[Dict], target_events: int, output_dir: Path,
+                          workers: int, seed: Optional[int] = None,
+                          fmt: str = "jsonl") -> Tuple[List[Path], int]:
+    """
+    Generate events across a process pool, one shard per worker.
+    
+    Each shard covers a contiguous date range and draws from its own RNG
+    spawned from the run seed, so the same seed and worker count always produce
+    byte-identical events-00000.<fmt> ... files. Shards are ordered by time.
+    
+    Returns the shard paths and the total number of events written.
+    """
+    seed_seq = np.random.SeedSequence(seed)
+    rng = np.random.default_rng(seed_seq)
+    ctx = build_event_context(articles)
+    
+    print(f"Generating {target_events} events across {workers} worker processes...")
+    user_pool = generate_user_pool(rng, 50000, user_id_created_at(seed))
+    day_counts = draw_day_counts(ctx, rng, target_events)
+    shard_days = partition_days(ctx, day_counts, workers)
+    shard_seeds = seed_seq.spawn(workers)
+    
+    output_dir.mkdir(parents=True, exist_ok=True)
+    shard_paths = [output_dir / f"events-{shard_id:05d}.{fmt}" for shard_id in range(workers)]
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_write_event_shard, path, ctx, articles, user_pool,
+                        days, day_counts[days], shard_seeds[shard_id], fmt)
+            for shard_id, (path, days) in enumerate(zip(shard_paths, shard_days))
+        ]
+        total_events = 0
+        for path, days, future in zip(shard_paths, shard_days, futures):
+            num_events = future.result()
+            total_events += num_events
+            day_span = f"days {days[0]}-{days[-1]}" if len(days) else "no days"
+            print(f"  {path.name}: {num_events} events ({day_span})")
+    
+    return shard_paths, total_events
+
+
+def merge_event_shards(shard_paths: List[Path], output_path: Path, fmt: str = "jsonl"):
+    """
+    Merge shard files into a single timestamp-sorted events file.
+    
+    Shards cover disjoint, increasing date ranges and are each sorted, so
+    concatenating them in shard order is already a sorted merge. Columnar
+    shards are merged row group by row group (batch by batch for arrow), which
+    keeps one row group per event_date.
+    """
+    print(f"Merging {len(shard_paths)} shards into {output_path}")
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        with _parquet_event_writer(output_path) as out:
+            for path in shard_paths:
+                shard = pq.ParquetFile(path)
+                for i in range(shard.num_row_groups):
+                    out.write_table(shard.read_row_group(i))
+    elif fmt == "arrow":
+        import pyarrow as pa
+        with pa.ipc.new_file(output_path, event_arrow_schema()) as out:
+            for path in shard_paths:
+                with pa.memory_map(str(path)) as source:
+                    shard = pa.ipc.open_file(source)
+                    for i in range(shard.num_record_batches):
+                        out.write_batch(shard.get_batch(i))
+    else:
+        with open(output_path, "wb") as out:
+            for path in shard_paths:
+                with open(path, "rb") as f:
+                    shutil.copyfileobj(f, out)
+    for path in shard_paths:
+        path.unlink()
+
+
+def event_records(columns: Dict[str, np.ndarray], articles: List[Dict]) -> Iterator[Dict]:
+    """Yield Contract 1 event dicts from column arrays (serialization time only)"""
+    names = list(columns)
+    for row in zip(*(columns[name].tolist() for name in names)):
+        c = dict(zip(names, row))
+        article = articles[c["article_idx"]]
+        event_name = c["event_name"]
+        
+        event_params = [
+            {"key": "article_id", "value": {"string_value": article["article_id"]}},
+            {"key": "writer_id", "value": {"string_value": article["writer_id"]}}
+        ]
+        if event_name == "page_view":
+            page_location = f"https://example-media.com/{article['category']}/{article['article_id']}"
+            event_params.extend([
+                {"key": "page_location", "value": {"string_value": page_location}},
+                {"key": "page_title", "value": {"string_value": article["title"]}}
+            ])
+        elif event_name == "scroll":
+            event_params.append({"key": "percent_scrolled", "value": {"int_value": c["percent_scrolled"]}})
+        elif event_name == "user_engagement":
+            event_params.append({"key": "engagement_time_msec", "value": {"int_value": c["engagement_time_msec"]}})
+        
+        yield {
+            "event_date": c["event_date"],
+            "event_timestamp": c["event_timestamp"],
+            "event_name": event_name,
+            "user_pseudo_id": c["user_pseudo_id"],
+            "ga_session_id": c["ga_session_id"],
+            "event_params": event_params,
+            "device": {
+                "category": c["device_category"],
+                "operating_system": c["device_os"],
+                "browser": c["device_browser"]
+            },
+            "geo": {
+                "country": c["geo_country"],
+                "region": c["geo_region"],
+                "city": c["geo_city"]
+            },
+            "traffic_source": {
+                "source": c["traffic_source"],
+                "medium": c["traffic_medium"],
+                "campaign": c["traffic_campaign"] or None
+            }
+        }
+
+
+def write_events_jsonl(path: Path, events: Iterable[Dict]) -> int:
+    """Write events as JSONL (one JSON object per line, like GA4 BigQuery export)"""
+    # events may be a generator, so count while writing
+    num_events = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+            num_events += 1
+    return num_events
+
+
+def event_dictionaries() -> Dict[str, np.ndarray]:
+    """
+    Fixed, sorted value sets for the dictionary-encoded event columns.
+    
+    Every chunk, shard and file shares the same dictionaries, which Arrow IPC
+    files require and which lets shards be merged without re-encoding.
+    """
+    mediums = sorted({m for _, m in CONFIG["traffic_sources"]})
+    values = {
+        "event_name": CONFIG["event_types"],
+        "device_category": CONFIG["devices"],
+        "device_os": [os_name for names in CONFIG["operating_systems"].values() for os_name in names],
+        "device_browser": [browser for names in CONFIG["browsers"].values() for browser in names],
+        "geo_country": COUNTRIES,
+        "geo_region": [""] + US_STATES,
+        "geo_city": ["Unknown"] + [city for names in CITIES.values() for city in names],
+        "traffic_source": [s for s, _ in CONFIG["traffic_sources"]],
+        "traffic_medium": mediums,
+        "traffic_campaign": [f"{m}_campaign_{i}" for m in ["social", "email"] for i in range(1, 6)],
+    }
+    return {name: np.array(sorted(set(v))) for name, v in values.items()}
+
+
+def event_arrow_schema():
+    """
+    Flattened Arrow schema for events, matching the columns stg_events extracts.
+    
+    Event params become typed columns (null where the param does not apply to
+    the event) and low-cardinality strings are dictionary-encoded.
+    """
+    import pyarrow as pa
+    
+    def string_column(name):
+        if name in EVENT_DICTIONARY_COLUMNS:
+            return pa.field(name, pa.dictionary(pa.int8(), pa.string()))
+        return pa.field(name, pa.string())
+    
+    return pa.schema([
+        pa.field("event_date", pa.date32()),
+        pa.field("event_timestamp", pa.timestamp("us", tz="UTC")),
+        string_column("event_name"),
+        string_column("user_pseudo_id"),
+        string_column("ga_session_id"),
+        string_column("article_id"),
+        string_column("writer_id"),
+        pa.field("engagement_time_msec", pa.int64()),
+        pa.field("percent_scrolled", pa.int64()),
+        string_column("device_category"),
+        string_column("device_os"),
+        string_column("device_browser"),
+        string_column("geo_country"),
+        string_column("geo_region"),
+        string_column("geo_city"),
+        string_column("traffic_source"),
+        string_column("traffic_medium"),
+        string_column("traffic_campaign"),
+    ])
+
+
+def event_arrow_table(columns: Dict[str, np.ndarray], articles: List[Dict]):
+    """Build a flattened Arrow table from event column arrays"""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    schema = event_arrow_schema()
+    dictionaries = event_dictionaries()
+    article_ids = np.array([a["article_id"] for a in articles])
+    writer_ids = np.array([a["writer_id"] for a in articles])
+    event_names = columns["event_name"]
+    
+    values = {
+        "event_date": pc.strptime(pa.array(columns["event_date"]), format="%Y%m%d", unit="s"),
+        "event_timestamp": columns["event_timestamp"],
+        "article_id": article_ids[columns["article_idx"]],
+        "writer_id": writer_ids[columns["article_idx"]],
+        "engagement_time_msec": pa.array(columns["engagement_time_msec"], mask=event_names != "user_engagement"),
+        "percent_scrolled": pa.array(columns["percent_scrolled"], mask=event_names != "scroll"),
+    }
+    for name, dictionary in dictionaries.items():
+        indices = np.searchsorted(dictionary, columns[name]).astype(np.int8)
+        mask = columns[name] == "" if name == "traffic_campaign" else None
+        values[name] = pa.DictionaryArray.from_arrays(pa.array(indices, mask=mask), pa.array(dictionary))
+    
+    arrays = []
+    for field in schema:
+        value = values.get(field.name, columns.get(field.name))
+        if not isinstance(value, pa.Array):
+            value = pa.array(value)
+        arrays.append(value.cast(field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def _parquet_event_writer(path: Path):
+    """Parquet writer for events: zstd, dictionary-encoded low-cardinality columns"""
+    import pyarrow.parquet as pq
+    return pq.ParquetWriter(
+        path,
+        event_arrow_schema(),
+        compression="zstd",
+        use_dictionary=EVENT_DICTIONARY_COLUMNS + ["article_id", "writer_id"],
+    )
+
+
+def write_events(path: Path, chunks: Iterable[Dict[str, np.ndarray]], articles: List[Dict], fmt: str) -> int:
+    """
+    Write per-day event column chunks as jsonl, parquet or arrow (IPC file).
+    
+    Columnar formats get one row group / record batch per event_date so
+    readers can prune by date from the footer statistics.
+    """
+    if fmt == "jsonl":
+        return write_events_jsonl(path, (record for chunk in chunks for record in event_records(chunk, articles)))
+    
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise SystemExit(f"--format {fmt} requires pyarrow (pip install pyarrow)")
+    
+    num_events = 0
+    if fmt == "parquet":
+        with _parquet_event_writer(path) as writer:
+            for chunk in chunks:
+                table = event_arrow_table(chunk, articles)
+                if table.num_rows:
+                    writer.write_table(table, row_group_size=min(table.num_rows, PARQUET_MAX_ROW_GROUP_ROWS))
+                num_events += table.num_rows
+    else:
+        with pa.ipc.new_file(path, event_arrow_schema()) as writer:
+            for chunk in chunks:
+                table = event_arrow_table(chunk, articles)
+                if table.num_rows:
+                    writer.write_table(table)
+                num_events += table.num_rows
+    return num_events
+
+
+def save_metadata(output_dir: Path, writers: List[Dict], articles: List[Dict]):
+    """Save writer and article metadata to CSV files"""
     output_dir.mkdir(parents=True, exist_ok=True)
     
     # Save writers as CSV
@@ -412,28 +964,57 @@ def save_data(output_dir: Path, writers: List[Dict], articles: List[Dict], event
             writer = csv.DictWriter(f, fieldnames=articles[0].keys())
             writer.writeheader()
             writer.writerows(articles)
-    
-    # Save events as JSONL (one JSON object per line, like GA4 BigQuery export)
-    print(f"Saving {len(events)} events to {output_dir}/events.jsonl")
-    with open(output_dir / "events.jsonl", "w", encoding="utf-8") as f:
-        for event in events:
-            f.write(json.dumps(event) + "\n")
-    
+
+
+def print_summary(output_dir: Path, writers: List[Dict], articles: List[Dict], num_events: int):
+    """Print the end-of-run summary"""
     print(f"\n✅ Data generation complete!")
     print(f"   Writers: {len(writers)}")
     print(f"   Articles: {len(articles)}")
-    print(f"   Events: {len(events)}")
+    print(f"   Events: {num_events}")
     print(f"\nFiles created in: {output_dir.absolute()}")
 
 
+def save_data(output_dir: Path, writers: List[Dict], articles: List[Dict], events: Iterable[Dict]):
+    """Save generated data to CSV and JSON files"""
+    save_metadata(output_dir, writers, articles)
+    
+    print(f"Saving events to {output_dir}/events.jsonl")
+    num_events = write_events_jsonl(output_dir / "events.jsonl", events)
+    
+    print_summary(output_dir, writers, articles, num_events)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate synthetic media analytics data")
     parser.add_argument("--output-dir", default="./data", help="Output directory for data files")
     parser.add_argument("--num-writers", type=int, default=75, help="Number of writers to generate")
     parser.add_argument("--num-articles", type=int, default=5000, help="Number of articles to generate")
     parser.add_argument("--num-events", type=int, default=500000, help="Number of events to generate")
+    parser.add_argument("--engine", choices=["python", "numpy"], default="python",
+                        help="Event engine: row-at-a-time python or vectorized numpy (much faster for large runs)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Generate and write events one day at a time (constant memory, requires --engine numpy)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; >1 writes events-00000.jsonl... shards (requires --engine numpy)")
+    parser.add_argument("--merge", action="store_true",
+                        help="With --workers, merge the shards into a single timestamp-sorted events.<format>")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible (byte-identical) output")
+    parser.add_argument("--format", choices=["jsonl", "parquet", "arrow"], default="jsonl",
+                        help="Events file format; parquet/arrow are flattened and columnar (require --engine numpy)")
     
     args = parser.parse_args()
+    if args.stream and args.engine != "numpy":
+        parser.error("--stream requires --engine numpy")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.engine != "numpy":
+        parser.error("--workers requires --engine numpy")
+    if args.format != "jsonl" and args.engine != "numpy":
+        parser.error(f"--format {args.format} requires --engine numpy")
+    
+    if args.seed is not None:
+        random.seed(args.seed)
     
     output_dir = Path(args.output_dir)
     
@@ -442,6 +1023,10 @@ def main():
     print("=" * 60)
     print(f"Date range: {CONFIG['start_date']} to {CONFIG['end_date']}")
     print(f"Target: {args.num_writers} writers, {args.num_articles} articles, {args.num_events} events")
+    print(f"Engine: {args.engine}{' (streaming)' if args.stream else ''}, workers: {args.workers}, "
+          f"format: {args.format}")
+    if args.seed is not None:
+        print(f"Seed: {args.seed}")
     print()
     
     print("Step 1/3: Generating writers...")
@@ -453,11 +1038,40 @@ def main():
     print(f"  ✓ Generated {len(articles)} articles")
     
     print("\nStep 3/3: Generating events...")
-    events = generate_events(articles, args.num_events)
-    print(f"  ✓ Generated {len(events)} events")
+    events_path = output_dir / f"events.{args.format}"
+    if args.workers > 1:
+        # Shards are written by the worker processes themselves
+        save_metadata(output_dir, writers, articles)
+        shard_paths, num_events = generate_event_shards(
+            articles, args.num_events, output_dir, args.workers, args.seed, args.format
+        )
+        print(f"  ✓ Generated {num_events} events in {len(shard_paths)} shards")
+        if args.merge:
+            merge_event_shards(shard_paths, events_path, args.format)
+        print_summary(output_dir, writers, articles, num_events)
+        return
+    
+    if args.engine == "python":
+        events = generate_events(articles, args.num_events, args.seed)
+        print(f"  ✓ Generated {len(events)} events")
+        print("\nSaving data...")
+        save_data(output_dir, writers, articles, events)
+        return
+    
+    if args.stream:
+        # Events are generated lazily while they are written
+        print("  Events will be generated day by day while saving")
+        chunks = generate_event_chunks(articles, args.num_events, args.seed)
+    else:
+        columns = generate_events_numpy(articles, args.num_events, args.seed)
+        print(f"  ✓ Generated {len(columns['event_timestamp'])} events")
+        chunks = split_event_columns_by_day(columns)
     
     print("\nSaving data...")
-    save_data(output_dir, writers, articles, events)
+    save_metadata(output_dir, writers, articles)
+    print(f"Saving events to {events_path}")
+    num_events = write_events(events_path, chunks, articles, args.format)
+    print_summary(output_dir, writers, articles, num_events)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+"""
+Mock Hugging Face inference server for benchmarks
+
+Answers text-classification POSTs the way the Inference API does (one
+[{label, score}, ...] list per input text) after a fixed simulated latency,
+so enrichment can be benchmarked offline without API quotas or noise.
+
+Usage:
+    python scripts/benchmark/mock_inference_server.py --port 8765 --latency-ms 20
+    HUGGINGFACE_API_URL=http://127.0.0.1:8765/models/distilbert-sst2 python scripts/enrichment/enrich_articles_sentiment.py ...
+"""
+
+import json
+import time
+import zlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Tuple
+
+DEFAULT_PORT = 8765
+DEFAULT_LATENCY_MS = 20.0
+MODEL_PATH = "/models/distilbert-sst2"   # 'distilbert' keeps the enrichment script from appending a path
+
+
+def score_text(text: str) -> List[Dict]:
+    """Deterministic pseudo-scores for one text (same text, same result)"""
+    positive = (zlib.crc32(text.encode("utf-8")) % 1000) / 1000.0
+    return [
+        {"label": "POSITIVE", "score": positive},
+        {"label": "NEGATIVE", "score": round(1.0 - positive, 3)},
+    ]
+
+
+class InferenceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+    latency_seconds = DEFAULT_LATENCY_MS / 1000.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        inputs = payload.get("inputs", [])
+        texts = inputs if isinstance(inputs, list) else [inputs]
+        time.sleep(self.latency_seconds)
+
+        body = json.dumps([score_text(text) for text in texts]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_mock_server(port: int = 0, latency_ms: float = DEFAULT_LATENCY_MS) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve in a daemon thread; returns the server and the model URL (port 0 picks a free port)"""
+    handler = type("Handler", (InferenceHandler,), {"latency_seconds": latency_ms / 1000.0})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-inference", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}{MODEL_PATH}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Hugging Face inference server")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--latency-ms", type=float, default=DEFAULT_LATENCY_MS,
+                        help="Simulated model latency per request")
+    args = parser.parse_args()
+
+    server, url = start_mock_server(args.port, args.latency_ms)
+    print(f"✓ Mock inference server at {url} ({args.latency_ms:g}ms per request)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
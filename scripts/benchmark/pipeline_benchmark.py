@@ -0,0 +1,409 @@
+"""
+End-to-end pipeline benchmark
+
+Runs each pipeline stage at several data scales and records wall time, peak
+RSS and rows/sec per stage into a JSON history file:
+
+    generate  generate_synthetic_data.py (numpy engine, streaming, fixed seed)
+    load      scripts/load_to_duckdb.py into a local DuckDB database
+    enrich    the enrichment pipeline against a mock inference server (dry-run writes)
+    dbt       dbt build on the local DuckDB target
+
+Every stage runs as its own process, so peak RSS is per stage.
+
+Usage:
+    python scripts/benchmark/pipeline_benchmark.py run                      # 100K, 1M, 10M
+    python scripts/benchmark/pipeline_benchmark.py run --scales 100k --stages generate,load
+    python scripts/benchmark/pipeline_benchmark.py baseline                 # latest run becomes the baseline
+    python scripts/benchmark/pipeline_benchmark.py compare --threshold 0.15 # exit 1 on regressions
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional
+
+from mock_inference_server import start_mock_server, DEFAULT_LATENCY_MS
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARK_DIR.parents[1]
+DBT_PROJECT_DIR = REPO_ROOT / "dbt_project"
+
+DEFAULT_SCALES = "100k,1m,10m"          # --num-events passed to the generator
+STAGES = ["generate", "load", "enrich", "dbt"]
+DEFAULT_WORK_DIR = BENCHMARK_DIR / "work"
+DEFAULT_HISTORY_PATH = BENCHMARK_DIR / "benchmark_history.json"
+DEFAULT_BASELINE_PATH = BENCHMARK_DIR / "benchmark_baseline.json"
+DEFAULT_SEED = 42
+
+# Regression thresholds (fractional change vs. the baseline)
+DEFAULT_THROUGHPUT_THRESHOLD = 0.15     # rows/sec drop
+DEFAULT_RSS_THRESHOLD = 0.20            # peak RSS growth
+
+# Enrichment stage settings (the mock server stands in for the Inference API)
+ENRICH_CONCURRENCY = 8
+ENRICH_TEXTS_PER_REQUEST = 16
+
+
+def parse_count(value: str) -> int:
+    """'100k' / '1m' / '2500' -> int"""
+    value = value.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * multiplier)
+
+
+def scale_label(count: int) -> str:
+    if count >= 1_000_000 and count % 1_000_000 == 0:
+        return f"{count // 1_000_000}m"
+    if count >= 1_000 and count % 1_000 == 0:
+        return f"{count // 1_000}k"
+    return str(count)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def max_rss_mb(ru_maxrss: int) -> float:
+    """ru_maxrss is KiB on Linux, bytes on macOS"""
+    return ru_maxrss / (1024 * 1024) if sys.platform == "darwin" else ru_maxrss / 1024
+
+
+def run_process(cmd: List[str], log_path: Path, cwd: Path = REPO_ROOT,
+                env: Optional[Dict[str, str]] = None) -> Dict:
+    """Run cmd to completion with output sent to log_path; returns status, wall time and peak RSS"""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "w") as log:
+        started = time.perf_counter()
+        process = subprocess.Popen(cmd, cwd=cwd, env={**os.environ, **(env or {})},
+                                   stdout=log, stderr=subprocess.STDOUT)
+        # wait4 gives this child's own rusage (peak RSS), unlike RUSAGE_CHILDREN
+        _, status, usage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        "status": "ok" if process.returncode == 0 else "failed",
+        "wall_seconds": round(wall, 3),
+        "peak_rss_mb": round(max_rss_mb(usage.ru_maxrss), 1),
+    }
+
+
+def count_lines(path: Path) -> int:
+    count = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            count += block.count(b"\n")
+    return count
+
+
+def count_events(database: Path) -> int:
+    import duckdb
+    with duckdb.connect(str(database), read_only=True) as conn:
+        return conn.execute("SELECT COUNT(*) FROM raw.events_raw").fetchone()[0]
+
+
+class ScaleRun:
+    """Stage commands and row counts for one data scale"""
+
+    def __init__(self, num_events: int, work_dir: Path, api_url: str):
+        self.num_events = num_events
+        self.label = scale_label(num_events)
+        self.data_dir = work_dir / self.label
+        self.database = self.data_dir / "media_analytics.duckdb"
+        self.log_dir = work_dir / "logs"
+        self.api_url = api_url
+        self.events = None
+
+    def generate(self) -> Dict:
+        if self.data_dir.exists():
+            shutil.rmtree(self.data_dir)
+        result = run_process([
+            sys.executable, "generate_synthetic_data.py", "--output-dir", str(self.data_dir),
+            "--num-events", str(self.num_events), "--engine", "numpy", "--stream",
+            "--seed", str(DEFAULT_SEED),
+        ], self.log_dir / f"{self.label}-generate.log")
+        if result["status"] == "ok":
+            # Events before an article's publish date are dropped, so count what was written
+            result["rows"] = count_lines(self.data_dir / "events.jsonl")
+        return result
+
+    def load(self) -> Dict:
+        result = run_process([
+            sys.executable, "scripts/load_to_duckdb.py",
+            "--data-dir", str(self.data_dir), "--database", str(self.database),
+        ], self.log_dir / f"{self.label}-load.log")
+        if result["status"] == "ok":
+            self.events = count_events(self.database)
+            result["rows"] = self.events
+        return result
+
+    def enrich(self) -> Dict:
+        result = run_process([
+            sys.executable, str(Path(__file__).resolve()), "enrich",
+            "--data-dir", str(self.data_dir), "--api-url", self.api_url,
+        ], self.log_dir / f"{self.label}-enrich.log")
+        if result["status"] == "ok":
+            result["rows"] = count_lines(self.data_dir / "articles.csv") - 1
+        return result
+
+    def dbt(self) -> Dict:
+        if shutil.which("dbt") is None:
+            return {"status": "skipped", "reason": "dbt not installed (pip install dbt-duckdb)"}
+        env = {"DUCKDB_PATH": str(self.database)}
+        if not (DBT_PROJECT_DIR / "dbt_packages").exists():
+            run_process(["dbt", "deps"], self.log_dir / "dbt-deps.log", cwd=DBT_PROJECT_DIR, env=env)
+        result = run_process([
+            "dbt", "build", "--profiles-dir", "local", "--target", "duckdb", "--full-refresh",
+        ], self.log_dir / f"{self.label}-dbt.log", cwd=DBT_PROJECT_DIR, env=env)
+        if result["status"] == "ok":
+            result["rows"] = self.events if self.events is not None else count_events(self.database)
+        return result
+
+
+def run_benchmark(scales: List[int], stages: List[str], work_dir: Path,
+                  latency_ms: float = DEFAULT_LATENCY_MS, keep_data: bool = False) -> Dict:
+    """Run the selected stages at each scale; returns the run record"""
+    server, api_url = start_mock_server(latency_ms=latency_ms)
+    record = {
+        "run_id": datetime.now().strftime("%Y%m%dT%H%M%S"),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "host": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+        },
+        "mock_latency_ms": latency_ms,
+        "results": [],
+    }
+
+    try:
+        for num_events in scales:
+            scale = ScaleRun(num_events, work_dir, api_url)
+            print(f"\nScale {scale.label} ({num_events:,} target events)")
+            failed = None
+            for stage in stages:
+                if failed:
+                    result = {"status": "skipped", "reason": f"{failed} failed"}
+                else:
+                    result = getattr(scale, stage)()
+                if result.get("rows") and result.get("wall_seconds"):
+                    result["rows_per_second"] = round(result["rows"] / result["wall_seconds"], 1)
+                record["results"].append({"scale": scale.label, "stage": stage, **result})
+
+                if result["status"] == "ok":
+                    print(f"  ✓ {stage:<9} {result['wall_seconds']:>8.1f}s  {result['peak_rss_mb']:>8.1f} MB  "
+                          f"{result.get('rows', 0):>11,} rows  {result.get('rows_per_second', 0):>11,.0f} rows/s")
+                else:
+                    print(f"  ⚠ {stage:<9} {result['status']}: "
+                          f"{result.get('reason', f'see {scale.log_dir}/{scale.label}-{stage}.log')}")
+                    if result["status"] == "failed":
+                        failed = stage
+            if not keep_data and scale.data_dir.exists():
+                shutil.rmtree(scale.data_dir)
+    finally:
+        server.shutdown()
+
+    return record
+
+
+def load_history(path: Path) -> List[Dict]:
+    if not path.exists():
+        return []
+    with open(path) as f:
+        return json.load(f)["runs"]
+
+
+def append_history(path: Path, record: Dict):
+    runs = load_history(path) + [record]
+    with open(path, "w") as f:
+        json.dump({"runs": runs}, f, indent=2)
+
+
+def find_run(runs: List[Dict], run_id: Optional[str] = None) -> Dict:
+    if not runs:
+        raise SystemExit("No benchmark runs recorded yet (run the `run` command first)")
+    if run_id is None:
+        return runs[-1]
+    for run in runs:
+        if run["run_id"] == run_id:
+            return run
+    raise SystemExit(f"Run {run_id} not found in history")
+
+
+def compare_runs(baseline: Dict, current: Dict,
+                 throughput_threshold: float = DEFAULT_THROUGHPUT_THRESHOLD,
+                 rss_threshold: float = DEFAULT_RSS_THRESHOLD) -> List[Dict]:
+    """
+    Per (scale, stage) changes vs. the baseline.
+
+    A stage regresses when its rows/sec drops by more than
+    throughput_threshold or its peak RSS grows by more than rss_threshold.
+    Stages that did not succeed in both runs are not compared.
+    """
+    base = {(r["scale"], r["stage"]): r for r in baseline["results"] if r["status"] == "ok"}
+    rows = []
+    for result in current["results"]:
+        before = base.get((result["scale"], result["stage"]))
+        if before is None or result["status"] != "ok":
+            continue
+        throughput_change = (result.get("rows_per_second", 0) / before["rows_per_second"] - 1
+                             if before.get("rows_per_second") else 0.0)
+        rss_change = result["peak_rss_mb"] / before["peak_rss_mb"] - 1 if before["peak_rss_mb"] else 0.0
+        rows.append({
+            "scale": result["scale"],
+            "stage": result["stage"],
+            "wall_change": result["wall_seconds"] / before["wall_seconds"] - 1,
+            "throughput_change": throughput_change,
+            "rss_change": rss_change,
+            "regressed": throughput_change < -throughput_threshold or rss_change > rss_threshold,
+        })
+    return rows
+
+
+def print_comparison(rows: List[Dict], baseline: Dict, current: Dict):
+    print(f"Baseline {baseline['run_id']} ({baseline.get('git_commit')}) -> "
+          f"current {current['run_id']} ({current.get('git_commit')})")
+    print(f"  {'scale':<6} {'stage':<9} {'wall':>8} {'rows/s':>8} {'peak RSS':>9}")
+    for row in rows:
+        marker = "⚠" if row["regressed"] else "✓"
+        print(f"{marker} {row['scale']:<6} {row['stage']:<9} {row['wall_change']:>+8.1%} "
+              f"{row['throughput_change']:>+8.1%} {row['rss_change']:>+9.1%}")
+
+
+def run_compare(history_path: Path, baseline_path: Path, run_id: Optional[str],
+                throughput_threshold: float, rss_threshold: float) -> bool:
+    """Compare a run against the stored baseline; True if any stage regressed"""
+    if not baseline_path.exists():
+        print(f"⚠ No baseline at {baseline_path} (create one with the `baseline` command)")
+        return False
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    current = find_run(load_history(history_path), run_id)
+
+    rows = compare_runs(baseline, current, throughput_threshold, rss_threshold)
+    print_comparison(rows, baseline, current)
+    regressed = [row for row in rows if row["regressed"]]
+    if regressed:
+        print(f"\n⚠ {len(regressed)} stage(s) regressed past the thresholds "
+              f"(rows/sec -{throughput_threshold:.0%}, peak RSS +{rss_threshold:.0%})")
+    else:
+        print("\n✓ No regressions")
+    return bool(regressed)
+
+
+def enrich_stage(data_dir: Path, api_url: str, concurrency: int = ENRICH_CONCURRENCY):
+    """
+    Score every article title through the enrichment pipeline.
+
+    Same fetch -> inference -> write stages and HTTP backend as production,
+    pointed at api_url, without the cache and with dry-run (no Snowflake) writes.
+    """
+    import csv
+    os.environ["HUGGINGFACE_API_URL"] = api_url     # read at import time
+    sys.path.insert(0, str(REPO_ROOT / "scripts" / "enrichment"))
+    import enrich_articles_sentiment as enrichment
+
+    with open(data_dir / "articles.csv", newline="", encoding="utf-8") as f:
+        articles = sorted(({"article_id": row["article_id"], "title": row["title"],
+                            "category": row["category"]} for row in csv.DictReader(f)),
+                          key=lambda a: a["article_id"])
+    pages = [articles[i:i + enrichment.DEFAULT_FLUSH_SIZE]
+             for i in range(0, len(articles), enrichment.DEFAULT_FLUSH_SIZE)]
+
+    backend = enrichment.HTTPBackend("benchmark", concurrency=concurrency, rate_limit=0,
+                                     texts_per_request=ENRICH_TEXTS_PER_REQUEST)
+    writer = enrichment.SentimentWriter(None, dry_run=True)
+    pipeline = enrichment.EnrichmentPipeline(iter(pages), backend, writer)
+    try:
+        pipeline.run()
+    finally:
+        backend.close()
+    print(f"✓ Scored {len(articles)} articles: {pipeline.describe()}")
+    print(enrichment.format_latency("api_request"))
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH, help="JSON history file")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH, help="JSON baseline file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmark and append it to the history")
+    run.add_argument("--scales", default=DEFAULT_SCALES,
+                     help="Comma-separated generator --num-events targets, e.g. 100k,1m,10m")
+    run.add_argument("--stages", default=",".join(STAGES), help=f"Comma-separated subset of {STAGES}")
+    run.add_argument("--work-dir", type=Path, default=DEFAULT_WORK_DIR,
+                     help="Scratch directory for generated data and stage logs")
+    run.add_argument("--mock-latency-ms", type=float, default=DEFAULT_LATENCY_MS,
+                     help="Simulated inference latency per request")
+    run.add_argument("--keep-data", action="store_true", help="Keep each scale's data after the run")
+    run.add_argument("--compare", action="store_true", help="Compare against the baseline afterwards")
+
+    baseline = commands.add_parser("baseline", help="Store a run from the history as the baseline")
+    baseline.add_argument("--run-id", help="Run to store (default: latest)")
+
+    for command in (run, commands.add_parser("compare", help="Compare a run against the baseline")):
+        command.add_argument("--threshold", type=float, default=DEFAULT_THROUGHPUT_THRESHOLD,
+                             help="Flag rows/sec drops larger than this fraction")
+        command.add_argument("--rss-threshold", type=float, default=DEFAULT_RSS_THRESHOLD,
+                             help="Flag peak RSS growth larger than this fraction")
+    commands.choices["compare"].add_argument("--run-id", help="Run to compare (default: latest)")
+
+    enrich = commands.add_parser("enrich", help="(stage entry point) score articles against a mock server")
+    enrich.add_argument("--data-dir", type=Path, required=True)
+    enrich.add_argument("--api-url", required=True)
+    enrich.add_argument("--concurrency", type=int, default=ENRICH_CONCURRENCY)
+    args = parser.parse_args()
+
+    if args.command == "enrich":
+        enrich_stage(args.data_dir, args.api_url, args.concurrency)
+        return
+
+    if args.command == "baseline":
+        record = find_run(load_history(args.history), args.run_id)
+        with open(args.baseline, "w") as f:
+            json.dump(record, f, indent=2)
+        print(f"✓ Stored run {record['run_id']} ({record.get('git_commit')}) as the baseline in {args.baseline}")
+        return
+
+    if args.command == "compare":
+        sys.exit(1 if run_compare(args.history, args.baseline, args.run_id,
+                                  args.threshold, args.rss_threshold) else 0)
+
+    requested = {stage.strip() for stage in args.stages.split(",")}
+    if requested - set(STAGES):
+        parser.error(f"unknown stage(s): {', '.join(sorted(requested - set(STAGES)))}")
+    stages = [stage for stage in STAGES if stage in requested]
+    scales = [parse_count(value) for value in args.scales.split(",")]
+
+    print("=" * 60)
+    print("Pipeline Benchmark")
+    print("=" * 60)
+    print(f"Scales: {', '.join(scale_label(s) for s in scales)} | stages: {', '.join(stages)}")
+
+    record = run_benchmark(scales, stages, args.work_dir, args.mock_latency_ms, args.keep_data)
+    append_history(args.history, record)
+    print(f"\n✓ Recorded run {record['run_id']} in {args.history}")
+
+    if args.compare:
+        sys.exit(1 if run_compare(args.history, args.baseline, record["run_id"],
+                                  args.threshold, args.rss_threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,29 @@ This demonstrates AI-in-production data pipeline integration.
 Usage:
     python enrich_articles_sentiment.py --batch-size 100 --dry-run
     python enrich_articles_sentiment.py  # Run for real
+    python enrich_articles_sentiment.py --concurrency 8 --rate-limit 10
+    python enrich_articles_sentiment.py --texts-per-request 32
+    python enrich_articles_sentiment.py --refresh-cache  # Re-score cached titles
+    python enrich_articles_sentiment.py --backend local --model-path ./models/distilbert-base-uncased-finetuned-sst-2-english
+    python enrich_articles_sentiment.py --drain --batch-size 1000  # Whole backlog, resumable
+    python enrich_articles_sentiment.py --drain --quiet --prometheus metrics.prom
 """
 
 import os
 import sys
+import json
+import queue
+import random
+import hashlib
+import sqlite3
 import argparse
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 import requests
+from requests.adapters import HTTPAdapter
 import snowflake.connector
 from dotenv import load_dotenv
 
@@ -43,6 +57,49 @@ HF_API_URL = os.getenv(
 if 'HUGGINGFACE_API_URL' in os.environ and 'distilbert' not in HF_API_URL.lower():
     HF_API_URL = f"{HF_API_URL}/distilbert/distilbert-base-uncased-finetuned-sst-2-english"
 
+MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Local CPU backend: weights directory and padded mini-batch limits
+LOCAL_MODEL_PATH = os.getenv('SENTIMENT_MODEL_PATH', os.path.join('models', MODEL_NAME))
+LOCAL_MAX_BATCH_SIZE = 64
+LOCAL_MAX_BATCH_TOKENS = 4096   # batch size x padded sequence length
+LOCAL_MAX_SEQ_TOKENS = 512
+
+# Request scheduling defaults
+DEFAULT_CONCURRENCY = 4         # in-flight API requests
+DEFAULT_RATE_LIMIT = 2.0        # requests/second (the old fixed 0.5s sleep)
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+RETRY_STATUS_CODES = {429, 503}  # rate limited / model loading
+SPLIT_STATUS_CODES = {413, 422}  # payload too large / an input rejected: retry in halves
+AUTH_STATUS_CODES = {401, 403}   # bad or unauthorized token: stop the run
+
+# Batched inference: texts per HTTP call, bounded by JSON payload size
+MAX_TEXT_CHARS = 512            # model input limit
+DEFAULT_TEXTS_PER_REQUEST = 16
+MAX_PAYLOAD_BYTES = 64 * 1024
+
+# Bulk write-back: results per MERGE into article_metadata
+DEFAULT_FLUSH_SIZE = 500
+SENTIMENT_UPDATES_TABLE = "sentiment_updates"
+
+# Local sentiment cache (SQLite, LRU-evicted by entry count)
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sentiment_cache.sqlite")
+DEFAULT_CACHE_MAX_ENTRIES = 200000
+
+# Pipeline: fetch -> inference workers -> writer, joined by bounded queues
+DEFAULT_INFERENCE_WORKERS = 2
+PIPELINE_QUEUE_DEPTH = 4        # chunks buffered between stages
+INFERENCE_CHUNK_SIZE = 64       # articles per inference work item
+
+# Run report (JSON) written at the end of every run
+DEFAULT_REPORT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "enrichment_report.json")
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+
+# --drain checkpoint: last article_id written back
+DEFAULT_CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".enrichment_checkpoint.json")
+
 
 def get_snowflake_connection():
     """Create Snowflake connection."""
@@ -56,10 +113,12 @@ def get_snowflake_connection():
     )
 
 
-def fetch_unenriched_articles(conn, batch_size: int = 100) -> List[Dict]:
+def fetch_unenriched_articles(conn, batch_size: int = 100, after_id: Optional[str] = None) -> List[Dict]:
     """
     Fetch articles that haven't been enriched with sentiment yet.
     
+    Results are ordered by article_id; pass the last id seen as `after_id`
+    to fetch the next page (keyset pagination, no OFFSET rescans).
     Returns list of dicts with article_id and title.
     """
     cursor = conn.cursor()
@@ -70,12 +129,14 @@ def fetch_unenriched_articles(conn, batch_size: int = 100) -> List[Dict]:
         title,
         category
     FROM article_metadata
-    WHERE sentiment_enriched_at IS NULL
-       OR sentiment_label IS NULL
-    LIMIT {batch_size}
+    WHERE (sentiment_enriched_at IS NULL
+       OR sentiment_label IS NULL)
+      {"AND article_id > %s" if after_id is not None else ""}
+    ORDER BY article_id
+    LIMIT {int(batch_size)}
     """
     
-    cursor.execute(query)
+    cursor.execute(query, (after_id,) if after_id is not None else None)
     
     articles = []
     for row in cursor:
@@ -89,118 +150,1054 @@ def fetch_unenriched_articles(conn, batch_size: int = 100) -> List[Dict]:
     return articles
 
 
-def analyze_sentiment_batch(texts: List[str], api_key: str) -> List[Dict]:
+class Metrics:
     """
-    Call Hugging Face API to analyze sentiment for a batch of texts.
+    Thread-safe run counters and latency samples.
+    
+    Latencies are kept as raw samples (runs are bounded by the backlog
+    size), so quantiles are exact.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[str, int] = {}
+        self.latencies: Dict[str, List[float]] = {}
+    
+    def increment(self, name: str, n: int = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+    
+    def observe(self, name: str, seconds: float):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(seconds)
     
-    Returns list of sentiment results with scores and labels.
+    def latency_summary(self, name: str) -> Dict:
+        """count/mean/max and p50/p95/p99 (nearest-rank) in seconds"""
+        with self.lock:
+            samples = sorted(self.latencies.get(name, []))
+        if not samples:
+            return {'count': 0}
+        summary = {
+            'count': len(samples),
+            'mean': sum(samples) / len(samples),
+            'max': samples[-1],
+        }
+        for q in LATENCY_QUANTILES:
+            summary[f"p{int(q * 100)}"] = samples[min(len(samples) - 1, int(q * len(samples)))]
+        return summary
+    
+    def snapshot(self) -> Dict:
+        with self.lock:
+            counters = dict(self.counters)
+            names = list(self.latencies)
+        return {
+            'counters': counters,
+            'latency_seconds': {name: self.latency_summary(name) for name in names},
+        }
+    
+    def prometheus_text(self, extra_gauges: Optional[Dict[str, float]] = None) -> str:
+        """Prometheus text exposition format (counters, latency summaries, gauges)"""
+        lines = []
+        with self.lock:
+            counters = dict(self.counters)
+            latencies = {name: list(samples) for name, samples in self.latencies.items()}
+        for name, value in sorted(counters.items()):
+            metric = f"enrichment_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        for name in sorted(latencies):
+            metric = f"enrichment_{name}_seconds"
+            summary = self.latency_summary(name)
+            lines.append(f"# TYPE {metric} summary")
+            for q in LATENCY_QUANTILES:
+                lines.append(f'{metric}{{quantile="{q}"}} {summary[f"p{int(q * 100)}"]:.6f}')
+            lines.append(f"{metric}_sum {sum(latencies[name]):.6f}")
+            lines.append(f"{metric}_count {summary['count']}")
+        for name, value in sorted((extra_gauges or {}).items()):
+            metric = f"enrichment_{name}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+    
+    Allows `rate` requests per second on average with bursts of up to
+    `capacity` requests. A rate <= 0 disables limiting.
     """
-    headers = {"Authorization": f"Bearer {api_key}"}
     
-    results = []
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def create_http_session(api_key: str, pool_size: int = DEFAULT_CONCURRENCY) -> requests.Session:
+    """Reusable keep-alive HTTP session sized for `pool_size` concurrent requests"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Authorization": f"Bearer {api_key}"})
+    return session
+
+
+def backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Exponential backoff with full jitter, honoring a numeric Retry-After header"""
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX_SECONDS, float(retry_after))
+        except ValueError:
+            pass
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def post_with_retries(session: requests.Session, payload: Dict, rate_limiter: TokenBucket,
+                      max_retries: int = MAX_RETRIES) -> requests.Response:
+    """
+    POST to the inference API, retrying 429/503 responses and transport errors.
     
-    for text in texts:
-        # Truncate to first 512 characters (model limit)
-        truncated_text = text[:512]
+    Every attempt takes a rate-limiter token. Returns the last response
+    (which may still be an error status); re-raises the last transport error.
+    """
+    for attempt in range(max_retries + 1):
+        if attempt:
+            METRICS.increment('api_retries')
+        rate_limiter.acquire()
+        started = time.perf_counter()
+        try:
+            response = session.post(HF_API_URL, json=payload, timeout=30)
+        except (requests.ConnectionError, requests.Timeout):
+            METRICS.increment('api_transport_errors')
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+        finally:
+            METRICS.observe('api_request', time.perf_counter() - started)
         
+        METRICS.increment('api_requests')
+        if response.status_code not in RETRY_STATUS_CODES or attempt == max_retries:
+            return response
+        METRICS.increment(f"api_status_{response.status_code}")
+        time.sleep(backoff_delay(attempt, response.headers.get("Retry-After")))
+
+
+def neutral_sentiment() -> Dict:
+    """Fallback result when a text cannot be scored"""
+    return {
+        'sentiment_score_positive': 0.5,
+        'sentiment_score_negative': 0.5,
+        'sentiment_label': 'NEUTRAL'
+    }
+
+
+def parse_sentiment_output(sentiment_output) -> Dict:
+    """
+    Parse a Hugging Face text-classification response for one text.
+    
+    Format: [[{'label': 'POSITIVE', 'score': 0.9998}, {'label': 'NEGATIVE', 'score': 0.0002}]]
+    """
+    if not (isinstance(sentiment_output, list) and len(sentiment_output) > 0):
+        return neutral_sentiment()
+    
+    if isinstance(sentiment_output[0], list):
+        sentiment_data = sentiment_output[0]
+    else:
+        sentiment_data = sentiment_output
+    
+    # Find POSITIVE and NEGATIVE scores
+    positive_score = next((s['score'] for s in sentiment_data if s['label'] == 'POSITIVE'), 0.5)
+    negative_score = next((s['score'] for s in sentiment_data if s['label'] == 'NEGATIVE'), 0.5)
+    
+    # Determine overall label (highest score)
+    label = max(sentiment_data, key=lambda x: x['score'])['label']
+    
+    return {
+        'sentiment_score_positive': positive_score,
+        'sentiment_score_negative': negative_score,
+        'sentiment_label': label
+    }
+
+
+def is_valid_prediction(prediction) -> bool:
+    """True if `prediction` is a non-empty list of {label, score} dicts"""
+    return (
+        isinstance(prediction, list) and len(prediction) > 0
+        and all(isinstance(p, dict) and 'label' in p and 'score' in p for p in prediction)
+    )
+
+
+def pack_requests(texts: List[str], max_texts: int = DEFAULT_TEXTS_PER_REQUEST,
+                  max_bytes: int = MAX_PAYLOAD_BYTES) -> List[List[int]]:
+    """
+    Group text positions into request batches.
+    
+    Each batch holds at most `max_texts` texts and its JSON-encoded inputs
+    stay under `max_bytes` (a single oversized text still gets its own batch).
+    """
+    batches = []
+    current, current_bytes = [], 0
+    for i, text in enumerate(texts):
+        size = len(json.dumps(text)) + 1
+        if current and (len(current) >= max_texts or current_bytes + size > max_bytes):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(i)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def analyze_sentiment_request(session: requests.Session, texts: List[str], rate_limiter: TokenBucket,
+                              max_retries: int = MAX_RETRIES) -> List[Dict]:
+    """
+    Score a list of texts with one API call, results in input order.
+    
+    The inference API returns one label/score list per input. If the
+    response does not line up with the inputs or the payload is rejected
+    (413/422), the batch is split in half and each half retried; only a
+    single text that still fails falls back to NEUTRAL. Any other error the
+    retries gave up on falls back for the whole batch without splitting, and
+    401/403 raise requests.HTTPError.
+    """
+    # Truncate to first 512 characters (model limit)
+    inputs = [text[:MAX_TEXT_CHARS] for text in texts]
+    
+    try:
+        response = post_with_retries(session, {"inputs": inputs}, rate_limiter, max_retries)
+    except requests.RequestException as e:
+        return neutral_fallback(texts, f"Error analyzing sentiment: {e}")
+    
+    if response.status_code in AUTH_STATUS_CODES:
+        response.raise_for_status()
+    if response.status_code == 200:
         try:
-            response = requests.post(
-                HF_API_URL,
-                headers=headers,
-                json={"inputs": truncated_text},
-                timeout=30
+            predictions = response.json()
+        except ValueError:
+            predictions = None
+        if (isinstance(predictions, list) and len(predictions) == len(inputs)
+                and all(is_valid_prediction(p) for p in predictions)):
+            return [parse_sentiment_output(p) for p in predictions]
+        error = f"unexpected response shape for {len(inputs)} inputs"
+    else:
+        error = f"API Error: {response.status_code} - {response.text[:200]}"
+        if response.status_code not in SPLIT_STATUS_CODES:
+            return neutral_fallback(texts, error)
+    
+    if len(texts) > 1:
+        mid = len(texts) // 2
+        METRICS.increment('batch_splits')
+        print(f"  {error}; splitting batch of {len(texts)}")
+        return (analyze_sentiment_request(session, texts[:mid], rate_limiter, max_retries)
+                + analyze_sentiment_request(session, texts[mid:], rate_limiter, max_retries))
+    
+    return neutral_fallback(texts, error)
+
+
+def neutral_fallback(texts: List[str], error: str) -> List[Dict]:
+    """NEUTRAL results for texts that could not be scored"""
+    print(f"  {error}")
+    METRICS.increment('neutral_fallbacks', len(texts))
+    return [neutral_sentiment() for _ in texts]
+
+
+def analyze_sentiment_batch(texts: List[str], api_key: str, concurrency: int = 1,
+                            rate_limiter: Optional[TokenBucket] = None,
+                            session: Optional[requests.Session] = None,
+                            max_retries: int = MAX_RETRIES,
+                            texts_per_request: int = DEFAULT_TEXTS_PER_REQUEST,
+                            executor: Optional[ThreadPoolExecutor] = None) -> List[Dict]:
+    """
+    Call Hugging Face API to analyze sentiment for a batch of texts.
+    
+    Texts are packed up to `texts_per_request` per HTTP call (bounded by
+    payload size), with up to `concurrency` calls in flight on a shared
+    keep-alive session, paced by the token-bucket rate limiter. Pass a
+    shared `executor` to cap in-flight calls across concurrent callers
+    instead (its max_workers is the cap).
+    Returns list of sentiment results with scores and labels, in input order.
+    """
+    session = session or create_http_session(api_key, concurrency)
+    rate_limiter = rate_limiter or TokenBucket(DEFAULT_RATE_LIMIT)
+    truncated = [text[:MAX_TEXT_CHARS] for text in texts]
+    batches = pack_requests(truncated, texts_per_request)
+    
+    def score(batch: List[int]) -> List[Dict]:
+        return analyze_sentiment_request(session, [truncated[i] for i in batch], rate_limiter, max_retries)
+    
+    if executor is not None:
+        batch_results = list(executor.map(score, batches))
+    elif concurrency <= 1:
+        batch_results = [score(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="sentiment") as executor:
+            batch_results = list(executor.map(score, batches))
+    
+    # Map results back to input positions
+    results: List[Optional[Dict]] = [None] * len(texts)
+    for batch, batch_result in zip(batches, batch_results):
+        for i, result in zip(batch, batch_result):
+            results[i] = result
+    return results
+
+
+class SentimentBackend:
+    """
+    Interface for sentiment scorers.
+    
+    analyze() returns one result dict (positive/negative scores and label)
+    per input text, in input order. model_name keys the sentiment cache.
+    """
+    
+    name = "base"
+    model_name = MODEL_NAME
+    
+    def describe(self) -> str:
+        return self.name
+    
+    def analyze(self, texts: List[str]) -> List[Dict]:
+        raise NotImplementedError
+    
+    def close(self):
+        pass
+
+
+class HTTPBackend(SentimentBackend):
+    """
+    Hugging Face Inference API over a shared keep-alive session.
+    
+    All requests go through one executor with `concurrency` threads, so the
+    cap (and the session's connection pool) holds however many pipeline
+    workers call analyze() at once.
+    """
+    
+    name = "http"
+    
+    def __init__(self, api_key: str, concurrency: int = DEFAULT_CONCURRENCY,
+                 rate_limit: float = DEFAULT_RATE_LIMIT, max_retries: int = MAX_RETRIES,
+                 texts_per_request: int = DEFAULT_TEXTS_PER_REQUEST):
+        self.api_key = api_key
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+        self.max_retries = max_retries
+        self.texts_per_request = texts_per_request
+        self.model_name = HF_API_URL.rstrip('/').rsplit('/', 1)[-1]
+        self.session = create_http_session(api_key, concurrency)
+        self.rate_limiter = TokenBucket(rate_limit)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="sentiment")
+    
+    def describe(self) -> str:
+        return (f"http ({HF_API_URL}; concurrency {self.concurrency}, "
+                f"rate limit {self.rate_limit or 'unlimited'} req/s, {self.texts_per_request} texts/request)")
+    
+    def analyze(self, texts: List[str]) -> List[Dict]:
+        return analyze_sentiment_batch(
+            texts, self.api_key, concurrency=self.concurrency, rate_limiter=self.rate_limiter,
+            session=self.session, max_retries=self.max_retries, texts_per_request=self.texts_per_request,
+            executor=self.executor
+        )
+    
+    def close(self):
+        self.executor.shutdown()
+        self.session.close()
+
+
+def load_local_model(model_path: str, num_threads: Optional[int] = None):
+    """Load tokenizer + classifier from a local weights directory (no network)"""
+    try:
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    except ImportError:
+        raise SystemExit("--backend local requires torch and transformers: pip install torch transformers")
+    
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path, local_files_only=True)
+    model.eval()
+    return tokenizer, model
+
+
+def plan_local_batches(lengths: List[int], max_batch_size: int = LOCAL_MAX_BATCH_SIZE,
+                       max_batch_tokens: int = LOCAL_MAX_BATCH_TOKENS) -> List[List[int]]:
+    """
+    Dynamic batch sizing for padded inference.
+    
+    Positions are sorted by token length so similar lengths share a batch,
+    and each batch grows while (batch size x longest sequence) stays within
+    `max_batch_tokens` - short titles get large batches, long ones small.
+    """
+    batches = []
+    current, longest = [], 0
+    for i in sorted(range(len(lengths)), key=lengths.__getitem__):
+        padded = max(longest, lengths[i]) * (len(current) + 1)
+        if current and (len(current) >= max_batch_size or padded > max_batch_tokens):
+            batches.append(current)
+            current, longest = [], 0
+        current.append(i)
+        longest = max(longest, lengths[i])
+    if current:
+        batches.append(current)
+    return batches
+
+
+def score_local(tokenizer, model, texts: List[str], max_batch_size: int = LOCAL_MAX_BATCH_SIZE,
+                max_batch_tokens: int = LOCAL_MAX_BATCH_TOKENS) -> List[Dict]:
+    """Run padded mini-batches through the classifier; results in input order"""
+    import torch
+    
+    texts = [text[:MAX_TEXT_CHARS] for text in texts]
+    lengths = [len(ids) for ids in tokenizer(texts, truncation=True, max_length=LOCAL_MAX_SEQ_TOKENS)['input_ids']]
+    id2label = model.config.id2label
+    
+    results: List[Optional[Dict]] = [None] * len(texts)
+    for batch in plan_local_batches(lengths, max_batch_size, max_batch_tokens):
+        encoded = tokenizer([texts[i] for i in batch], padding=True, truncation=True,
+                            max_length=LOCAL_MAX_SEQ_TOKENS, return_tensors='pt')
+        started = time.perf_counter()
+        with torch.inference_mode():
+            probabilities = model(**encoded).logits.softmax(dim=-1).tolist()
+        METRICS.observe('local_batch', time.perf_counter() - started)
+        for i, row in zip(batch, probabilities):
+            results[i] = parse_sentiment_output(
+                [{'label': id2label[j], 'score': score} for j, score in enumerate(row)]
             )
-            
-            if response.status_code == 200:
-                sentiment_output = response.json()
-                
-                # Parse Hugging Face response
-                # Format: [[{'label': 'POSITIVE', 'score': 0.9998}, {'label': 'NEGATIVE', 'score': 0.0002}]]
-                if isinstance(sentiment_output, list) and len(sentiment_output) > 0:
-                    if isinstance(sentiment_output[0], list):
-                        sentiment_data = sentiment_output[0]
-                    else:
-                        sentiment_data = sentiment_output
-                    
-                    # Find POSITIVE and NEGATIVE scores
-                    positive_score = next((s['score'] for s in sentiment_data if s['label'] == 'POSITIVE'), 0.5)
-                    negative_score = next((s['score'] for s in sentiment_data if s['label'] == 'NEGATIVE'), 0.5)
-                    
-                    # Determine overall label (highest score)
-                    label = max(sentiment_data, key=lambda x: x['score'])['label']
-                    
-                    results.append({
-                        'sentiment_score_positive': positive_score,
-                        'sentiment_score_negative': negative_score,
-                        'sentiment_label': label
-                    })
-                else:
-                    # Fallback to neutral
-                    results.append({
-                        'sentiment_score_positive': 0.5,
-                        'sentiment_score_negative': 0.5,
-                        'sentiment_label': 'NEUTRAL'
-                    })
+    return results
+
+
+# Per-process model for multi-process local scoring
+_worker_model = None
+
+
+def _init_local_worker(model_path: str, num_threads: int):
+    global _worker_model
+    _worker_model = load_local_model(model_path, num_threads)
+
+
+def _score_local_shard(texts: List[str], max_batch_size: int, max_batch_tokens: int) -> List[Dict]:
+    tokenizer, model = _worker_model
+    return score_local(tokenizer, model, texts, max_batch_size, max_batch_tokens)
+
+
+class LocalBackend(SentimentBackend):
+    """
+    In-process CPU inference with local DistilBERT weights.
+    
+    With workers > 1 each text list is sharded across a process pool,
+    one model copy per process, splitting the CPU threads between them.
+    """
+    
+    name = "local"
+    
+    def __init__(self, model_path: str = LOCAL_MODEL_PATH, workers: int = 1,
+                 max_batch_size: int = LOCAL_MAX_BATCH_SIZE, max_batch_tokens: int = LOCAL_MAX_BATCH_TOKENS):
+        if not os.path.isdir(model_path):
+            raise SystemExit(f"Local model not found at {model_path} (set --model-path or SENTIMENT_MODEL_PATH)")
+        self.model_path = model_path
+        self.workers = max(1, workers)
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.model_name = os.path.basename(os.path.normpath(model_path))
+        
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        if self.workers == 1:
+            self.model = load_local_model(model_path, threads)
+            self.pool = None
+        else:
+            self.model = None
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_local_worker, initargs=(model_path, threads)
+            )
+    
+    def describe(self) -> str:
+        return (f"local ({self.model_path}; {self.workers} process(es), "
+                f"batches <= {self.max_batch_size} texts / {self.max_batch_tokens} tokens)")
+    
+    def analyze(self, texts: List[str]) -> List[Dict]:
+        if self.pool is None:
+            tokenizer, model = self.model
+            return score_local(tokenizer, model, texts, self.max_batch_size, self.max_batch_tokens)
+        
+        shard_size = -(-len(texts) // self.workers)
+        shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+        results = []
+        for shard_results in self.pool.map(_score_local_shard, shards,
+                                           [self.max_batch_size] * len(shards),
+                                           [self.max_batch_tokens] * len(shards)):
+            results.extend(shard_results)
+        return results
+    
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def create_backend(args) -> SentimentBackend:
+    """Build the sentiment backend selected on the command line"""
+    if args.backend == 'local':
+        return LocalBackend(args.model_path, args.local_workers,
+                            args.local_batch_size, args.local_max_batch_tokens)
+    return HTTPBackend(HUGGINGFACE_API_KEY, args.concurrency, args.rate_limit,
+                       args.max_retries, args.texts_per_request)
+
+
+def iter_article_pages(page_size: int, after_id: Optional[str] = None,
+                       limit: Optional[int] = None) -> Iterator[List[Dict]]:
+    """
+    Page through the unenriched backlog by article_id.
+    
+    The next page is fetched on a background thread (with its own
+    connection) while the caller scores the current one.
+    """
+    fetched = 0
+    conn = get_snowflake_connection()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+    
+    def fetch(last_id, size):
+        return fetch_unenriched_articles(conn, size, last_id)
+    
+    try:
+        size = min(page_size, limit) if limit else page_size
+        future = executor.submit(fetch, after_id, size)
+        while True:
+            page = future.result()
+            if not page:
+                return
+            fetched += len(page)
+            remaining = limit - fetched if limit else page_size
+            if len(page) == size and remaining > 0:
+                size = min(page_size, remaining)
+                future = executor.submit(fetch, page[-1]['article_id'], size)
             else:
-                print(f"  API Error: {response.status_code} - {response.text}")
-                # Fallback to neutral
-                results.append({
-                    'sentiment_score_positive': 0.5,
-                    'sentiment_score_negative': 0.5,
-                    'sentiment_label': 'NEUTRAL'
-                })
-            
-            # Rate limiting: Wait between requests
-            time.sleep(0.5)
-            
-        except Exception as e:
-            print(f"  Error analyzing sentiment: {e}")
-            # Fallback to neutral
-            results.append({
-                'sentiment_score_positive': 0.5,
-                'sentiment_score_negative': 0.5,
-                'sentiment_label': 'NEUTRAL'
-            })
+                future = None
+            yield page
+            if future is None:
+                return
+    finally:
+        executor.shutdown(wait=True)
+        conn.close()
+
+
+def load_checkpoint(path: str) -> Optional[str]:
+    """Last article_id written by an interrupted --drain run, if any"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f).get('last_article_id')
+
+
+def save_checkpoint(path: str, last_article_id: str):
+    """Atomically record the last article_id written back"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'last_article_id': last_article_id, 'updated_at': datetime.now().isoformat()}, f)
+    os.replace(tmp_path, path)
+
+
+def normalize_text(text: str) -> str:
+    """Text as the (uncased) model sees it: truncated, whitespace-collapsed, lowercased"""
+    return " ".join(text[:MAX_TEXT_CHARS].split()).lower()
+
+
+def cache_key(model: str, text: str) -> str:
+    """Content hash of (model, normalized truncated text)"""
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Persistent SQLite cache of sentiment results keyed by content hash.
     
-    return results
+    Entries carry a last-used timestamp; once the cache grows past
+    `max_entries` the least recently used entries are evicted.
+    """
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+        CREATE TABLE IF NOT EXISTS sentiment_cache (
+            key TEXT PRIMARY KEY,
+            sentiment_score_positive REAL,
+            sentiment_score_negative REAL,
+            sentiment_label TEXT,
+            last_used REAL
+        )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_cache_last_used ON sentiment_cache (last_used)")
+        self.db.commit()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Dict]:
+        """Look up keys, refreshing last-used on hits"""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self.lock:
+            for i in range(0, len(unique_keys), 500):
+                chunk = unique_keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.db.execute(
+                    f"SELECT key, sentiment_score_positive, sentiment_score_negative, sentiment_label "
+                    f"FROM sentiment_cache WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, positive, negative, label in rows:
+                    found[key] = {
+                        'sentiment_score_positive': positive,
+                        'sentiment_score_negative': negative,
+                        'sentiment_label': label
+                    }
+            if found:
+                now = time.time()
+                self.db.executemany("UPDATE sentiment_cache SET last_used = ? WHERE key = ?",
+                                    [(now, key) for key in found])
+                self.db.commit()
+        return found
+    
+    def put_many(self, items: Dict[str, Dict]):
+        """Store results, then evict least recently used entries beyond max_entries"""
+        if not items:
+            return
+        now = time.time()
+        with self.lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?, ?, ?, ?)",
+                [(key, r['sentiment_score_positive'], r['sentiment_score_negative'], r['sentiment_label'], now)
+                 for key, r in items.items()]
+            )
+            (count,) = self.db.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()
+            if count > self.max_entries:
+                self.db.execute(
+                    "DELETE FROM sentiment_cache WHERE key IN "
+                    "(SELECT key FROM sentiment_cache ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self.db.commit()
+    
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+    
+    def close(self):
+        self.db.close()
 
 
-def update_article_sentiment(conn, article_id: str, sentiment: Dict, dry_run: bool = False):
+def analyze_with_cache(texts: List[str], analyze: Callable[[List[str]], List[Dict]],
+                       cache: Optional[SentimentCache] = None, refresh: bool = False,
+                       model: str = MODEL_NAME) -> List[Dict]:
+    """
+    Score texts via `analyze`, serving repeats from the cache.
+    
+    Identical texts (after normalization) are only scored once per call.
+    With `refresh`, cached entries are ignored but still overwritten with
+    fresh scores. NEUTRAL fallbacks are never cached.
     """
-    Update article_metadata table with sentiment scores.
+    if cache is None:
+        return analyze(texts)
+    
+    keys = [cache_key(model, text) for text in texts]
+    cached = {} if refresh else cache.get_many(keys)
+    
+    # One representative text per uncached key
+    pending: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in cached and key not in pending:
+            pending[key] = text
+    
+    hits = sum(1 for key in keys if key in cached)
+    with cache.lock:
+        cache.hits += hits
+        cache.misses += len(keys) - hits
+    
+    if pending:
+        scored = dict(zip(pending, analyze(list(pending.values()))))
+        cache.put_many({k: r for k, r in scored.items() if r['sentiment_label'] != 'NEUTRAL'})
+        cached.update(scored)
+    
+    return [cached[key] for key in keys]
+
+
+class SentimentWriter:
     """
-    cursor = conn.cursor()
+    Buffers sentiment results and writes them back in bulk.
     
-    update_query = """
-    UPDATE article_metadata
-    SET 
-        sentiment_score_positive = %s,
-        sentiment_score_negative = %s,
-        sentiment_label = %s,
-        sentiment_enriched_at = CURRENT_TIMESTAMP()
-    WHERE article_id = %s
+    Each flush loads the buffered rows into a session temporary table with
+    one executemany and applies them with a single MERGE INTO
+    article_metadata, committed as one transaction.
     """
     
-    if dry_run:
-        print(f"  [DRY RUN] Would update {article_id}: {sentiment['sentiment_label']} "
-              f"(pos: {sentiment['sentiment_score_positive']:.3f})")
-    else:
-        cursor.execute(update_query, (
+    def __init__(self, conn, flush_size: int = DEFAULT_FLUSH_SIZE, dry_run: bool = False):
+        self.conn = conn
+        self.flush_size = flush_size
+        self.dry_run = dry_run
+        self.buffer: List[Tuple] = []
+        self.rows_written = 0
+        self.flushes = 0
+        self.table_created = False
+    
+    def add(self, article_id: str, sentiment: Dict):
+        """Queue one result; call flush() once `full`"""
+        self.buffer.append((
+            article_id,
             sentiment['sentiment_score_positive'],
             sentiment['sentiment_score_negative'],
-            sentiment['sentiment_label'],
-            article_id
+            sentiment['sentiment_label']
         ))
-        conn.commit()
     
-    cursor.close()
+    @property
+    def full(self) -> bool:
+        return len(self.buffer) >= self.flush_size
+    
+    def flush(self):
+        """MERGE all buffered results into article_metadata"""
+        if not self.buffer:
+            return
+        rows, self.buffer = self.buffer, []
+        
+        if self.dry_run:
+            print(f"  [DRY RUN] Would merge {len(rows)} sentiment results into article_metadata")
+            return
+        
+        started = time.perf_counter()
+        cursor = self.conn.cursor()
+        try:
+            if not self.table_created:
+                cursor.execute(f"""
+                CREATE TEMPORARY TABLE IF NOT EXISTS {SENTIMENT_UPDATES_TABLE} (
+                    article_id STRING,
+                    sentiment_score_positive NUMBER(5,4),
+                    sentiment_score_negative NUMBER(5,4),
+                    sentiment_label STRING
+                )
+                """)
+                self.table_created = True
+            
+            cursor.execute("BEGIN")
+            cursor.execute(f"DELETE FROM {SENTIMENT_UPDATES_TABLE}")
+            cursor.executemany(
+                f"INSERT INTO {SENTIMENT_UPDATES_TABLE} VALUES (%s, %s, %s, %s)", rows
+            )
+            cursor.execute(f"""
+            MERGE INTO article_metadata t
+            USING (
+                SELECT * FROM {SENTIMENT_UPDATES_TABLE}
+                QUALIFY ROW_NUMBER() OVER (PARTITION BY article_id ORDER BY article_id) = 1
+            ) s
+            ON t.article_id = s.article_id
+            WHEN MATCHED THEN UPDATE SET
+                sentiment_score_positive = s.sentiment_score_positive,
+                sentiment_score_negative = s.sentiment_score_negative,
+                sentiment_label = s.sentiment_label,
+                sentiment_enriched_at = CURRENT_TIMESTAMP()
+            """)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        
+        METRICS.observe('db_write', time.perf_counter() - started)
+        METRICS.increment('db_rows_written', len(rows))
+        self.rows_written += len(rows)
+        self.flushes += 1
+        print(f"  ✓ Merged {len(rows)} sentiment results into article_metadata")
+
+
+def print_article_result(position: str, article: Dict, sentiment: Dict):
+    print(f"[{position}] Processing: {article['article_id']}")
+    print(f"  Title: {article['title'][:60]}...")
+    print(f"  Category: {article['category']}")
+    print(f"  Result: {sentiment['sentiment_label']} "
+          f"(positive: {sentiment['sentiment_score_positive']:.3f}, "
+          f"negative: {sentiment['sentiment_score_negative']:.3f})")
+    print()
+
+
+class StageStats:
+    """Per-stage item counter with throughput and input queue depth"""
+    
+    def __init__(self, name: str, input_queue: Optional[queue.Queue] = None):
+        self.name = name
+        self.input_queue = input_queue
+        self.items = 0
+        self.started = time.time()
+        self.lock = threading.Lock()
+    
+    def add(self, n: int):
+        with self.lock:
+            self.items += n
+    
+    @property
+    def rate(self) -> float:
+        elapsed = time.time() - self.started
+        return self.items / elapsed if elapsed > 0 else 0.0
+    
+    def describe(self) -> str:
+        depth = f", queue {self.input_queue.qsize()}" if self.input_queue is not None else ""
+        return f"{self.name} {self.items} ({self.rate:.1f}/s{depth})"
+
+
+_DONE = object()
+
+
+class EnrichmentPipeline:
+    """
+    Three-stage enrichment: fetch producer -> inference worker pool -> batched writer.
+    
+    Stages are threads joined by bounded queues, so a slow stage applies
+    backpressure upstream. Articles travel in numbered chunks; the writer
+    re-orders them so commits (and the on_commit checkpoint callback,
+    called with the last article_id committed) advance in article order.
+    The first error in any stage stops all stages and is re-raised by run().
+    """
+    
+    def __init__(self, pages, backend: SentimentBackend, writer: SentimentWriter,
+                 cache: Optional[SentimentCache] = None, refresh_cache: bool = False,
+                 inference_workers: int = DEFAULT_INFERENCE_WORKERS,
+                 queue_depth: int = PIPELINE_QUEUE_DEPTH, chunk_size: int = INFERENCE_CHUNK_SIZE,
+                 on_commit: Optional[Callable[[str], None]] = None,
+                 on_result: Optional[Callable[[Dict, Dict], None]] = None):
+        self.pages = pages
+        self.backend = backend
+        self.writer = writer
+        self.cache = cache
+        self.refresh_cache = refresh_cache
+        self.inference_workers = max(1, inference_workers)
+        self.chunk_size = chunk_size
+        self.on_commit = on_commit
+        self.on_result = on_result
+        
+        self.inference_queue = queue.Queue(maxsize=queue_depth)
+        self.write_queue = queue.Queue(maxsize=queue_depth)
+        self.stats = {
+            'fetch': StageStats('fetch'),
+            'inference': StageStats('inference', self.inference_queue),
+            'write': StageStats('write', self.write_queue),
+        }
+        self.stop = threading.Event()
+        self.error: Optional[BaseException] = None
+        self.error_lock = threading.Lock()
+    
+    def fail(self, error: BaseException):
+        with self.error_lock:
+            if self.error is None:
+                self.error = error
+        self.stop.set()
+    
+    def put(self, q: queue.Queue, item) -> bool:
+        """Blocking put that gives up once the pipeline is stopping"""
+        while not self.stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def get(self, q: queue.Queue):
+        """Blocking get that returns _DONE once the pipeline is stopping"""
+        while not self.stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+    
+    def fetch_stage(self):
+        try:
+            seq = 0
+            for page in self.pages:
+                for i in range(0, len(page), self.chunk_size):
+                    chunk = page[i:i + self.chunk_size]
+                    if not self.put(self.inference_queue, (seq, chunk)):
+                        return
+                    seq += 1
+                    self.stats['fetch'].add(len(chunk))
+            for _ in range(self.inference_workers):
+                self.put(self.inference_queue, _DONE)
+        except BaseException as e:
+            self.fail(e)
+        finally:
+            if hasattr(self.pages, 'close'):
+                self.pages.close()
+    
+    def inference_stage(self):
+        try:
+            while True:
+                item = self.get(self.inference_queue)
+                if item is _DONE:
+                    self.put(self.write_queue, _DONE)
+                    return
+                seq, chunk = item
+                started = time.perf_counter()
+                sentiments = analyze_with_cache(
+                    [article['title'] for article in chunk], self.backend.analyze,
+                    self.cache, refresh=self.refresh_cache, model=self.backend.model_name
+                )
+                METRICS.observe('inference_chunk', time.perf_counter() - started)
+                self.stats['inference'].add(len(chunk))
+                if not self.put(self.write_queue, (seq, chunk, sentiments)):
+                    return
+        except BaseException as e:
+            self.fail(e)
+    
+    def commit(self, last_article_id: Optional[str]):
+        self.writer.flush()
+        if last_article_id is not None and self.on_commit:
+            self.on_commit(last_article_id)
+    
+    def write_stage(self):
+        try:
+            pending = {}
+            next_seq = 0
+            finished_workers = 0
+            last_article_id = None
+            while finished_workers < self.inference_workers:
+                item = self.get(self.write_queue)
+                if item is _DONE:
+                    if self.stop.is_set():
+                        return
+                    finished_workers += 1
+                    continue
+                seq, chunk, sentiments = item
+                pending[seq] = (chunk, sentiments)
+                
+                # Apply chunks in order so checkpoints never skip ahead
+                while next_seq in pending:
+                    chunk, sentiments = pending.pop(next_seq)
+                    next_seq += 1
+                    for article, sentiment in zip(chunk, sentiments):
+                        if self.on_result:
+                            self.on_result(article, sentiment)
+                        self.writer.add(article['article_id'], sentiment)
+                    last_article_id = chunk[-1]['article_id']
+                    self.stats['write'].add(len(chunk))
+                    if self.writer.full:
+                        self.commit(last_article_id)
+                        print(f"  Pipeline: {self.describe()}")
+            if self.writer.buffer:
+                self.commit(last_article_id)
+        except BaseException as e:
+            self.fail(e)
+    
+    def describe(self) -> str:
+        return " | ".join(stats.describe() for stats in self.stats.values())
+    
+    def stage_report(self) -> Dict:
+        return {
+            name: {'items': stats.items, 'items_per_second': round(stats.rate, 2)}
+            for name, stats in self.stats.items()
+        }
+    
+    def run(self):
+        """Run all stages to completion; re-raises the first stage error"""
+        threads = [threading.Thread(target=self.fetch_stage, name="fetch", daemon=True)]
+        threads += [
+            threading.Thread(target=self.inference_stage, name=f"inference-{i}", daemon=True)
+            for i in range(self.inference_workers)
+        ]
+        threads.append(threading.Thread(target=self.write_stage, name="write", daemon=True))
+        
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt as e:
+            self.fail(e)
+            for thread in threads:
+                thread.join()
+        
+        if self.error is not None:
+            raise self.error
+
+
+def write_run_report(path: str, report: Dict):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+
+
+def format_latency(name: str) -> str:
+    summary = METRICS.latency_summary(name)
+    if not summary['count']:
+        return f"{name}: no samples"
+    return (f"{name}: n={summary['count']} p50={summary['p50'] * 1000:.0f}ms "
+            f"p95={summary['p95'] * 1000:.0f}ms p99={summary['p99'] * 1000:.0f}ms")
 
 
 def main():
     parser = argparse.ArgumentParser(description='Enrich articles with Hugging Face sentiment analysis')
-    parser.add_argument('--batch-size', type=int, default=100, help='Number of articles to process')
+    parser.add_argument('--batch-size', type=int, default=100,
+                        help='Number of articles to process (page size with --drain)')
+    parser.add_argument('--drain', action='store_true',
+                        help='Page through the whole backlog by article_id, checkpointing progress')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT_PATH,
+                        help='Checkpoint file for --drain resume')
+    parser.add_argument('--reset-checkpoint', action='store_true',
+                        help='Ignore any existing checkpoint and start from the first article')
     parser.add_argument('--dry-run', action='store_true', help='Test without updating database')
     parser.add_argument('--limit', type=int, help='Maximum number of articles to process (for testing)')
+    parser.add_argument('--backend', choices=['http', 'local'], default='http',
+                        help='Sentiment backend: Hugging Face API or local CPU model')
+    parser.add_argument('--model-path', default=LOCAL_MODEL_PATH,
+                        help='Local model weights directory (--backend local)')
+    parser.add_argument('--local-workers', type=int, default=1,
+                        help='Processes for local inference (--backend local)')
+    parser.add_argument('--local-batch-size', type=int, default=LOCAL_MAX_BATCH_SIZE,
+                        help='Max texts per padded mini-batch (--backend local)')
+    parser.add_argument('--local-max-batch-tokens', type=int, default=LOCAL_MAX_BATCH_TOKENS,
+                        help='Max batch size x padded length per mini-batch (--backend local)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='Concurrent API requests')
+    parser.add_argument('--rate-limit', type=float, default=DEFAULT_RATE_LIMIT,
+                        help='Max API requests per second (token bucket; 0 = unlimited)')
+    parser.add_argument('--max-retries', type=int, default=MAX_RETRIES,
+                        help='Retries per request on 429/503 and connection errors')
+    parser.add_argument('--texts-per-request', type=int, default=DEFAULT_TEXTS_PER_REQUEST,
+                        help=f'Titles packed into each API call (payload capped at {MAX_PAYLOAD_BYTES // 1024}KB)')
+    parser.add_argument('--flush-size', type=int, default=DEFAULT_FLUSH_SIZE,
+                        help='Results written back per MERGE/commit')
+    parser.add_argument('--quiet', action='store_true', help='Skip per-article output')
+    parser.add_argument('--report', default=DEFAULT_REPORT_PATH, help='JSON run report path')
+    parser.add_argument('--prometheus', help='Also write metrics in Prometheus text format to this path')
+    parser.add_argument('--inference-workers', type=int, default=DEFAULT_INFERENCE_WORKERS,
+                        help='Pipeline threads scoring chunks in parallel')
+    parser.add_argument('--queue-depth', type=int, default=PIPELINE_QUEUE_DEPTH,
+                        help='Chunks buffered between pipeline stages (backpressure bound)')
+    parser.add_argument('--cache-path', default=DEFAULT_CACHE_PATH,
+                        help='SQLite sentiment cache file')
+    parser.add_argument('--cache-max-entries', type=int, default=DEFAULT_CACHE_MAX_ENTRIES,
+                        help='Cache size before least recently used entries are evicted')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the sentiment cache')
+    parser.add_argument('--refresh-cache', action='store_true',
+                        help='Ignore cached results (fresh scores are still written to the cache)')
     
     args = parser.parse_args()
     
@@ -209,13 +1206,13 @@ def main():
     print("=" * 80)
     print(f"Mode: {'DRY RUN' if args.dry_run else 'PRODUCTION'}")
     print(f"Batch size: {args.batch_size}")
-    print(f"API URL: {HF_API_URL}")
+    print(f"Backend: {args.backend}")
     if args.limit:
         print(f"Limit: {args.limit} articles")
     print()
     
     # Validate environment
-    if not HUGGINGFACE_API_KEY:
+    if args.backend == 'http' and not HUGGINGFACE_API_KEY:
         print("ERROR: HUGGINGFACE_API_KEY not found in environment")
         print("Please set it in your .env file")
         sys.exit(1)
@@ -234,53 +1231,106 @@ def main():
     print()
     
     # Fetch unenriched articles
-    print(f"Fetching up to {args.batch_size} unenriched articles...")
-    articles = fetch_unenriched_articles(conn, args.batch_size)
-    
-    if args.limit and len(articles) > args.limit:
-        articles = articles[:args.limit]
-    
-    print(f"✓ Found {len(articles)} articles to enrich")
-    print()
-    
-    if len(articles) == 0:
-        print("No articles to enrich. All done!")
-        conn.close()
-        return
+    if args.drain:
+        after_id = None if args.reset_checkpoint else load_checkpoint(args.checkpoint)
+        if after_id:
+            print(f"Resuming from checkpoint: article_id > {after_id}")
+        print(f"Draining backlog in pages of {args.batch_size} articles...")
+        pages = iter_article_pages(args.batch_size, after_id, args.limit)
+    else:
+        print(f"Fetching up to {args.batch_size} unenriched articles...")
+        articles = fetch_unenriched_articles(conn, args.batch_size)
+        if args.limit and len(articles) > args.limit:
+            articles = articles[:args.limit]
+        print(f"✓ Found {len(articles)} articles to enrich")
+        print()
+        
+        if len(articles) == 0:
+            print("No articles to enrich. All done!")
+            conn.close()
+            return
+        pages = [articles]
+    total = None if args.drain else len(articles)
     
     # Process articles
-    print("Analyzing sentiment with Hugging Face API...")
+    backend = create_backend(args)
+    print(f"Analyzing sentiment with {backend.describe()}...")
     print()
     
     start_time = time.time()
+    started_at = datetime.now()
     
-    for i, article in enumerate(articles, 1):
-        print(f"[{i}/{len(articles)}] Processing: {article['article_id']}")
-        print(f"  Title: {article['title'][:60]}...")
-        print(f"  Category: {article['category']}")
-        
-        # Analyze sentiment
-        sentiments = analyze_sentiment_batch([article['title']], HUGGINGFACE_API_KEY)
-        sentiment = sentiments[0]
-        
-        print(f"  Result: {sentiment['sentiment_label']} "
-              f"(positive: {sentiment['sentiment_score_positive']:.3f}, "
-              f"negative: {sentiment['sentiment_score_negative']:.3f})")
-        
-        # Update database
-        update_article_sentiment(conn, article['article_id'], sentiment, args.dry_run)
-        print()
+    cache = None if args.no_cache else SentimentCache(args.cache_path, args.cache_max_entries)
+    writer = SentimentWriter(conn, args.flush_size, args.dry_run)
+    processed = 0
+    
+    def on_result(article: Dict, sentiment: Dict):
+        nonlocal processed
+        processed += 1
+        if not args.quiet:
+            print_article_result(f"{processed}/{total or '?'}", article, sentiment)
+    
+    def on_commit(last_article_id: str):
+        if args.drain and not args.dry_run:
+            save_checkpoint(args.checkpoint, last_article_id)
+    
+    pipeline = EnrichmentPipeline(
+        pages, backend, writer, cache, refresh_cache=args.refresh_cache,
+        inference_workers=args.inference_workers, queue_depth=args.queue_depth,
+        on_commit=on_commit, on_result=on_result
+    )
+    status = 'failed'
+    try:
+        pipeline.run()
+        status = 'succeeded'
+    finally:
+        backend.close()
+        elapsed_time = time.time() - start_time
+        report = {
+            'status': status,
+            'started_at': started_at.isoformat(),
+            'finished_at': datetime.now().isoformat(),
+            'elapsed_seconds': round(elapsed_time, 3),
+            'backend': backend.describe(),
+            'options': vars(args),
+            'articles_processed': processed,
+            'rows_per_second': round(processed / elapsed_time, 2) if elapsed_time > 0 else 0.0,
+            'stages': pipeline.stage_report(),
+            'cache': None if cache is None else {
+                'hits': cache.hits, 'misses': cache.misses, 'hit_ratio': round(cache.hit_ratio, 4)
+            },
+            **METRICS.snapshot(),
+        }
+        write_run_report(args.report, report)
+        if args.prometheus:
+            gauges = {f"{name}_items_per_second": stage['items_per_second']
+                      for name, stage in report['stages'].items()}
+            gauges['cache_hit_ratio'] = report['cache']['hit_ratio'] if cache is not None else 0.0
+            with open(args.prometheus, 'w') as f:
+                f.write(METRICS.prometheus_text(gauges))
     
-    elapsed_time = time.time() - start_time
+    # Backlog fully drained: the next run starts from the beginning
+    if args.drain and not args.dry_run and not args.limit and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
     
     print("=" * 80)
     print("Summary")
     print("=" * 80)
-    print(f"Articles processed: {len(articles)}")
-    print(f"Time elapsed: {elapsed_time:.1f} seconds")
-    print(f"Average time per article: {elapsed_time/len(articles):.1f} seconds")
+    print(f"Articles processed: {processed}")
+    print(f"Time elapsed: {elapsed_time:.1f} seconds ({report['rows_per_second']:.1f} articles/sec)")
+    print(f"Stages: {pipeline.describe()}")
+    counters = METRICS.snapshot()['counters']
+    print(f"API requests: {counters.get('api_requests', 0)}, retries: {counters.get('api_retries', 0)}, "
+          f"NEUTRAL fallbacks: {counters.get('neutral_fallbacks', 0)}")
+    for name in ('api_request', 'local_batch', 'inference_chunk', 'db_write'):
+        if METRICS.latency_summary(name)['count']:
+            print(f"Latency {format_latency(name)}")
+    print(f"Run report: {args.report}")
+    if cache is not None:
+        print(f"Cache hit ratio: {cache.hit_ratio:.1%} ({cache.hits} hits, {cache.misses} misses)")
+        cache.close()
     
-    if not args.dry_run:
+    if not args.dry_run and processed:
         print()
         print("✓ Articles successfully enriched in Snowflake!")
         print()
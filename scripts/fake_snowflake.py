@@ -0,0 +1,241 @@
+"""
+Stand-in Snowflake connection for checking the bulk events load offline
+
+FakeConnection records every statement load_to_snowflake.py sends, answers
+COPY INTO with one result row per file PUT to the stage (the way Snowflake
+does), fails a PUT whose pattern matches no files like the connector, and
+can reject CREATE STAGE with a ProgrammingError like an account without
+stage privileges. main() drives the stage + COPY path, the auto -> insert
+fallback and an incremental run with no new events against it and checks
+the SQL that was sent.
+
+Usage:
+    python scripts/fake_snowflake.py
+    python scripts/fake_snowflake.py --events 5000 --parallel 4
+    python scripts/fake_snowflake.py --events 600000   # several staged part files
+"""
+
+import re
+import sys
+import glob
+import gzip
+import json
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from snowflake.connector.errors import ProgrammingError
+from load_to_snowflake import (
+    EVENTS_STAGE, PUT_PARALLEL, stage_events, copy_staged_events, load_events,
+    load_events_incremental
+)
+
+EVENT_COLUMNS = [
+    "event_date", "event_timestamp", "event_name",
+    "user_pseudo_id", "ga_session_id", "event_params",
+    "device", "geo", "traffic_source",
+]
+
+
+class FakeCursor:
+    """Records statements on its connection and returns canned results"""
+
+    def __init__(self, conn: "FakeConnection"):
+        self.conn = conn
+        self.results: List[Tuple] = []
+        self.rowcount = 0
+        self.closed = False
+
+    def execute(self, sql: str, params=None):
+        statement = " ".join(sql.split())
+        self.conn.statements.append(statement)
+        self.results = []
+        self.rowcount = 0
+
+        if statement.startswith("CREATE TEMPORARY STAGE") and self.conn.deny_stage:
+            raise ProgrammingError("SQL access control error: Insufficient privileges to operate on schema")
+        if statement.startswith("PUT "):
+            # Count rows now: the loader deletes its local part files after PUT
+            pattern = re.match(r"PUT 'file://(.+?)'", statement).group(1)
+            paths = sorted(glob.glob(pattern))
+            if not paths:
+                raise ProgrammingError(f"File doesn't exist: ['{pattern}']")
+            for path in paths:
+                with gzip.open(path, "rb") as f:
+                    self.conn.staged[Path(path).name] = sum(1 for _ in f)
+        elif statement.startswith("COPY INTO"):
+            self.results = [
+                (f"events/{name}", "LOADED", rows, rows, 1, 0, None, None, None, None)
+                for name, rows in self.conn.staged.items()
+            ] or [("Copy executed with 0 files processed.",)]
+            self.conn.staged = {}
+        elif statement.startswith("SELECT MAX(event_timestamp) FROM "):
+            table = statement.split()[-1]
+            self.results = [(self.conn.max_event_timestamps.get(table),)]
+        return self
+
+    def executemany(self, sql: str, seq_of_params):
+        self.conn.statements.append(" ".join(sql.split()))
+        self.conn.inserted_rows += len(seq_of_params)
+        return self
+
+    def fetchall(self) -> List[Tuple]:
+        results, self.results = self.results, []
+        return results
+
+    def fetchone(self):
+        return self.results.pop(0) if self.results else None
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """Connection whose cursors record SQL instead of sending it"""
+
+    def __init__(self, deny_stage: bool = False, max_event_timestamps: Optional[Dict[str, int]] = None):
+        self.deny_stage = deny_stage
+        self.max_event_timestamps = max_event_timestamps or {}   # table -> MAX(event_timestamp)
+        self.statements: List[str] = []
+        self.staged: Dict[str, int] = {}   # part file name -> rows
+        self.cursors: List[FakeCursor] = []
+        self.inserted_rows = 0
+        self.commits = 0
+
+    def cursor(self, *args, **kwargs) -> FakeCursor:
+        cursor = FakeCursor(self)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        pass
+
+    def executed(self, prefix: str) -> List[str]:
+        """Recorded statements starting with prefix"""
+        return [s for s in self.statements if s.startswith(prefix)]
+
+
+FIRST_EVENT_TIMESTAMP = 1730419200000000
+
+
+def write_sample_events(data_dir: Path, num_events: int):
+    """Minimal events.jsonl with the fields the loader selects"""
+    with open(data_dir / "events.jsonl", "w") as f:
+        for i in range(num_events):
+            f.write(json.dumps({
+                "event_date": "20241101",
+                "event_timestamp": FIRST_EVENT_TIMESTAMP + i,
+                "event_name": "page_view",
+                "user_pseudo_id": f"user_{i % 50}",
+                "ga_session_id": f"session_{i % 200}",
+                "event_params": [],
+                "device": {"category": "mobile"},
+                "geo": {"country": "US"},
+                "traffic_source": {"medium": "organic"},
+            }) + "\n")
+
+
+def copy_columns(statement: str) -> List[str]:
+    """Target column list of a COPY INTO statement"""
+    columns = re.match(r"COPY INTO \w+ \((.+?)\)", statement).group(1)
+    return [c.strip() for c in columns.split(",")]
+
+
+def run_checks(data_dir: Path, num_events: int, parallel: int) -> List[Tuple[str, bool]]:
+    """(check, passed) pairs for the stage + COPY path and the insert fallback"""
+    checks = []
+
+    conn = FakeConnection()
+    staged = stage_events(conn, data_dir, parallel=parallel)
+    puts = conn.executed("PUT ")
+    put_re = (rf"PUT 'file://.+/events-part-\*\.jsonl\.gz' @{EVENTS_STAGE}/events/ "
+              rf"PARALLEL={parallel} AUTO_COMPRESS=FALSE SOURCE_COMPRESSION=GZIP OVERWRITE=TRUE$")
+    checks.append(("one PUT of the gzipped part files", len(puts) == 1 and re.match(put_re, puts[0]) is not None))
+    checks.append((f"PUT PARALLEL={parallel}", bool(puts) and f"PARALLEL={parallel} " in puts[0]))
+    checks.append(("stage created and cleared before PUT",
+                   conn.statements[:2] == [f"CREATE TEMPORARY STAGE IF NOT EXISTS {EVENTS_STAGE}",
+                                           f"REMOVE @{EVENTS_STAGE}/events/"]))
+    checks.append(("staged rows match the JSONL",
+                   staged == len(conn.staged) and sum(conn.staged.values()) == num_events))
+
+    loaded = copy_staged_events(conn)
+    copies = conn.executed("COPY INTO")
+    checks.append(("one COPY INTO events_raw", len(copies) == 1 and copies[0].startswith("COPY INTO events_raw ")))
+    checks.append(("COPY column list", bool(copies) and copy_columns(copies[0]) == EVENT_COLUMNS))
+    checks.append(("COPY purges loaded files", bool(copies) and "PURGE = TRUE" in copies[0]))
+    checks.append(("rows loaded summed from per-file results", loaded == num_events))
+    checks.append(("COPY with no staged files loads 0", copy_staged_events(conn) == 0))
+    checks.append(("cursors closed", all(c.closed for c in conn.cursors)))
+
+    if PUT_PARALLEL != parallel:
+        default_conn = FakeConnection()
+        stage_events(default_conn, data_dir)
+        checks.append((f"default PUT PARALLEL={PUT_PARALLEL}",
+                       f"PARALLEL={PUT_PARALLEL} " in default_conn.executed("PUT ")[0]))
+
+    denied = FakeConnection(deny_stage=True)
+    inserted = load_events(denied, data_dir, method="auto")
+    checks.append(("auto falls back to inserts when CREATE STAGE fails",
+                   not denied.executed("PUT ") and not denied.executed("COPY INTO")
+                   and denied.executed("TRUNCATE TABLE events_raw") != []
+                   and denied.executed("INSERT INTO events_raw") != []))
+    checks.append(("fallback inserts every event", inserted == num_events == denied.inserted_rows))
+
+    try:
+        load_events(FakeConnection(deny_stage=True), data_dir, method="copy")
+        checks.append(("copy method re-raises staging errors", False))
+    except ProgrammingError:
+        checks.append(("copy method re-raises staging errors", True))
+
+    try:
+        FakeConnection().cursor().execute(f"PUT 'file://{data_dir}/missing-*.jsonl.gz' @{EVENTS_STAGE}/events/")
+        checks.append(("PUT of a pattern matching no files fails", False))
+    except ProgrammingError:
+        checks.append(("PUT of a pattern matching no files fails", True))
+
+    # Incremental run with every event already loaded: nothing to stage or insert
+    for method in ("copy", "auto"):
+        current = FakeConnection(max_event_timestamps={"events_raw": FIRST_EVENT_TIMESTAMP + num_events})
+        try:
+            inserted, skipped = load_events_incremental(current, data_dir, method)
+        except ProgrammingError:
+            inserted, skipped = None, None
+        checks.append((f"incremental ({method}) with no new events sends nothing",
+                       inserted == 0 and skipped == num_events
+                       and not current.executed("CREATE TEMPORARY STAGE") and not current.executed("PUT ")
+                       and not current.executed("COPY INTO") and current.inserted_rows == 0))
+        checks.append((f"incremental ({method}) with no new events saves the watermark",
+                       current.executed("MERGE INTO load_watermarks") != [] and current.commits == 1))
+        checks.append((f"incremental ({method}) closes its cursors", all(c.closed for c in current.cursors)))
+
+    return checks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the Snowflake bulk events load against a stand-in connection")
+    parser.add_argument("--events", type=int, default=1000, help="Number of sample events to load")
+    parser.add_argument("--parallel", type=int, default=4, help="PUT PARALLEL value to pass to stage_events")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="fake_snowflake_") as tmp:
+        write_sample_events(Path(tmp), args.events)
+        checks = run_checks(Path(tmp), args.events, args.parallel)
+
+    print()
+    for name, passed in checks:
+        print(f"  {'✓' if passed else '⚠'} {name}")
+    failed = [name for name, passed in checks if not passed]
+    if failed:
+        print(f"\n⚠ {len(failed)} of {len(checks)} checks failed")
+        sys.exit(1)
+    print(f"\n✓ All {len(checks)} checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Load synthetic data into a local DuckDB database
+Offline stand-in for Snowflake: builds the raw tables from
+scripts/snowflake/create_tables.sql so the dbt project runs with the duckdb target.
+
+    python generate_synthetic_data.py --num-events 8000000 --engine numpy --stream  # ~1M events
+    python scripts/load_to_duckdb.py --data-dir ./data
+    cd dbt_project && dbt build --profiles-dir local --target duckdb
+"""
+
+import os
+import time
+import argparse
+from pathlib import Path
+from typing import List, Tuple
+import duckdb
+
+# The database file name is the catalog dbt sees, so keep it matching the
+# `database` of the raw source in dbt_project/models/staging/sources.yml
+DEFAULT_DATABASE_PATH = os.getenv("DUCKDB_PATH", "./data/media_analytics.duckdb")
+RAW_SCHEMA = "raw"
+
+# Nested Contract 1 records as typed STRUCTs (the typed OBJECT columns of
+# create_tables.sql), so stg_events reads fields without re-parsing JSON
+EVENT_PARAMS_TYPE = "STRUCT(key VARCHAR, value STRUCT(string_value VARCHAR, int_value BIGINT))[]"
+DEVICE_TYPE = "STRUCT(category VARCHAR, operating_system VARCHAR, browser VARCHAR)"
+GEO_TYPE = "STRUCT(country VARCHAR, region VARCHAR, city VARCHAR)"
+TRAFFIC_SOURCE_TYPE = "STRUCT(source VARCHAR, medium VARCHAR, campaign VARCHAR)"
+
+# events_raw columns read from Contract 1 JSONL
+EVENTS_JSON_COLUMNS = {
+    "event_date": "VARCHAR",
+    "event_timestamp": "BIGINT",
+    "event_name": "VARCHAR",
+    "user_pseudo_id": "VARCHAR",
+    "ga_session_id": "VARCHAR",
+    "event_params": EVENT_PARAMS_TYPE,
+    "device": DEVICE_TYPE,
+    "geo": GEO_TYPE,
+    "traffic_source": TRAFFIC_SOURCE_TYPE,
+}
+
+# Flattened parquet events rebuilt into the Contract 1 layout. Only the
+# article_id/writer_id params survive flattening (all stg_events reads).
+EVENTS_PARQUET_SELECT = f"""
+    SELECT
+        strftime(event_date, '%Y%m%d') AS event_date,
+        epoch_us(event_timestamp) AS event_timestamp,
+        event_name::VARCHAR AS event_name,
+        user_pseudo_id::VARCHAR AS user_pseudo_id,
+        ga_session_id::VARCHAR AS ga_session_id,
+        [
+            {{'key': 'article_id', 'value': {{'string_value': article_id::VARCHAR, 'int_value': NULL}}}},
+            {{'key': 'writer_id', 'value': {{'string_value': writer_id::VARCHAR, 'int_value': NULL}}}}
+        ]::{EVENT_PARAMS_TYPE} AS event_params,
+        {{'category': device_category, 'operating_system': device_os,
+          'browser': device_browser}}::{DEVICE_TYPE} AS device,
+        {{'country': geo_country, 'region': geo_region, 'city': geo_city}}::{GEO_TYPE} AS geo,
+        {{'source': traffic_source, 'medium': traffic_medium,
+          'campaign': traffic_campaign}}::{TRAFFIC_SOURCE_TYPE} AS traffic_source
+    FROM read_parquet(?)
+"""
+
+
+def get_connection(path: str = DEFAULT_DATABASE_PATH):
+    """Open (creating if needed) the DuckDB database file"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return duckdb.connect(path)
+
+
+def event_files(data_dir: Path) -> Tuple[str, List[Path]]:
+    """Format and paths of the events file(s): events.{jsonl,parquet} or their shards"""
+    for fmt in ("jsonl", "parquet"):
+        merged = data_dir / f"events.{fmt}"
+        if merged.exists():
+            return fmt, [merged]
+        shards = sorted(data_dir.glob(f"events-[0-9]*.{fmt}"))
+        if shards:
+            return fmt, shards
+    raise FileNotFoundError(f"No events.jsonl / events.parquet (or shards) in {data_dir}")
+
+
+def load_writers(conn, data_dir: Path):
+    """Load writer metadata from CSV"""
+    print("Loading writers...")
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE {RAW_SCHEMA}.writer_metadata AS
+        SELECT
+            writer_id::VARCHAR AS writer_id,
+            writer_name::VARCHAR AS writer_name,
+            primary_category::VARCHAR AS primary_category,
+            tenure_start_date::DATE AS tenure_start_date,
+            contract_type::VARCHAR AS contract_type,
+            target_articles_per_month::INTEGER AS target_articles_per_month
+        FROM read_csv(?, header = true)
+    """, [str(data_dir / "writers.csv")])
+    count = conn.execute(f"SELECT COUNT(*) FROM {RAW_SCHEMA}.writer_metadata").fetchone()[0]
+    print(f"  ✓ Loaded {count} writers")
+
+
+def load_articles(conn, data_dir: Path):
+    """Load article metadata from CSV (sentiment columns stay empty until enrichment)"""
+    print("Loading articles...")
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE {RAW_SCHEMA}.article_metadata AS
+        SELECT
+            article_id::VARCHAR AS article_id,
+            title::VARCHAR AS title,
+            writer_id::VARCHAR AS writer_id,
+            publish_date::DATE AS publish_date,
+            category::VARCHAR AS category,
+            word_count::INTEGER AS word_count,
+            is_premium::BOOLEAN AS is_premium,
+            estimated_rpm::DECIMAL(10, 2) AS estimated_rpm,
+            sentiment_score_positive::DECIMAL(5, 4) AS sentiment_score_positive,
+            sentiment_score_negative::DECIMAL(5, 4) AS sentiment_score_negative,
+            sentiment_label::VARCHAR AS sentiment_label,
+            sentiment_enriched_at::TIMESTAMP AS sentiment_enriched_at,
+            current_timestamp::TIMESTAMP AS _loaded_at,
+            current_timestamp::TIMESTAMP AS _updated_at
+        FROM read_csv(?, header = true, all_varchar = true)
+    """, [str(data_dir / "articles.csv")])
+    count = conn.execute(f"SELECT COUNT(*) FROM {RAW_SCHEMA}.article_metadata").fetchone()[0]
+    print(f"  ✓ Loaded {count} articles")
+
+
+def load_events(conn, data_dir: Path) -> int:
+    """
+    Load events_raw straight from the generated JSONL/parquet file(s).
+
+    DuckDB scans the files in parallel itself, so there is no batching or
+    staging step; a rerun replaces the table (and stamps a new _loaded_at).
+    """
+    fmt, paths = event_files(data_dir)
+    print(f"Loading events from {len(paths)} {fmt} file(s)...")
+    files = [str(path) for path in paths]
+
+    if fmt == "jsonl":
+        columns = ", ".join(f"'{name}': '{dtype}'" for name, dtype in EVENTS_JSON_COLUMNS.items())
+        source_sql = f"""
+            SELECT {", ".join(EVENTS_JSON_COLUMNS)}
+            FROM read_json(?, format = 'newline_delimited', columns = {{{columns}}})
+        """
+    else:
+        source_sql = EVENTS_PARQUET_SELECT
+
+    started = time.perf_counter()
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE {RAW_SCHEMA}.events_raw AS
+        SELECT *, current_timestamp::TIMESTAMP AS _loaded_at
+        FROM ({source_sql})
+    """, [files])
+    count = conn.execute(f"SELECT COUNT(*) FROM {RAW_SCHEMA}.events_raw").fetchone()[0]
+    elapsed = time.perf_counter() - started
+    print(f"  ✓ Loaded {count:,} events in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/sec)")
+    return count
+
+
+def validate_load(conn):
+    """Run validation queries after load"""
+    print("\nValidating data load...")
+
+    for table, name in [("writers", "writer_metadata"), ("articles", "article_metadata"),
+                        ("events", "events_raw")]:
+        count = conn.execute(f"SELECT COUNT(*) FROM {RAW_SCHEMA}.{name}").fetchone()[0]
+        print(f"  {table}: {count:,} rows")
+
+    # Check referential integrity
+    orphans = conn.execute(f"""
+        SELECT COUNT(*)
+        FROM {RAW_SCHEMA}.article_metadata a
+        LEFT JOIN {RAW_SCHEMA}.writer_metadata w ON a.writer_id = w.writer_id
+        WHERE w.writer_id IS NULL
+    """).fetchone()[0]
+    if orphans == 0:
+        print("  ✓ Referential integrity validated")
+    else:
+        print(f"  ⚠ Warning: {orphans} articles with invalid writer_id")
+
+    # Check event distribution
+    rows = conn.execute(f"""
+        SELECT event_name, COUNT(*) AS cnt
+        FROM {RAW_SCHEMA}.events_raw
+        GROUP BY event_name
+        ORDER BY cnt DESC
+    """).fetchall()
+    print("\n  Event distribution:")
+    for event_name, count in rows:
+        print(f"    {event_name}: {count:,}")
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Load synthetic data into a local DuckDB database")
+    parser.add_argument("--data-dir", default="./data", help="Directory with generated data files")
+    parser.add_argument("--database", default=DEFAULT_DATABASE_PATH,
+                        help="DuckDB database file (default: $DUCKDB_PATH or ./data/media_analytics.duckdb)")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+
+    if not data_dir.exists():
+        print(f"Error: Data directory not found: {data_dir}")
+        print("Run generate_synthetic_data.py first")
+        return
+
+    print("=" * 60)
+    print("DuckDB Data Loader")
+    print("=" * 60)
+    print(f"Database: {args.database}")
+    print(f"Schema: {RAW_SCHEMA}")
+    print()
+
+    conn = get_connection(args.database)
+    try:
+        conn.execute(f"CREATE SCHEMA IF NOT EXISTS {RAW_SCHEMA}")
+        load_writers(conn, data_dir)
+        load_articles(conn, data_dir)
+        load_events(conn, data_dir)
+        validate_load(conn)
+
+        print("\n" + "=" * 60)
+        print("✓ Data loading complete!")
+        print("=" * 60)
+        print("\nNext steps:")
+        print("1. Run: cd dbt_project && dbt build --profiles-dir local --target duckdb")
+        print(f"2. Query the models with: duckdb {args.database}")
+
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,24 @@ Used for Airflow DAG or local automation
 """
 
 import os
+import io
+import re
 import json
 import csv
+import gzip
+import hashlib
+import queue
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator, Tuple, Callable, Optional
 import snowflake.connector
 from snowflake.connector import DictCursor
+from snowflake.connector.errors import ProgrammingError
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -25,6 +37,58 @@ SNOWFLAKE_CONFIG = {
     "role": os.getenv("SNOWFLAKE_ROLE", "ACCOUNTADMIN")
 }
 
+# Bulk (stage + COPY INTO) settings for events_raw
+EVENTS_STAGE = "events_raw_stage"
+EVENTS_ROWS_PER_FILE = 250000   # ~10-20 MB gzipped per staged file
+PUT_PARALLEL = 8                # upload threads per PUT
+
+# INSERT statements, formatted with the target table name
+WRITERS_INSERT_SQL = """
+    INSERT INTO {table} (
+        writer_id, writer_name, primary_category, 
+        tenure_start_date, contract_type, target_articles_per_month
+    ) VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+ARTICLES_INSERT_SQL = """
+    INSERT INTO {table} (
+        article_id, title, writer_id, publish_date, 
+        category, word_count, is_premium, estimated_rpm
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# Each row binds the JSON string once and parses it once
+EVENTS_INSERT_SQL = """
+    INSERT INTO {table} (
+        event_date, event_timestamp, event_name, 
+        user_pseudo_id, ga_session_id, event_params,
+        device, geo, traffic_source
+    ) 
+    SELECT 
+        v:event_date::STRING,
+        v:event_timestamp::NUMBER,
+        v:event_name::STRING,
+        v:user_pseudo_id::STRING,
+        v:ga_session_id::STRING,
+        v:event_params::VARIANT,
+        v:device::OBJECT,
+        v:geo::OBJECT,
+        v:traffic_source::OBJECT
+    FROM (SELECT PARSE_JSON(%s) AS v)
+"""
+
+# Incremental loading: natural keys used to dedupe appended rows
+NATURAL_KEYS = {
+    "writer_metadata": ["writer_id"],
+    "article_metadata": ["article_id"],
+    "events_raw": ["user_pseudo_id", "ga_session_id", "event_timestamp", "event_name"],
+}
+EVENT_TIMESTAMP_RE = re.compile(rb'"event_timestamp":\s*(\d+)')
+
+# Streaming INSERT settings: rows per executemany and batches read ahead
+LOAD_BATCH_SIZE = 10000
+READ_AHEAD_BATCHES = 2
+
 
 def get_connection():
     """Create Snowflake connection"""
@@ -39,43 +103,131 @@ def get_connection():
     )
 
 
+def iter_batches(rows: Iterable, batch_size: int = LOAD_BATCH_SIZE) -> Iterator[List]:
+    """Group an iterable of rows into lists of at most batch_size"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def read_ahead(batches: Iterator[List], depth: int = READ_AHEAD_BATCHES) -> Iterator[List]:
+    """
+    Produce batches on a background thread while the caller inserts.
+    
+    A bounded queue caps memory at `depth` batches in flight. Reader errors
+    are re-raised in the caller, and the reader stops if the caller does.
+    """
+    q = queue.Queue(maxsize=depth)
+    done = object()
+    stop = threading.Event()
+    
+    def produce():
+        try:
+            for batch in batches:
+                while not stop.is_set():
+                    try:
+                        q.put(batch, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            q.put(done)
+        except BaseException as e:
+            q.put(e)
+    
+    thread = threading.Thread(target=produce, name="load-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join(timeout=1)
+
+
+def csv_rows(path: Path, offset: int = 0) -> Iterator[Dict]:
+    """Stream CSV records straight from the file handle, optionally from a byte offset"""
+    with open(path, "rb") as raw:
+        header = next(csv.reader([raw.readline().decode("utf-8")]), [])
+        if offset > raw.tell():
+            raw.seek(offset)
+        f = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        yield from csv.DictReader(f, fieldnames=header)
+
+
+def jsonl_rows(paths: List[Path]) -> Iterator[Tuple[str]]:
+    """Stream non-empty JSONL lines as 1-tuples (one bind per event)"""
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                event = line.strip()
+                if event:
+                    yield (event,)
+
+
+def insert_batches(cursor, insert_sql: str, batches: Iterable[List], label: str = "rows") -> int:
+    """executemany each batch as it arrives; returns the number of rows inserted"""
+    inserted = 0
+    for batch in batches:
+        cursor.executemany(insert_sql, batch)
+        inserted += len(batch)
+        if inserted % 50000 < len(batch):
+            print(f"  Inserted {inserted} {label}...")
+    return inserted
+
+
+def writer_row(w: Dict) -> Tuple:
+    """writers.csv record -> writer_metadata insert tuple"""
+    return (
+        w["writer_id"],
+        w["writer_name"],
+        w["primary_category"],
+        w["tenure_start_date"],
+        w["contract_type"],
+        int(w["target_articles_per_month"])
+    )
+
+
+def article_row(a: Dict) -> Tuple:
+    """articles.csv record -> article_metadata insert tuple"""
+    return (
+        a["article_id"],
+        a["title"],
+        a["writer_id"],
+        a["publish_date"],
+        a["category"],
+        int(a["word_count"]),
+        a["is_premium"].lower() == "true",
+        float(a["estimated_rpm"])
+    )
+
+
 def load_writers(conn, data_dir: Path):
     """Load writer metadata from CSV"""
     print("Loading writer_metadata...")
     
-    with open(data_dir / "writers.csv", "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        writers = list(reader)
-    
     cursor = conn.cursor()
     
     # Truncate table (optional - remove if appending)
     cursor.execute("TRUNCATE TABLE writer_metadata")
     
-    # Bulk insert
-    insert_sql = """
-    INSERT INTO writer_metadata (
-        writer_id, writer_name, primary_category, 
-        tenure_start_date, contract_type, target_articles_per_month
-    ) VALUES (%s, %s, %s, %s, %s, %s)
-    """
-    
-    rows = [
-        (
-            w["writer_id"],
-            w["writer_name"],
-            w["primary_category"],
-            w["tenure_start_date"],
-            w["contract_type"],
-            int(w["target_articles_per_month"])
-        )
-        for w in writers
-    ]
+    # Bulk insert, streaming batches from the file
+    insert_sql = WRITERS_INSERT_SQL.format(table="writer_metadata")
     
-    cursor.executemany(insert_sql, rows)
+    batches = read_ahead(iter_batches(map(writer_row, csv_rows(data_dir / "writers.csv"))))
+    loaded = insert_batches(cursor, insert_sql, batches, "writers")
     conn.commit()
     
-    print(f"  ✓ Loaded {len(rows)} writers")
+    print(f"  ✓ Loaded {loaded} writers")
     
     cursor.close()
 
@@ -84,47 +236,171 @@ def load_articles(conn, data_dir: Path):
     """Load article metadata from CSV"""
     print("Loading article_metadata...")
     
-    with open(data_dir / "articles.csv", "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        articles = list(reader)
-    
     cursor = conn.cursor()
     
     # Truncate table
     cursor.execute("TRUNCATE TABLE article_metadata")
     
-    # Bulk insert
-    insert_sql = """
-    INSERT INTO article_metadata (
-        article_id, title, writer_id, publish_date, 
-        category, word_count, is_premium, estimated_rpm
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-    """
-    
-    rows = [
-        (
-            a["article_id"],
-            a["title"],
-            a["writer_id"],
-            a["publish_date"],
-            a["category"],
-            int(a["word_count"]),
-            a["is_premium"].lower() == "true",
-            float(a["estimated_rpm"])
-        )
-        for a in articles
-    ]
+    # Bulk insert, streaming batches from the file
+    insert_sql = ARTICLES_INSERT_SQL.format(table="article_metadata")
     
-    cursor.executemany(insert_sql, rows)
+    batches = read_ahead(iter_batches(map(article_row, csv_rows(data_dir / "articles.csv"))))
+    loaded = insert_batches(cursor, insert_sql, batches, "articles")
     conn.commit()
     
-    print(f"  ✓ Loaded {len(rows)} articles")
+    print(f"  ✓ Loaded {loaded} articles")
     
     cursor.close()
 
 
-def load_events(conn, data_dir: Path):
-    """Load events from JSONL file"""
+def event_files(data_dir: Path) -> List[Path]:
+    """Events JSONL files in data_dir: events.jsonl, or events-00000.jsonl... shards"""
+    merged = data_dir / "events.jsonl"
+    if merged.exists():
+        return [merged]
+    return sorted(data_dir.glob("events-[0-9]*.jsonl"))
+
+
+def event_lines(paths: List[Path]) -> Iterator[bytes]:
+    """Raw non-empty JSONL lines (bytes, newline included) from the events file(s)"""
+    for path in paths:
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield line if line.endswith(b"\n") else line + b"\n"
+
+
+def compress_event_lines(lines: Iterable[bytes], out_dir: Path,
+                         rows_per_file: int = EVENTS_ROWS_PER_FILE) -> List[Path]:
+    """
+    Gzip events into evenly sized part files for staging.
+    
+    Splitting into several files lets both PUT and COPY INTO work in parallel
+    (Snowflake loads one file per thread).
+    """
+    parts = []
+    out = None
+    rows = 0
+    try:
+        for line in lines:
+            if out is None or rows >= rows_per_file:
+                if out is not None:
+                    out.close()
+                parts.append(out_dir / f"events-part-{len(parts):05d}.jsonl.gz")
+                out = gzip.open(parts[-1], "wb", compresslevel=1)
+                rows = 0
+            out.write(line)
+            rows += 1
+    finally:
+        if out is not None:
+            out.close()
+    return parts
+
+
+def stage_events(conn, data_dir: Path, stage: str = EVENTS_STAGE, parallel: int = PUT_PARALLEL,
+                 lines: Optional[Iterable[bytes]] = None) -> int:
+    """
+    Compress the events JSONL locally and PUT the parts to an internal stage.
+    
+    Uses a temporary stage (dropped with the session). Raises ProgrammingError
+    if staging is unavailable, e.g. missing CREATE STAGE privileges. `lines`
+    overrides the file contents (e.g. only the events past a watermark).
+    Returns the number of staged part files; with no lines nothing is sent
+    (PUT fails on a pattern that matches no files) and it returns 0.
+    """
+    paths = event_files(data_dir)
+    if not paths:
+        raise FileNotFoundError(f"No events JSONL found in {data_dir}")
+    
+    cursor = conn.cursor()
+    try:
+        with tempfile.TemporaryDirectory(prefix="events_stage_") as tmp:
+            parts = compress_event_lines(lines if lines is not None else event_lines(paths), Path(tmp))
+            print(f"  Compressed {len(paths)} file(s) into {len(parts)} part(s)")
+            if not parts:
+                print("  No events to stage")
+                return 0
+            
+            cursor.execute(f"CREATE TEMPORARY STAGE IF NOT EXISTS {stage}")
+            cursor.execute(f"REMOVE @{stage}/events/")
+            put_pattern = (Path(tmp) / "events-part-*.jsonl.gz").as_posix()
+            cursor.execute(
+                f"PUT 'file://{put_pattern}' @{stage}/events/ "
+                f"PARALLEL={parallel} AUTO_COMPRESS=FALSE SOURCE_COMPRESSION=GZIP OVERWRITE=TRUE"
+            )
+    finally:
+        cursor.close()
+    
+    print(f"  ✓ Staged {len(parts)} part(s) to @{stage}/events/")
+    return len(parts)
+
+
+def copy_staged_events(conn, stage: str = EVENTS_STAGE, table: str = "events_raw",
+                       truncate: bool = True) -> int:
+    """Replace (or append to) `table` with the staged files in one COPY INTO (each event parsed once)"""
+    cursor = conn.cursor()
+    try:
+        if truncate:
+            cursor.execute(f"TRUNCATE TABLE {table}")
+        cursor.execute(f"""
+            COPY INTO {table} (
+                event_date, event_timestamp, event_name,
+                user_pseudo_id, ga_session_id, event_params,
+                device, geo, traffic_source
+            )
+            FROM (
+                SELECT
+                    $1:event_date::STRING,
+                    $1:event_timestamp::NUMBER,
+                    $1:event_name::STRING,
+                    $1:user_pseudo_id::STRING,
+                    $1:ga_session_id::STRING,
+                    $1:event_params::VARIANT,
+                    $1:device::OBJECT,
+                    $1:geo::OBJECT,
+                    $1:traffic_source::OBJECT
+                FROM @{stage}/events/
+            )
+            FILE_FORMAT = (TYPE = 'JSON' COMPRESSION = 'GZIP')
+            ON_ERROR = 'ABORT_STATEMENT'
+            PURGE = TRUE
+        """)
+        # One row per file: (file, status, rows_parsed, rows_loaded, ...). With
+        # no files COPY returns a single status column instead.
+        loaded = sum(int(row[3]) for row in cursor.fetchall() if len(row) > 3)
+        conn.commit()
+    finally:
+        cursor.close()
+    return loaded
+
+
+def load_events(conn, data_dir: Path, method: str = "auto") -> int:
+    """
+    Load events from JSONL.
+    
+    method: 'copy' (stage + COPY INTO), 'insert' (batched row INSERTs) or
+    'auto' (COPY INTO, falling back to inserts only when staging fails).
+    """
+    if method in ("auto", "copy"):
+        print("Loading events_raw via stage + COPY INTO...")
+        try:
+            num_parts = stage_events(conn, data_dir)
+        except ProgrammingError as e:
+            if method == "copy":
+                raise
+            print(f"  ⚠ Staging unavailable ({e}); falling back to row inserts")
+        else:
+            if num_parts:
+                loaded = copy_staged_events(conn)
+                print(f"  ✓ Loaded {loaded} events")
+                return loaded
+            # Empty events file(s): the insert path just empties events_raw
+    
+    return load_events_insert(conn, data_dir)
+
+
+def load_events_insert(conn, data_dir: Path) -> int:
+    """Load events from JSONL file with batched INSERTs (no stage required)"""
     print("Loading events_raw... (this may take a few minutes)")
     
     cursor = conn.cursor()
@@ -132,48 +408,448 @@ def load_events(conn, data_dir: Path):
     # Truncate table
     cursor.execute("TRUNCATE TABLE events_raw")
     
-    # Read JSONL and prepare for bulk insert
-    # Note: For very large files, consider using Snowflake stage + COPY INTO
-    insert_sql = """
-    INSERT INTO events_raw (
-        event_date, event_timestamp, event_name, 
-        user_pseudo_id, ga_session_id, event_params,
-        device, geo, traffic_source
-    ) 
-    SELECT 
-        PARSE_JSON(%s):event_date::STRING,
-        PARSE_JSON(%s):event_timestamp::NUMBER,
-        PARSE_JSON(%s):event_name::STRING,
-        PARSE_JSON(%s):user_pseudo_id::STRING,
-        PARSE_JSON(%s):ga_session_id::STRING,
-        PARSE_JSON(%s):event_params::VARIANT,
-        PARSE_JSON(%s):device::OBJECT,
-        PARSE_JSON(%s):geo::OBJECT,
-        PARSE_JSON(%s):traffic_source::OBJECT
+    insert_sql = EVENTS_INSERT_SQL.format(table="events_raw")
+    
+    # Stream 10K-row batches from the file(s); the next batch is read while
+    # the current one is inserted, so memory stays flat regardless of file size
+    batches = read_ahead(iter_batches(jsonl_rows(event_files(data_dir))))
+    loaded = insert_batches(cursor, insert_sql, batches, "events")
+    
+    conn.commit()
+    
+    print(f"  ✓ Loaded {loaded} events")
+    
+    cursor.close()
+    return loaded
+
+
+class ConnectionPool:
+    """Small thread-safe pool of Snowflake connections, opened lazily up to size"""
+    
+    def __init__(self, size: int, factory: Callable = get_connection):
+        self.size = size
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._opened = []
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; blocks while all `size` connections are in use"""
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if len(self._opened) < self.size:
+                    conn = self.factory()
+                    self._opened.append(conn)
+            if conn is None:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+    
+    def close_all(self):
+        for conn in self._opened:
+            conn.close()
+        self._opened = []
+
+
+def byte_ranges(path: Path, num_chunks: int) -> List[Tuple[int, int]]:
+    """Split a file into num_chunks contiguous [start, end) byte ranges"""
+    size = path.stat().st_size
+    num_chunks = max(1, min(num_chunks, size))
+    bounds = [size * i // num_chunks for i in range(num_chunks + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def jsonl_range_rows(path: Path, start: int, end: int) -> Iterator[Tuple[str]]:
     """
+    Stream the JSONL lines that *start* inside [start, end) of a file.
     
-    events = []
-    with open(data_dir / "events.jsonl", "r", encoding="utf-8") as f:
-        for i, line in enumerate(f):
-            if i % 50000 == 0 and i > 0:
-                print(f"  Processing event {i}...")
+    A line straddling a boundary belongs to the range it starts in, so a set
+    of ranges from byte_ranges() yields every line exactly once.
+    """
+    with open(path, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()  # finish the line that started before this range
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
             event = line.strip()
             if event:
-                events.append((event,) * 9)  # Tuple with same JSON string 9 times
+                yield (event.decode("utf-8"),)
+
+
+def event_chunk_sources(data_dir: Path, parallelism: int) -> List[Callable[[], Iterator[Tuple[str]]]]:
+    """Byte-range row sources over the events JSONL file(s), about parallelism in total"""
+    paths = event_files(data_dir)
+    total = sum(p.stat().st_size for p in paths) or 1
+    sources = []
+    for path in paths:
+        num_chunks = max(1, round(parallelism * path.stat().st_size / total))
+        for start, end in byte_ranges(path, num_chunks):
+            sources.append(lambda path=path, start=start, end=end: jsonl_range_rows(path, start, end))
+    return sources
+
+
+def load_table_parallel(pool: ConnectionPool, table: str, insert_sql: str,
+                        sources: List[Callable[[], Iterable[Tuple]]], parallelism: int) -> int:
+    """
+    Atomically replace `table` with rows from independent sources loaded concurrently.
     
-    # Insert in batches of 10K for performance
-    batch_size = 10000
-    for i in range(0, len(events), batch_size):
-        batch = events[i:i+batch_size]
-        cursor.executemany(insert_sql, batch)
-        if i % 50000 == 0:
-            print(f"  Inserted {i + len(batch)} events...")
+    Each source is inserted on its own pooled connection into a transient
+    load table. Only when every source has succeeded is the target replaced
+    with a single INSERT OVERWRITE; if any source fails, the load table is
+    dropped and the target is left untouched.
+    """
+    load_table = f"{table}__load"
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"CREATE OR REPLACE TRANSIENT TABLE {load_table} LIKE {table}")
+        finally:
+            cursor.close()
+    
+    def load_source(source):
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                batches = read_ahead(iter_batches(source()))
+                inserted = insert_batches(cursor, insert_sql.format(table=load_table), batches, table)
+                conn.commit()
+                return inserted
+            finally:
+                cursor.close()
     
-    conn.commit()
+    try:
+        with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix=f"load-{table}") as executor:
+            futures = [executor.submit(load_source, source) for source in sources]
+            try:
+                loaded = sum(future.result() for future in futures)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"INSERT OVERWRITE INTO {table} SELECT * FROM {load_table}")
+                conn.commit()
+            finally:
+                cursor.close()
+    finally:
+        with pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"DROP TABLE IF EXISTS {load_table}")
+            finally:
+                cursor.close()
+    
+    return loaded
+
+
+def load_all_parallel(pool: ConnectionPool, data_dir: Path, parallelism: int, events_method: str = "auto"):
+    """
+    Load writers, articles and events concurrently over pooled connections.
     
-    print(f"  ✓ Loaded {len(events)} events")
+    The metadata tables are single-source parallel loads. Events use the
+    stage + COPY INTO path on one connection (Snowflake parallelizes the COPY
+    across staged files), or byte-range chunks on separate connections when
+    loading with INSERTs.
+    """
+    def writers():
+        print("Loading writer_metadata...")
+        rows = lambda: map(writer_row, csv_rows(data_dir / "writers.csv"))
+        loaded = load_table_parallel(pool, "writer_metadata", WRITERS_INSERT_SQL, [rows], parallelism)
+        print(f"  ✓ Loaded {loaded} writers")
+    
+    def articles():
+        print("Loading article_metadata...")
+        rows = lambda: map(article_row, csv_rows(data_dir / "articles.csv"))
+        loaded = load_table_parallel(pool, "article_metadata", ARTICLES_INSERT_SQL, [rows], parallelism)
+        print(f"  ✓ Loaded {loaded} articles")
+    
+    def events():
+        with pool.connection() as conn:
+            if events_method in ("auto", "copy"):
+                print("Loading events_raw via stage + COPY INTO...")
+                try:
+                    num_parts = stage_events(conn, data_dir)
+                except ProgrammingError as e:
+                    if events_method == "copy":
+                        raise
+                    print(f"  ⚠ Staging unavailable ({e}); falling back to row inserts")
+                else:
+                    if num_parts:
+                        print(f"  ✓ Loaded {copy_staged_events(conn)} events")
+                        return
+        sources = event_chunk_sources(data_dir, parallelism)
+        print(f"Loading events_raw in {len(sources)} byte-range chunks...")
+        loaded = load_table_parallel(pool, "events_raw", EVENTS_INSERT_SQL, sources, parallelism)
+        print(f"  ✓ Loaded {loaded} events")
+    
+    print(f"Loading tables concurrently (parallelism {parallelism})...")
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="load-table") as executor:
+        futures = [executor.submit(task) for task in (writers, articles, events)]
+        errors = [future.exception() for future in futures]
+    for error in errors:
+        if error is not None:
+            raise error
+
+
+def ensure_watermark_table(conn):
+    """Create the load_watermarks control table if it does not exist yet"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS load_watermarks (
+                table_name STRING PRIMARY KEY,
+                max_event_timestamp NUMBER(38,0),
+                source_file STRING,
+                file_checksum STRING,
+                file_offset NUMBER(38,0),
+                rows_inserted NUMBER(38,0),
+                rows_skipped NUMBER(38,0),
+                loaded_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+            )
+        """)
+    finally:
+        cursor.close()
+
+
+def read_watermark(conn, table: str) -> Optional[Dict]:
+    """Last recorded watermark row for a table (keys lower-cased), or None"""
+    cursor = conn.cursor(DictCursor)
+    try:
+        cursor.execute("SELECT * FROM load_watermarks WHERE table_name = %s", (table,))
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    return {k.lower(): v for k, v in row.items()} if row else None
+
+
+def save_watermark(cursor, table: str, max_event_timestamp: Optional[int] = None,
+                   source_file: Optional[str] = None, file_checksum: Optional[str] = None,
+                   file_offset: Optional[int] = None, rows_inserted: int = 0, rows_skipped: int = 0):
+    """Upsert a table's watermark (runs inside the caller's load transaction)"""
+    cursor.execute("""
+        MERGE INTO load_watermarks w
+        USING (
+            SELECT %s AS table_name, %s AS max_event_timestamp, %s AS source_file,
+                   %s AS file_checksum, %s AS file_offset, %s AS rows_inserted, %s AS rows_skipped
+        ) s
+        ON w.table_name = s.table_name
+        WHEN MATCHED THEN UPDATE SET
+            max_event_timestamp = s.max_event_timestamp,
+            source_file = s.source_file,
+            file_checksum = s.file_checksum,
+            file_offset = s.file_offset,
+            rows_inserted = s.rows_inserted,
+            rows_skipped = s.rows_skipped,
+            loaded_at = CURRENT_TIMESTAMP()
+        WHEN NOT MATCHED THEN INSERT (
+            table_name, max_event_timestamp, source_file, file_checksum,
+            file_offset, rows_inserted, rows_skipped
+        ) VALUES (
+            s.table_name, s.max_event_timestamp, s.source_file, s.file_checksum,
+            s.file_offset, s.rows_inserted, s.rows_skipped
+        )
+    """, (table, max_event_timestamp, source_file, file_checksum, file_offset, rows_inserted, rows_skipped))
+
+
+def file_checksums(path: Path, prefix_bytes: int) -> Tuple[str, str]:
+    """sha256 of the first prefix_bytes of a file and of the whole file, in one pass"""
+    digest = hashlib.sha256()
+    prefix_digest = digest.copy() if prefix_bytes == 0 else None
+    read = 0
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(1 << 20)
+            if not block:
+                break
+            if prefix_digest is None and read + len(block) >= prefix_bytes:
+                head = prefix_bytes - read
+                digest.update(block[:head])
+                prefix_digest = digest.copy()
+                digest.update(block[head:])
+            else:
+                digest.update(block)
+            read += len(block)
+    return (prefix_digest.hexdigest() if prefix_digest is not None else ""), digest.hexdigest()
+
+
+def create_delta_table(conn, table: str) -> str:
+    """Session-scoped temporary table shaped like `table` to collect new rows"""
+    delta_table = f"{table}__delta"
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"CREATE OR REPLACE TEMPORARY TABLE {delta_table} LIKE {table}")
+    finally:
+        cursor.close()
+    return delta_table
+
+
+def append_delta(cursor, table: str, delta_table: str) -> int:
+    """
+    Insert delta rows whose natural key is not in `table` yet (deduped within the delta too).
     
-    cursor.close()
+    Returns the number of rows inserted.
+    """
+    keys = NATURAL_KEYS[table]
+    key_list = ", ".join(keys)
+    key_match = " AND ".join(f"t.{k} = d.{k}" for k in keys)
+    cursor.execute(f"""
+        INSERT INTO {table}
+        SELECT d.*
+        FROM (
+            SELECT * FROM {delta_table}
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY {key_list} ORDER BY {key_list}) = 1
+        ) d
+        WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE {key_match})
+    """)
+    return cursor.rowcount or 0
+
+
+def load_metadata_incremental(conn, table: str, path: Path, insert_sql: str,
+                              row_fn: Callable[[Dict], Tuple]) -> Tuple[int, int]:
+    """
+    Append new rows from a metadata CSV using its checksum/offset watermark.
+    
+    Unchanged file: nothing is read. File only appended to since the last load
+    (checksum of the previously loaded prefix matches): only the bytes past the
+    stored offset are read. Otherwise the whole file is re-read. New rows are
+    deduped on the natural key, so existing rows (and their enrichment
+    columns) are never overwritten. Returns (inserted, skipped).
+    """
+    print(f"Loading {table} (incremental)...")
+    watermark = read_watermark(conn, table) or {}
+    offset = int(watermark.get("file_offset") or 0)
+    size = path.stat().st_size
+    prefix_checksum, checksum = file_checksums(path, min(offset, size))
+    
+    if watermark and checksum == watermark.get("file_checksum") and size == offset:
+        print(f"  ✓ {path.name} unchanged since last load; nothing to do")
+        return 0, 0
+    
+    prefix_matches = watermark and offset <= size and prefix_checksum == watermark.get("file_checksum")
+    start = offset if prefix_matches else 0
+    print(f"  Reading {path.name} from byte {start} ({'appended rows' if start else 'full file'})")
+    
+    delta_table = create_delta_table(conn, table)
+    cursor = conn.cursor()
+    try:
+        read = insert_batches(
+            cursor, insert_sql.format(table=delta_table),
+            read_ahead(iter_batches(map(row_fn, csv_rows(path, start)))), table
+        )
+        
+        cursor.execute("BEGIN")
+        inserted = append_delta(cursor, table, delta_table)
+        skipped = read - inserted
+        save_watermark(cursor, table, source_file=path.name, file_checksum=checksum, file_offset=size,
+                       rows_inserted=inserted, rows_skipped=skipped)
+        conn.commit()
+    finally:
+        cursor.close()
+    
+    print(f"  ✓ {inserted} inserted, {skipped} skipped (already loaded)")
+    return inserted, skipped
+
+
+def load_events_incremental(conn, data_dir: Path, method: str = "auto") -> Tuple[int, int]:
+    """
+    Append events newer than the events_raw high watermark (max event_timestamp).
+    
+    Events at or after the watermark are staged (or inserted) into a
+    temporary delta table and appended where their natural key is new; older
+    events are skipped without being sent. Late events older than the
+    watermark therefore need a full reload. Returns (inserted, skipped).
+    """
+    print("Loading events_raw (incremental)...")
+    watermark = read_watermark(conn, "events_raw")
+    if watermark and watermark.get("max_event_timestamp") is not None:
+        high_watermark = int(watermark["max_event_timestamp"])
+    else:
+        # First incremental run: start from what a full load already put there
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT MAX(event_timestamp) FROM events_raw")
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        high_watermark = int(row[0]) if row and row[0] is not None else None
+    print(f"  High watermark: {high_watermark}")
+    
+    below_watermark = 0
+    
+    def new_lines():
+        nonlocal below_watermark
+        for line in event_lines(event_files(data_dir)):
+            match = EVENT_TIMESTAMP_RE.search(line)
+            ts = int(match.group(1)) if match else int(json.loads(line)["event_timestamp"])
+            if high_watermark is not None and ts < high_watermark:
+                below_watermark += 1
+                continue
+            yield line
+    
+    delta_table = create_delta_table(conn, "events_raw")
+    delta_rows = None
+    if method in ("auto", "copy"):
+        try:
+            num_parts = stage_events(conn, data_dir, lines=new_lines())
+        except ProgrammingError as e:
+            if method == "copy":
+                raise
+            print(f"  ⚠ Staging unavailable ({e}); falling back to row inserts")
+            below_watermark = 0
+        else:
+            delta_rows = copy_staged_events(conn, table=delta_table, truncate=False) if num_parts else 0
+    cursor = conn.cursor()
+    try:
+        if delta_rows is None:
+            rows = ((line.decode("utf-8").strip(),) for line in new_lines())
+            delta_rows = insert_batches(
+                cursor, EVENTS_INSERT_SQL.format(table=delta_table), read_ahead(iter_batches(rows)), "events"
+            )
+        
+        cursor.execute(f"SELECT MAX(event_timestamp) FROM {delta_table}")
+        row = cursor.fetchone()
+        delta_max = int(row[0]) if row and row[0] is not None else None
+        candidates = [v for v in (high_watermark, delta_max) if v is not None]
+        new_watermark = max(candidates) if candidates else None
+        
+        cursor.execute("BEGIN")
+        inserted = append_delta(cursor, "events_raw", delta_table)
+        skipped = below_watermark + delta_rows - inserted
+        save_watermark(cursor, "events_raw", max_event_timestamp=new_watermark,
+                       rows_inserted=inserted, rows_skipped=skipped)
+        conn.commit()
+    finally:
+        cursor.close()
+    
+    print(f"  ✓ {inserted} inserted, {skipped} skipped ({below_watermark} below watermark)")
+    return inserted, skipped
+
+
+def load_all_incremental(conn, data_dir: Path, events_method: str = "auto"):
+    """Incremental (append-only) load of all three raw tables"""
+    ensure_watermark_table(conn)
+    results = {
+        "writer_metadata": load_metadata_incremental(
+            conn, "writer_metadata", data_dir / "writers.csv", WRITERS_INSERT_SQL, writer_row),
+        "article_metadata": load_metadata_incremental(
+            conn, "article_metadata", data_dir / "articles.csv", ARTICLES_INSERT_SQL, article_row),
+        "events_raw": load_events_incremental(conn, data_dir, events_method),
+    }
+    print("\n  Incremental load summary:")
+    for table, (inserted, skipped) in results.items():
+        print(f"    {table}: {inserted:,} inserted, {skipped:,} skipped")
 
 
 def validate_load(conn):
@@ -222,7 +898,20 @@ def validate_load(conn):
 
 def main():
     """Main execution"""
-    data_dir = Path("./data")
+    parser = argparse.ArgumentParser(description="Load synthetic data to Snowflake")
+    parser.add_argument("--data-dir", default="./data", help="Directory with generated data files")
+    parser.add_argument("--events-method", choices=["auto", "copy", "insert"], default="auto",
+                        help="events_raw load path: stage + COPY INTO, row INSERTs, or COPY with INSERT fallback")
+    parser.add_argument("--parallelism", type=int, default=1,
+                        help="Connections to load with; >1 loads tables concurrently and splits events into chunks")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Append only new rows (per-table watermarks in load_watermarks) instead of truncating; "
+                             "runs on a single connection")
+    args = parser.parse_args()
+    if args.incremental and args.parallelism > 1:
+        parser.error("--parallelism is not supported with --incremental (incremental loads use one connection)")
+    
+    data_dir = Path(args.data_dir)
     
     if not data_dir.exists():
         print(f"Error: Data directory not found: {data_dir}")
@@ -237,19 +926,28 @@ def main():
     print(f"Schema: {SNOWFLAKE_CONFIG['schema']}")
     print()
     
+    pool = ConnectionPool(max(1, args.parallelism))
     try:
         # Connect
         print("Connecting to Snowflake...")
-        conn = get_connection()
-        print("  ✓ Connected")
+        with pool.connection() as conn:
+            print("  ✓ Connected")
         
         # Load data
-        load_writers(conn, data_dir)
-        load_articles(conn, data_dir)
-        load_events(conn, data_dir)
+        if args.incremental:
+            with pool.connection() as conn:
+                load_all_incremental(conn, data_dir, args.events_method)
+        elif args.parallelism > 1:
+            load_all_parallel(pool, data_dir, args.parallelism, args.events_method)
+        else:
+            with pool.connection() as conn:
+                load_writers(conn, data_dir)
+                load_articles(conn, data_dir)
+                load_events(conn, data_dir, args.events_method)
         
         # Validate
-        validate_load(conn)
+        with pool.connection() as conn:
+            validate_load(conn)
         
         print("\n" + "=" * 60)
         print("✓ Data loading complete!")
@@ -263,8 +961,7 @@ def main():
         raise
     
     finally:
-        if 'conn' in locals():
-            conn.close()
+        pool.close_all()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,256 @@
+"""
+Aggregate navigation for the semantic layer query service
+
+Catalog of the aggregate tables built from fct_article_daily_rollup: their
+grain, the semantic dimensions they carry, and how each semantic measure is
+re-aggregated from their columns. AggregateRouter lists the sources that can
+answer a metric query exactly (or, for *_approx metrics, from HLL sketches);
+query_service.py runs it on the smallest one and falls back to the semantic
+model's own table (fct_article_events).
+
+Exactness rules:
+- Additive measures (counts, sums, and averages stored as sum + count pairs)
+  re-aggregate with SUM to any coarser grain.
+- Non-additive measures (distinct counts, averages and medians computed per
+  row) are only usable at the source's exact grain.
+- The marts only cover page_view events (their measure columns and their
+  rows), so they need the query to filter event_name = 'page_view'. The
+  daily rollup keeps every event and also answers unfiltered event counts.
+- A weekly source answers week grain (or no grain) with Monday-to-Sunday
+  date ranges only.
+- Distinct counts in the marts are HLL estimates on Snowflake, so they are
+  skipped unless approximate results are allowed.
+- Sketch measures (the rollup's day-level HLL states) merge to any coarser
+  grain, but only answer approximate metrics (meta approximate: hll).
+"""
+
+from datetime import date
+from typing import List, Dict, Optional, Tuple
+
+ADDITIVE = "additive"
+NON_ADDITIVE = "non_additive"
+SKETCH = "sketch"
+
+# Estimate from merged HLL states, per warehouse (matches the hll_* macros)
+HLL_MERGE_ESTIMATE = {
+    "snowflake": "HLL_ESTIMATE(HLL_COMBINE({state}))",
+    "duckdb": "COALESCE(len(list_distinct(flatten(list({state})))), 0)",
+}
+
+# Which events a source's measure columns cover, from the query's event_name filter
+ALL_EVENTS = "all_events"
+PAGE_VIEWS = "page_view"
+
+# Semantic model -> aggregate sources. Measures are keyed by event scope:
+# measure name -> (kind, aggregate SQL over the source's columns[, approximate]);
+# SKETCH entries name the HLL state column instead
+AGGREGATE_SOURCES = {
+    "article_events": [
+        {
+            "model": "fct_article_daily_rollup",
+            "time_column": "event_date",
+            "time_grain": "day",
+            "dimensions": {
+                "category": "article_category",
+                "device_category": "device_category",
+                "traffic_medium": "traffic_medium",
+                "is_premium": "is_premium",
+            },
+            "grain": None,  # article x day x device x medium; article is not a semantic dimension
+            "page_view_rows": "pageview_events > 0",
+            "measures": {
+                ALL_EVENTS: {
+                    "total_events": (ADDITIVE, "COALESCE(SUM(all_events), 0)"),
+                    "pageviews": (ADDITIVE, "COALESCE(SUM(pageview_events), 0)"),
+                    "unique_users": (SKETCH, "all_users_hll"),
+                    "unique_sessions": (SKETCH, "all_sessions_hll"),
+                    "unique_viewers": (SKETCH, "viewers_hll"),
+                    "engaged_users": (SKETCH, "engaged_users_hll"),
+                },
+                PAGE_VIEWS: {
+                    "total_events": (ADDITIVE, "COALESCE(SUM(pageview_events), 0)"),
+                    "pageviews": (ADDITIVE, "COALESCE(SUM(pageview_events), 0)"),
+                    "engaged_events": (ADDITIVE, "COALESCE(SUM(engaged_events), 0)"),
+                    "total_engagement_time_sec": (ADDITIVE, "SUM(engagement_msec_sum) / 1000.0"),
+                    "avg_engagement_time_sec": (ADDITIVE, "SUM(engagement_msec_sum) / NULLIF(SUM(engagement_msec_count), 0) / 1000.0"),
+                    "total_revenue_estimate": (ADDITIVE, "SUM(revenue_sum)"),
+                    "unique_users": (SKETCH, "viewers_hll"),
+                    "unique_sessions": (SKETCH, "sessions_hll"),
+                    "unique_viewers": (SKETCH, "viewers_hll"),
+                    "engaged_users": (SKETCH, "engaged_users_hll"),
+                },
+            },
+        },
+        {
+            "model": "mart_engagement_summary",
+            "time_column": "week_start_date",
+            "time_grain": "week",
+            "dimensions": {
+                "category": "article_category",
+                "device_category": "device_category",
+                "traffic_medium": "traffic_medium",
+            },
+            "grain": ("category", "device_category", "traffic_medium"),
+            "page_view_rows": None,
+            "measures": {
+                PAGE_VIEWS: {
+                    "total_events": (ADDITIVE, "COALESCE(SUM(total_events), 0)"),
+                    "pageviews": (ADDITIVE, "COALESCE(SUM(total_events), 0)"),
+                    "engaged_events": (ADDITIVE, "COALESCE(SUM(engaged_events), 0)"),
+                    "total_revenue_estimate": (ADDITIVE, "SUM(total_revenue)"),
+                    "avg_engagement_time_sec": (NON_ADDITIVE, "MAX(avg_engagement_seconds)"),
+                    "unique_users": (NON_ADDITIVE, "MAX(unique_users)", True),
+                    "unique_sessions": (NON_ADDITIVE, "MAX(unique_sessions)", True),
+                    "unique_viewers": (NON_ADDITIVE, "MAX(unique_users)", True),
+                    "engaged_users": (NON_ADDITIVE, "MAX(engaged_users)", True),
+                },
+            },
+        },
+        {
+            "model": "mart_article_performance",
+            "time_column": "event_date",
+            "time_grain": "day",
+            "dimensions": {
+                "category": "article_category",
+                "is_premium": "is_premium",
+            },
+            "grain": None,  # article x day
+            "page_view_rows": None,
+            "measures": {
+                PAGE_VIEWS: {
+                    "total_events": (ADDITIVE, "COALESCE(SUM(total_events), 0)"),
+                    "pageviews": (ADDITIVE, "COALESCE(SUM(total_events), 0)"),
+                    "engaged_events": (ADDITIVE, "COALESCE(SUM(engaged_events), 0)"),
+                    "total_revenue_estimate": (ADDITIVE, "SUM(total_revenue)"),
+                    "unique_users": (NON_ADDITIVE, "MAX(unique_viewers)", True),
+                    "unique_viewers": (NON_ADDITIVE, "MAX(unique_viewers)", True),
+                    "engaged_users": (NON_ADDITIVE, "MAX(engaged_users)", True),
+                },
+            },
+        },
+        {
+            "model": "mart_writer_performance",
+            "time_column": "week_start_date",
+            "time_grain": "week",
+            "dimensions": {
+                "writer_category": "primary_category",
+                "contract_type": "contract_type",
+            },
+            "grain": None,  # writer x week
+            "page_view_rows": None,
+            "measures": {
+                PAGE_VIEWS: {
+                    "total_events": (ADDITIVE, "COALESCE(SUM(total_page_views), 0)"),
+                    "pageviews": (ADDITIVE, "COALESCE(SUM(total_page_views), 0)"),
+                    "engaged_events": (ADDITIVE, "COALESCE(SUM(engaged_events), 0)"),
+                    "total_revenue_estimate": (ADDITIVE, "SUM(total_revenue)"),
+                    "unique_users": (NON_ADDITIVE, "MAX(unique_viewers)", True),
+                    "unique_viewers": (NON_ADDITIVE, "MAX(unique_viewers)", True),
+                    "engaged_users": (NON_ADDITIVE, "MAX(engaged_users)", True),
+                },
+            },
+        },
+    ],
+}
+
+
+class AggregateSource:
+    """An aggregate table that can stand in for a semantic model's table"""
+
+    def __init__(self, spec: Dict):
+        self.model = spec["model"]
+        self.time_column = spec["time_column"]
+        self.time_grain = spec["time_grain"]
+        self.dimensions: Dict[str, str] = spec["dimensions"]
+        self.grain: Optional[Tuple[str, ...]] = spec["grain"]
+        self.page_view_rows: Optional[str] = spec["page_view_rows"]
+        self.measures: Dict[str, Dict[str, Tuple]] = spec["measures"]
+
+    @staticmethod
+    def scope(query) -> Optional[str]:
+        """Event scope of the query: all events, page views only, or None (no source matches)"""
+        if "event_name" in query.dimensions:
+            return None
+        event_names = dict(query.where).get("event_name")
+        if event_names is None:
+            return ALL_EVENTS
+        return PAGE_VIEWS if event_names == (PAGE_VIEWS,) else None
+
+    def scoped_measures(self, query, measures: List[str]) -> Optional[Dict[str, Tuple]]:
+        """Measure specs for the query's event scope, or None if one of them is missing"""
+        scope = self.scope(query)
+        available = self.measures.get(scope, {})
+        if scope is None or not all(measure in available for measure in measures):
+            return None
+        return {measure: available[measure] for measure in measures}
+
+    def answers(self, query, measures: Dict[str, bool], allow_approximate: bool = False) -> bool:
+        """
+        Whether the query's result from this source equals the one from the
+        semantic model's table. `measures` maps each measure to whether an
+        approximate (HLL) answer is acceptable for it.
+        """
+        specs = self.scoped_measures(query, list(measures))
+        if specs is None:
+            return False
+        filtered = [dimension for dimension, _ in query.where if dimension != "event_name"]
+        if not all(dimension in self.dimensions for dimension in list(query.dimensions) + filtered):
+            return False
+
+        if self.time_grain == "week":
+            if query.grain not in (None, "week"):
+                return False
+            if query.start_date and date.fromisoformat(query.start_date).weekday() != 0:
+                return False
+            if query.end_date and date.fromisoformat(query.end_date).weekday() != 6:
+                return False
+
+        for measure, spec in specs.items():
+            approximate = spec[0] == SKETCH or (len(spec) > 2 and spec[2])
+            if approximate and not (measures[measure] or allow_approximate):
+                return False
+            if spec[0] == NON_ADDITIVE:
+                if self.grain is None or not set(self.grain) <= set(query.dimensions):
+                    return False
+                if query.grain != self.time_grain:
+                    return False
+        return True
+
+    def aggregates(self, query, measures: Dict[str, str], dialect: str = "snowflake") -> Dict[str, str]:
+        """metric -> aggregate SQL over this source"""
+        specs = self.scoped_measures(query, list(measures.values()))
+        return {
+            metric: HLL_MERGE_ESTIMATE[dialect].format(state=specs[measure][1])
+            if specs[measure][0] == SKETCH else specs[measure][1]
+            for metric, measure in measures.items()
+        }
+
+    def filters(self, query) -> List[str]:
+        """Row filters standing in for the query's event_name filter"""
+        if self.scope(query) == PAGE_VIEWS and self.page_view_rows:
+            return [self.page_view_rows]
+        return []
+
+    def where(self, query) -> List[Tuple[str, Tuple[str, ...]]]:
+        """The query's dimension filters left to apply (event_name is covered by the scope)"""
+        return [(dimension, values) for dimension, values in query.where if dimension != "event_name"]
+
+
+class AggregateRouter:
+    """Aggregate sources that answer a query exactly (or from sketches, for approximate metrics)"""
+
+    def __init__(self, sources: Optional[Dict[str, List[Dict]]] = None, allow_approximate: bool = False,
+                 dialect: str = "snowflake"):
+        catalog = AGGREGATE_SOURCES if sources is None else sources
+        self.sources = {
+            semantic_model: [AggregateSource(spec) for spec in specs]
+            for semantic_model, specs in catalog.items()
+        }
+        self.allow_approximate = allow_approximate
+        self.dialect = dialect
+
+    def candidates(self, semantic_model: str, query, measures: Dict[str, bool]) -> List[AggregateSource]:
+        return [
+            source for source in self.sources.get(semantic_model, [])
+            if source.answers(query, measures, self.allow_approximate)
+        ]
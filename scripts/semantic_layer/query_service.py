@@ -0,0 +1,629 @@
+"""
+Semantic Layer Query Service
+
+Compiles metric requests (metrics + dimensions + time grain) against the dbt
+semantic definitions in dbt_project/models/semantic into SQL, and serves
+repeated requests from an in-memory LRU cache. A cached result is dropped as
+soon as dbt rebuilds the model it was read from (build times are taken from
+dbt's target/run_results.json).
+
+Each query runs on the smallest aggregate table that answers it exactly
+(see aggregate_navigation.py), falling back to the semantic model's table.
+
+Usage:
+    python scripts/semantic_layer/query_service.py list
+    python scripts/semantic_layer/query_service.py query --metrics pageviews,unique_users --dimensions device_category --grain week
+    python scripts/semantic_layer/query_service.py --target duckdb query --metrics total_revenue --where category=sports,news --start-date 2024-11-01
+    python scripts/semantic_layer/query_service.py --target duckdb --routing-log routing.jsonl serve --port 8080
+    python scripts/semantic_layer/query_service.py --routing-log routing.jsonl routing-stats
+"""
+
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any, Callable, List, Dict, Optional, Tuple
+import yaml
+from dotenv import load_dotenv
+
+from aggregate_navigation import AggregateRouter, AggregateSource
+
+# Load environment variables
+load_dotenv()
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+SEMANTIC_DIR = REPO_ROOT / "dbt_project" / "models" / "semantic"
+DEFAULT_DBT_TARGET_DIR = REPO_ROOT / "dbt_project" / "target"
+DEFAULT_DUCKDB_PATH = os.getenv("DUCKDB_PATH", str(REPO_ROOT / "data" / "media_analytics.duckdb"))
+DEFAULT_CACHE_SIZE = 256        # cached query results
+DEFAULT_PORT = 8080
+
+# Time grains for the metric_time dimension (the semantic model's agg_time_dimension)
+METRIC_TIME = "metric_time"
+TIME_GRAINS = ("day", "week", "month", "quarter", "year")
+
+# MetricFlow measure aggregations -> SQL (valid on Snowflake and DuckDB)
+AGGREGATIONS = {
+    "sum": "SUM({expr})",
+    "count": "COUNT({expr})",
+    "count_distinct": "COUNT(DISTINCT {expr})",
+    "average": "AVG({expr})",
+    "min": "MIN({expr})",
+    "max": "MAX({expr})",
+    "median": "MEDIAN({expr})",
+    "sum_boolean": "SUM(CASE WHEN {expr} THEN 1 ELSE 0 END)",
+}
+
+
+class SemanticModel:
+    """One entry of _semantic_models.yml: the dbt model it reads, its dimensions and measures"""
+
+    def __init__(self, spec: Dict):
+        self.name = spec["name"]
+        self.model = re.fullmatch(r"ref\(['\"](\w+)['\"]\)", spec["model"].strip()).group(1)
+        self.agg_time_dimension = spec.get("defaults", {}).get("agg_time_dimension")
+        self.dimensions = {
+            d["name"]: {"type": d["type"], "expr": d.get("expr", d["name"])}
+            for d in spec.get("dimensions", [])
+        }
+        self.measures = {
+            m["name"]: {"agg": m["agg"], "expr": str(m.get("expr", m["name"]))}
+            for m in spec.get("measures", [])
+        }
+
+
+class MetricQuery:
+    """
+    A normalized metric request.
+
+    Metrics, dimensions and filter values are de-duplicated and sorted, so
+    requests that only differ in ordering share one cache key and compile
+    to the same SQL.
+    """
+
+    def __init__(self, metrics: List[str], dimensions: Optional[List[str]] = None,
+                 grain: Optional[str] = None, where: Optional[Dict[str, Any]] = None,
+                 start_date: Optional[str] = None, end_date: Optional[str] = None):
+        self.metrics = tuple(sorted(set(metrics)))
+        self.dimensions = tuple(sorted(set(dimensions or [])))
+        self.grain = grain.lower() if grain else None
+        self.where = tuple(sorted(
+            (dimension, tuple(sorted({str(v) for v in (values if isinstance(values, (list, tuple, set))
+                                                        else [values])})))
+            for dimension, values in (where or {}).items()
+        ))
+        self.start_date = date.fromisoformat(str(start_date)).isoformat() if start_date else None
+        self.end_date = date.fromisoformat(str(end_date)).isoformat() if end_date else None
+
+        if not self.metrics:
+            raise ValueError("At least one metric is required")
+        if self.grain and self.grain not in TIME_GRAINS:
+            raise ValueError(f"Unknown time grain '{grain}' (expected one of {', '.join(TIME_GRAINS)})")
+
+    @property
+    def key(self) -> Tuple:
+        return (self.metrics, self.dimensions, self.grain, self.where, self.start_date, self.end_date)
+
+    def to_dict(self) -> Dict:
+        return {
+            "metrics": list(self.metrics),
+            "dimensions": list(self.dimensions),
+            "grain": self.grain,
+            "where": {dimension: list(values) for dimension, values in self.where},
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+        }
+
+
+def quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class SemanticLayer:
+    """Semantic models and metrics from dbt_project/models/semantic, compiled to SQL"""
+
+    def __init__(self, semantic_dir: Path = SEMANTIC_DIR):
+        self.models: Dict[str, SemanticModel] = {}
+        self.metrics: Dict[str, Dict] = {}
+        for path in sorted(Path(semantic_dir).glob("*.yml")):
+            with open(path) as f:
+                spec = yaml.safe_load(f) or {}
+            for model in spec.get("semantic_models", []):
+                self.models[model["name"]] = SemanticModel(model)
+            for metric in spec.get("metrics", []):
+                self.metrics[metric["name"]] = metric
+
+    def measure_of(self, metric_name: str) -> Tuple[SemanticModel, str]:
+        """Semantic model and measure name behind a simple metric"""
+        metric = self.metrics.get(metric_name)
+        if metric is None:
+            raise ValueError(f"Unknown metric '{metric_name}'")
+        if metric.get("type") != "simple":
+            raise ValueError(f"Metric '{metric_name}' has type '{metric.get('type')}'; only simple metrics are supported")
+        measure = metric["type_params"]["measure"]
+        measure = measure["name"] if isinstance(measure, dict) else measure
+        for model in self.models.values():
+            if measure in model.measures:
+                return model, measure
+        raise ValueError(f"Measure '{measure}' of metric '{metric_name}' is not defined in any semantic model")
+
+    def is_approximate(self, metric_name: str) -> bool:
+        """*_approx metrics (meta approximate: hll) may be answered from HLL sketches"""
+        metric = self.metrics.get(metric_name, {})
+        return metric.get("config", {}).get("meta", {}).get("approximate") == "hll"
+
+    def resolve(self, query: MetricQuery) -> SemanticModel:
+        """The single semantic model answering every metric, dimension and filter of the query"""
+        models = {self.measure_of(metric)[0].name for metric in query.metrics}
+        if len(models) > 1:
+            raise ValueError(f"Metrics come from different semantic models ({', '.join(sorted(models))}); "
+                             f"query them separately")
+        model = self.models[models.pop()]
+        for dimension in list(query.dimensions) + [dimension for dimension, _ in query.where]:
+            if dimension not in model.dimensions:
+                raise ValueError(f"Unknown dimension '{dimension}' for semantic model '{model.name}'")
+        if (query.grain or query.start_date or query.end_date) and not model.agg_time_dimension:
+            raise ValueError(f"Semantic model '{model.name}' has no agg_time_dimension")
+        return model
+
+    def compile(self, query: MetricQuery, relation: str, source: Optional[AggregateSource] = None,
+                dialect: str = "snowflake") -> str:
+        """
+        SQL for the query against `relation`: the resolved semantic model's
+        table, or the aggregate `source` the router picked for it.
+        """
+        model = self.resolve(query)
+        measures = {metric: self.measure_of(metric)[1] for metric in query.metrics}
+
+        if source is None:
+            time_expr = model.dimensions.get(model.agg_time_dimension, {}).get("expr", model.agg_time_dimension)
+            dimension_exprs = {name: dimension["expr"] for name, dimension in model.dimensions.items()}
+            aggregates = {}
+            for metric, measure_name in measures.items():
+                measure = model.measures[measure_name]
+                template = AGGREGATIONS.get(measure["agg"])
+                if template is None:
+                    raise ValueError(f"Unsupported aggregation '{measure['agg']}' for metric '{metric}'")
+                aggregates[metric] = template.format(expr=measure["expr"])
+            filters, where = [], list(query.where)
+        else:
+            time_expr = source.time_column
+            dimension_exprs = source.dimensions
+            aggregates = source.aggregates(query, measures, dialect)
+            filters, where = source.filters(query), source.where(query)
+
+        group_by = []
+        if query.grain:
+            group_by.append(f"DATE_TRUNC('{query.grain}', {time_expr})::DATE AS {METRIC_TIME}__{query.grain}")
+        group_by += [f"{dimension_exprs[d]} AS {d}" for d in query.dimensions]
+        aggregates = [f"{aggregates[metric]} AS {metric}" for metric in query.metrics]
+
+        if query.start_date:
+            filters.append(f"{time_expr} >= {quote_literal(query.start_date)}")
+        if query.end_date:
+            filters.append(f"{time_expr} <= {quote_literal(query.end_date)}")
+        for dimension, values in where:
+            filters.append(f"{dimension_exprs[dimension]} IN ({', '.join(map(quote_literal, values))})")
+
+        sql = "SELECT\n    " + ",\n    ".join(group_by + aggregates) + f"\nFROM {relation}"
+        if filters:
+            sql += "\nWHERE " + "\n  AND ".join(filters)
+        if group_by:
+            ordinals = ", ".join(str(i) for i in range(1, len(group_by) + 1))
+            sql += f"\nGROUP BY {ordinals}\nORDER BY {ordinals}"
+        return sql
+
+
+class DbtArtifacts:
+    """
+    Relation names (manifest.json) and last build times (run_results.json)
+    from dbt's target/ directory.
+
+    Files are re-read whenever their mtime changes. Each dbt invocation only
+    reports the models it ran, so build times are merged across reloads.
+    """
+
+    def __init__(self, target_dir: Path = DEFAULT_DBT_TARGET_DIR):
+        self.target_dir = Path(target_dir)
+        self.relations: Dict[str, str] = {}
+        self.built_at: Dict[str, str] = {}
+        self.mtimes: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def _changed(self, path: Path) -> bool:
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if self.mtimes.get(path.name) == mtime:
+            return False
+        self.mtimes[path.name] = mtime
+        return True
+
+    def refresh(self):
+        with self.lock:
+            manifest = self.target_dir / "manifest.json"
+            if self._changed(manifest):
+                with open(manifest) as f:
+                    nodes = json.load(f).get("nodes", {}).values()
+                self.relations = {
+                    node["name"]: node["relation_name"]
+                    for node in nodes if node.get("resource_type") == "model" and node.get("relation_name")
+                }
+
+            run_results = self.target_dir / "run_results.json"
+            if self._changed(run_results):
+                with open(run_results) as f:
+                    results = json.load(f).get("results", [])
+                for result in results:
+                    if not result["unique_id"].startswith("model.") or result.get("status") != "success":
+                        continue
+                    completed = [t["completed_at"] for t in result.get("timing", []) if t.get("name") == "execute"]
+                    if completed:
+                        self.built_at[result["unique_id"].rsplit(".", 1)[-1]] = completed[-1]
+
+    def relation(self, model: str) -> str:
+        """Fully qualified relation for a dbt model (bare model name without a manifest)"""
+        return self.relations.get(model, model)
+
+    def build_timestamp(self, model: str) -> Optional[str]:
+        return self.built_at.get(model)
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of query results.
+
+    Each entry remembers the model it was read from and that model's build
+    timestamp; a lookup with a different version evicts the entry (the
+    model was rebuilt, or the query now routes to another table).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple, Tuple[Tuple, Dict]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Tuple, version: Tuple) -> Optional[Dict]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] != version:
+                del self.entries[key]
+                self.invalidations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple, version: Tuple, result: Dict):
+        if self.max_entries <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (version, result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def run_sql(conn, sql: str) -> Tuple[List[str], List[List]]:
+    """Execute on a DB-API connection; returns lower-cased column names and rows"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql)
+        columns = [d[0].lower() for d in cursor.description]
+        return columns, [list(row) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def get_connection(target: str, duckdb_path: str = DEFAULT_DUCKDB_PATH):
+    """Warehouse connection for the dbt target the models were built on"""
+    if target == "duckdb":
+        import duckdb
+        return duckdb.connect(duckdb_path, read_only=True)
+    import snowflake.connector
+    return snowflake.connector.connect(
+        account=os.getenv("SNOWFLAKE_ACCOUNT"),
+        user=os.getenv("SNOWFLAKE_USER"),
+        password=os.getenv("SNOWFLAKE_PASSWORD"),
+        warehouse=os.getenv("SNOWFLAKE_WAREHOUSE", "COMPUTE_WH"),
+        database=os.getenv("SNOWFLAKE_DATABASE", "media_analytics"),
+        role=os.getenv("SNOWFLAKE_ROLE"),
+    )
+
+
+class SemanticQueryService:
+    """Route, compile, execute and cache metric queries"""
+
+    def __init__(self, layer: SemanticLayer, conn, artifacts: DbtArtifacts,
+                 cache_size: int = DEFAULT_CACHE_SIZE, router: Optional[AggregateRouter] = None,
+                 routing_log: Optional[Path] = None):
+        self.layer = layer
+        self.conn = conn
+        self.artifacts = artifacts
+        self.cache = QueryCache(cache_size)
+        self.router = router
+        self.routing_log = routing_log
+        self.routed: Dict[str, int] = {}
+        self.aggregate_hits = 0
+        self.row_counts: Dict[str, Tuple[Optional[str], Optional[int]]] = {}
+        self.conn_lock = threading.Lock()   # DB-API connections are not shared across threads
+        self.stats_lock = threading.Lock()
+
+    def row_count(self, model: str) -> Optional[int]:
+        """Rows in a model's table, re-counted after each build; None if it is not built"""
+        version = self.artifacts.build_timestamp(model)
+        if model in self.row_counts and self.row_counts[model][0] == version:
+            return self.row_counts[model][1]
+        try:
+            with self.conn_lock:
+                count = run_sql(self.conn, f"SELECT COUNT(*) FROM {self.artifacts.relation(model)}")[1][0][0]
+        except Exception as e:
+            print(f"⚠ Aggregate {model} unavailable: {e}")
+            count = None
+        self.row_counts[model] = (version, count)
+        return count
+
+    def route(self, query: MetricQuery) -> Tuple[str, Optional[AggregateSource]]:
+        """dbt model serving the query: the smallest exact aggregate, else the semantic model's table"""
+        model = self.layer.resolve(query)
+        if self.router is None:
+            return model.model, None
+        measures: Dict[str, bool] = {}
+        for metric in query.metrics:
+            measure = self.layer.measure_of(metric)[1]
+            measures[measure] = measures.get(measure, True) and self.layer.is_approximate(metric)
+        sized = [
+            (count, source) for source in self.router.candidates(model.name, query, measures)
+            for count in [self.row_count(source.model)] if count is not None
+        ]
+        if not sized:
+            return model.model, None
+        source = min(sized, key=lambda pair: pair[0])[1]
+        return source.model, source
+
+    def record(self, query: MetricQuery, result: Dict, seconds: float):
+        """Count (and optionally log) which source served a query"""
+        with self.stats_lock:
+            self.routed[result["source"]] = self.routed.get(result["source"], 0) + 1
+            self.aggregate_hits += result["aggregate"]
+            if self.routing_log:
+                entry = {
+                    "timestamp": datetime.now().isoformat(timespec="seconds"),
+                    "query": query.to_dict(),
+                    "source": result["source"],
+                    "aggregate": result["aggregate"],
+                    "cached": result["cached"],
+                    "seconds": round(seconds, 4),
+                }
+                with open(self.routing_log, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+
+    def query(self, query: MetricQuery) -> Dict:
+        """Result rows for the query, from the cache when the source model has not been rebuilt"""
+        started = time.perf_counter()
+        self.artifacts.refresh()
+        model, source = self.route(query)
+        built_at = self.artifacts.build_timestamp(model)
+        version = (model, built_at)
+
+        cached = self.cache.get(query.key, version)
+        if cached is not None:
+            result = {**cached, "cached": True}
+            self.record(query, result, time.perf_counter() - started)
+            return result
+
+        sql = self.layer.compile(query, self.artifacts.relation(model), source,
+                                 self.router.dialect if self.router else "snowflake")
+        executed = time.perf_counter()
+        with self.conn_lock:
+            columns, rows = run_sql(self.conn, sql)
+        result = {
+            "query": query.to_dict(),
+            "columns": columns,
+            "rows": rows,
+            "sql": sql,
+            "source": model,
+            "aggregate": source is not None,
+            "source_built_at": built_at,
+            "execution_seconds": round(time.perf_counter() - executed, 4),
+        }
+        self.cache.put(query.key, version, result)
+        result = {**result, "cached": False}
+        self.record(query, result, time.perf_counter() - started)
+        return result
+
+    def stats(self) -> Dict:
+        with self.stats_lock:
+            return {"cache": self.cache.stats(), "routing": routing_summary(self.routed, self.aggregate_hits)}
+
+
+def routing_summary(routed: Dict[str, int], aggregate_hits: int) -> Dict:
+    """Queries per source and the share served by aggregates instead of the semantic models' tables"""
+    served = sum(routed.values())
+    return {
+        "queries": served,
+        "by_source": dict(sorted(routed.items(), key=lambda item: -item[1])),
+        "aggregate_hit_rate": round(aggregate_hits / served, 4) if served else 0.0,
+    }
+
+
+def parse_where(values: List[str]) -> Dict[str, List[str]]:
+    """['category=sports,news', 'device_category=mobile'] -> {dimension: [values]}"""
+    where = {}
+    for item in values:
+        dimension, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"--where expects dimension=value[,value...], got '{item}'")
+        where.setdefault(dimension.strip(), []).extend(v.strip() for v in value.split(","))
+    return where
+
+
+def print_result(result: Dict, max_rows: int = 20):
+    print(" | ".join(result["columns"]))
+    for row in result["rows"][:max_rows]:
+        print(" | ".join("" if value is None else str(value) for value in row))
+    if len(result["rows"]) > max_rows:
+        print(f"... {len(result['rows']) - max_rows} more rows")
+
+
+def make_handler(service: SemanticQueryService) -> Callable:
+    class QueryHandler(BaseHTTPRequestHandler):
+        """POST /query with a JSON MetricQuery body; GET /stats for cache and routing statistics"""
+
+        def send_json(self, status: int, payload: Dict):
+            body = json.dumps(payload, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                self.send_json(200, service.stats())
+            else:
+                self.send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/query":
+                self.send_json(404, {"error": "not found"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                self.send_json(200, service.query(MetricQuery(**request)))
+            except (ValueError, TypeError) as e:
+                self.send_json(400, {"error": str(e)})
+
+    return QueryHandler
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Semantic layer query service")
+    parser.add_argument("--target", choices=["snowflake", "duckdb"], default="snowflake",
+                        help="Warehouse the dbt models were built on")
+    parser.add_argument("--database", default=DEFAULT_DUCKDB_PATH, help="DuckDB database file (--target duckdb)")
+    parser.add_argument("--dbt-target-dir", type=Path, default=DEFAULT_DBT_TARGET_DIR,
+                        help="dbt target/ directory with manifest.json and run_results.json")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="Maximum cached results")
+    parser.add_argument("--no-aggregates", action="store_true",
+                        help="Always query the semantic models' own tables (no aggregate routing)")
+    parser.add_argument("--allow-approximate", action="store_true",
+                        help="Let the router use the marts' HLL distinct counts")
+    parser.add_argument("--routing-log", type=Path, help="Append one JSON line per query with the source that served it")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="List metrics and their dimensions")
+    commands.add_parser("routing-stats", help="Aggregate hit rate from --routing-log")
+
+    query = commands.add_parser("query", help="Run one metric query")
+    query.add_argument("--metrics", required=True, help="Comma-separated metric names")
+    query.add_argument("--dimensions", default="", help="Comma-separated dimension names")
+    query.add_argument("--grain", choices=TIME_GRAINS, help="Group by metric_time at this grain")
+    query.add_argument("--where", action="append", default=[], help="dimension=value[,value...] (repeatable)")
+    query.add_argument("--start-date", help="First metric_time date (YYYY-MM-DD)")
+    query.add_argument("--end-date", help="Last metric_time date (YYYY-MM-DD)")
+    query.add_argument("--repeat", type=int, default=1, help="Run the query N times (shows cache hits)")
+    query.add_argument("--show-sql", action="store_true", help="Print the compiled SQL")
+
+    serve = commands.add_parser("serve", help="Serve queries over HTTP (POST /query, GET /stats)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    layer = SemanticLayer()
+    if args.command == "list":
+        for name, metric in sorted(layer.metrics.items()):
+            model, measure = layer.measure_of(name)
+            agg = model.measures[measure]["agg"] + (" (approximate, HLL)" if layer.is_approximate(name) else "")
+            print(f"{name} ({metric.get('label', name)}): {agg} over {model.model}")
+            print(f"  dimensions: {METRIC_TIME}, {', '.join(sorted(model.dimensions))}")
+        return
+
+    if args.command == "routing-stats":
+        if not args.routing_log or not args.routing_log.exists():
+            print("Error: --routing-log file not found")
+            return
+        routed, aggregate_hits = {}, 0
+        with open(args.routing_log) as f:
+            for line in f:
+                entry = json.loads(line)
+                routed[entry["source"]] = routed.get(entry["source"], 0) + 1
+                aggregate_hits += entry["aggregate"]
+        print(json.dumps(routing_summary(routed, aggregate_hits), indent=2))
+        return
+
+    artifacts = DbtArtifacts(args.dbt_target_dir)
+    artifacts.refresh()
+    if not artifacts.relations:
+        print(f"⚠ No manifest.json in {args.dbt_target_dir}; querying bare model names")
+    router = None
+    if not args.no_aggregates:
+        router = AggregateRouter(allow_approximate=args.allow_approximate, dialect=args.target)
+    service = SemanticQueryService(layer, get_connection(args.target, args.database), artifacts,
+                                   args.cache_size, router, args.routing_log)
+
+    if args.command == "serve":
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+        print(f"✓ Serving semantic layer queries on http://{args.host}:{args.port} (POST /query, GET /stats)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    try:
+        request = MetricQuery(
+            metrics=[m.strip() for m in args.metrics.split(",") if m.strip()],
+            dimensions=[d.strip() for d in args.dimensions.split(",") if d.strip()],
+            grain=args.grain, where=parse_where(args.where),
+            start_date=args.start_date, end_date=args.end_date,
+        )
+        layer.resolve(request)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    for attempt in range(max(1, args.repeat)):
+        started = time.perf_counter()
+        result = service.query(request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if attempt == 0:
+            if args.show_sql:
+                print(result["sql"] + "\n")
+            print_result(result)
+        print(f"\n{'✓ cache hit' if result['cached'] else '✓ executed'} "
+              f"({result['source']}, {len(result['rows'])} rows) in {elapsed_ms:.1f}ms")
+    print(f"Stats: {json.dumps(service.stats())}")
+
+
+if __name__ == "__main__":
+    main()
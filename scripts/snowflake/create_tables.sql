@@ -96,6 +96,25 @@ CREATE OR REPLACE TABLE writer_metadata (
 )
 COMMENT = 'Writer profiles and editorial organization. Contract 3.';
 
+-- ============================================================================
+-- TABLE 4: load_watermarks (incremental load control table)
+-- ============================================================================
+
+-- One row per raw table, maintained by load_to_snowflake.py --incremental:
+-- events_raw tracks max event_timestamp, the metadata CSVs track the file
+-- checksum and byte offset already loaded.
+CREATE TABLE IF NOT EXISTS load_watermarks (
+    table_name STRING PRIMARY KEY,
+    max_event_timestamp NUMBER(38,0),
+    source_file STRING,
+    file_checksum STRING,
+    file_offset NUMBER(38,0),
+    rows_inserted NUMBER(38,0),
+    rows_skipped NUMBER(38,0),
+    loaded_at TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+)
+COMMENT = 'High watermarks for incremental loads of the raw tables.';
+
 -- ============================================================================
 -- CREATE FOREIGN KEY RELATIONSHIPS (for documentation, not enforced in Snowflake)
 -- ============================================================================